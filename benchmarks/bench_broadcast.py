@@ -0,0 +1,46 @@
+"""
+Per-move broadcast cost as the number of spectators grows.
+
+    python benchmarks/bench_broadcast.py
+"""
+
+import time
+
+from tic_tac_toe.core.game.broadcast import Channel
+
+MOVES = [(5, "X"), (1, "O"), (9, "X"), (3, "O"), (7, "X"), (4, "O"), (6, "X"), (2, "O"), (8, "X")]
+
+
+def bench(spectators: int, rounds: int) -> float:
+    """
+    Average seconds per published move (one flush per move), spectators draining every move.
+    """
+    total = 0.0
+    for _ in range(rounds):
+        channel = Channel(("X", "O"))
+        watchers = [channel.subscribe() for _ in range(spectators)]
+        channel.flush()  # initial snapshots
+        for watcher in watchers:
+            watcher.queue.clear()
+
+        start = time.perf_counter()
+        for pos, fig in MOVES:
+            channel.publish_move(pos, fig)
+            channel.flush()
+        total += time.perf_counter() - start
+
+        for watcher in watchers:
+            watcher.queue.clear()
+    return total / (rounds * len(MOVES))
+
+
+def main() -> None:
+    print(f"{'spectators':>10} {'us/move':>10} {'ns/spectator':>13}")
+    for spectators in (1, 10, 100, 1000, 10000):
+        rounds = max(1, 2000 // spectators)
+        per_move = bench(spectators, rounds)
+        print(f"{spectators:>10} {per_move * 1e6:>10.1f} {per_move * 1e9 / spectators:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Positions analysed per second through the engine protocol: one process per
+position vs. one pipelined session for all of them.
+
+    python benchmarks/bench_engine.py [positions]
+"""
+
+import random
+import subprocess
+import sys
+import time
+
+ENGINE = [sys.executable, "-m", "tic_tac_toe.app", "engine"]
+AGENT = "budgeted:nodes=2000"
+
+
+def positions(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        # At most 4 moves: no game is over yet, so every position gets a search.
+        moves = rng.sample(range(1, 10), rng.randint(0, 4))
+        yield "position startpos moves " + " ".join(map(str, moves))
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    batch = list(positions(count))
+
+    launches = min(count, 20)
+    started = time.perf_counter()
+    for line in batch[:launches]:
+        subprocess.run(ENGINE, input=f"agent {AGENT}\n{line}\ngo\n", capture_output=True, text=True, check=True)
+    per_launch = (time.perf_counter() - started) / launches
+
+    script = f"agent {AGENT}\n" + "".join(f"{line}\ngo\n" for line in batch) + "quit\n"
+    started = time.perf_counter()
+    result = subprocess.run(ENGINE, input=script, capture_output=True, text=True, check=True)
+    pipelined = (time.perf_counter() - started) / count
+    assert result.stdout.count("bestmove") == count
+
+    print(f"one process per position  {per_launch * 1000:8.2f} ms/position  ({launches} positions)")
+    print(f"pipelined session         {pipelined * 1000:8.2f} ms/position  ({count} positions)")
+    print(f"speedup                   {per_launch / pipelined:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Cost of scoring every child of a position: full rescore of each child vs. one
+incremental batch call.
+
+    python benchmarks/bench_evaluation.py [size] [win_length]
+"""
+
+import random
+import sys
+import timeit
+
+from tic_tac_toe.core.ai.evaluation import PatternEvaluator, PatternState
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 9
+    win_length = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    evaluator = PatternEvaluator(size, win_length)
+
+    rng = random.Random(0)
+    cells = rng.sample(range(size * size), size * size // 4)
+    state = PatternState(evaluator)
+    for turn, cell in enumerate(cells):
+        state.play(cell, turn % 2)
+    free = [cell for cell in range(size * size) if cell not in cells]
+
+    def full() -> None:
+        for cell in free:
+            bits = list(state.bits)
+            bits[0] |= 1 << cell
+            sum(evaluator.value(index, bits) for index in range(len(evaluator.masks)))
+
+    def batch() -> None:
+        state.evaluate_children(free, 0)
+
+    number = 20
+    full_time = timeit.timeit(full, number=number) / number
+    batch_time = timeit.timeit(batch, number=number) / number
+    print(f"{size}x{size} k={win_length}, {len(evaluator.masks)} windows, {len(free)} children")
+    print(f"full rescore per child  {full_time * 1000:8.2f} ms")
+    print(f"incremental batch       {batch_time * 1000:8.2f} ms  ({full_time / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Puzzle mining throughput: positions verified per second, inline vs. worker processes.
+
+    python benchmarks/bench_puzzles.py [size] [win_length] [games]
+"""
+
+import os
+import sys
+import tempfile
+
+from tic_tac_toe.core.ai.puzzles import mine_puzzles
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    win_length = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    games = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    cores = os.cpu_count() or 1
+
+    print(f"{size}x{size} k={win_length}, {games} random games, {cores} cores")
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in sorted({1, cores}):
+            report = mine_puzzles(os.path.join(tmp, f"{workers}.bin"), size, win_length,
+                                  games=games, workers=workers, batch=max(1, games // (4 * cores)))
+            print(f"{workers:>2} workers  {report.format()}")
+
+
+if __name__ == "__main__":
+    main()
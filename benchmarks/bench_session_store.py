@@ -0,0 +1,47 @@
+"""
+Memory benchmark: bytes per idle game for plain Board/Player objects vs. the SessionStore.
+
+    python benchmarks/bench_session_store.py [games]
+"""
+
+import sys
+import tracemalloc
+
+from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.core.game.player import Player
+from tic_tac_toe.core.game.session_store import SessionStore
+
+
+def measure(build, games: int) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = build(games)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return (after - before) / games
+
+
+def build_objects(games: int):
+    return [
+        (Board(), Player("Player 1", "X"), Player("Randy", "🦦", goes_first=False, is_cpu=True))
+        for _ in range(games)
+    ]
+
+
+def build_store(games: int):
+    store = SessionStore()
+    for _ in range(games):
+        store.create(Player("Player 1", "X"), Player("Randy", "🦦", goes_first=False, is_cpu=True))
+    return store
+
+
+def main() -> None:
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{games} idle games")
+    print(f"  Board + Player objects: {measure(build_objects, games):8.1f} bytes/game")
+    print(f"  SessionStore:           {measure(build_store, games):8.1f} bytes/game")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Snapshot/restore timings for a large SessionStore.
+
+    python benchmarks/bench_snapshot.py [games]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from tic_tac_toe.core.game.player import Player
+from tic_tac_toe.core.game.session_store import SessionStore
+from tic_tac_toe.core.game.snapshot import SnapshotManager
+
+
+def main() -> None:
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    store = SessionStore()
+    for n in range(games):
+        sid = store.create(Player("Player 1", "X"), Player("Randy", "🦦", goes_first=False, is_cpu=True))
+        store.board(sid).make_move(n % 9 + 1, "X")
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        manager = SnapshotManager(store, directory)
+        snapshot_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for sid in range(0, games, 1000):
+            manager.store.board(sid).make_move((sid + 1) % 9 + 1, "🦦")
+        log_time = time.perf_counter() - start
+        logged = manager.journal.entries
+        manager.close()
+
+        start = time.perf_counter()
+        restored = SnapshotManager.open(directory)
+        restore_time = time.perf_counter() - start
+        size = os.path.getsize(restored.snapshot_path)
+        restored.close()
+
+    print(f"{games} games, snapshot file {size / 1e6:.1f} MB")
+    print(f"  snapshot:          {snapshot_time * 1000:8.1f} ms")
+    print(f"  log append:        {log_time / max(logged, 1) * 1e6:8.1f} us/entry")
+    print(f"  restore + resnap:  {restore_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
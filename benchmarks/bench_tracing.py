@@ -0,0 +1,37 @@
+"""
+Overhead of tracing on a traced call: undecorated vs. tracing off vs. tracing on.
+
+    python benchmarks/bench_tracing.py
+"""
+
+import os
+import tempfile
+import timeit
+
+from tic_tac_toe.utils import tracing
+
+
+def plain() -> int:
+    return 1
+
+
+traced = tracing.traced(plain)
+
+
+def main() -> None:
+    number = 200_000
+    base = timeit.timeit(plain, number=number) / number
+    off = timeit.timeit(traced, number=number) / number
+
+    with tempfile.TemporaryDirectory() as directory:
+        tracing.enable(os.path.join(directory, "trace.json"), capacity=number)
+        on = timeit.timeit(traced, number=number) / number
+        tracing.disable()
+
+    print(f"undecorated  {base * 1e9:8.1f} ns/call")
+    print(f"tracing off  {off * 1e9:8.1f} ns/call  (+{(off - base) * 1e9:.1f} ns)")
+    print(f"tracing on   {on * 1e9:8.1f} ns/call  (+{(on - base) * 1e9:.1f} ns)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
+import threading
 import unittest
 
 from tic_tac_toe.core.game.board import Board
-from tic_tac_toe.core.ai.agents import RandomAI, TicTacToeAI
+from tic_tac_toe.core.ai.agents import RandomAI, SearchCancelled, TicTacToeAI
 
 
 class TestAI(unittest.TestCase):
@@ -44,6 +45,27 @@ class TestAI(unittest.TestCase):
         # X should block (3) to prevent O from winning.
         self.assertEqual(move, 3)
 
+    def test_depth_limited_minimax(self):
+        # X X _
+        # _ _ _
+        # O O _   One ply sees X's win at 3 but not O's threat at 9.
+        b = Board()
+        for pos, figure in ((1, "X"), (2, "X"), (7, "O"), (8, "O")):
+            b.make_move(pos, figure)
+        self.assertEqual(TicTacToeAI(depth=1).choose_move(b, "X", "O"), 3)
+        b.undo_move(2)
+        # Without its own win, X needs two plies to see that 9 must be blocked.
+        self.assertEqual(TicTacToeAI(depth=2).choose_move(b, "X", "O"), 9)
+        self.assertNotEqual(TicTacToeAI(depth=1).choose_move(b, "X", "O"), 9)
+        with self.assertRaises(ValueError):
+            TicTacToeAI(depth=0)
+
+    def test_minimax_search_can_be_cancelled(self):
+        stop = threading.Event()
+        stop.set()
+        with self.assertRaises(SearchCancelled):
+            TicTacToeAI().choose_move(Board(), "X", "O", stop)
+
 
 if __name__ == "__main__":
     unittest.main()
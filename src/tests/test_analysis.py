@@ -0,0 +1,114 @@
+import tempfile
+import unittest
+
+from tic_tac_toe.core.ai.agents import BudgetExhausted, TicTacToeAI
+from tic_tac_toe.core.ai.analysis import PositionAnalyzer
+from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.core.game.player import Player
+from tic_tac_toe.gameloop import GameLoop
+
+
+class TestPositionAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.analyzer = PositionAnalyzer()
+
+    def test_empty_board_is_a_draw_everywhere(self):
+        scores = self.analyzer.evaluate_moves(Board(), "X")
+        self.assertEqual(sorted(scores), list(range(1, 10)))
+        self.assertTrue(all(score == 0 for score in scores.values()))
+
+    def test_win_block_and_distance(self):
+        # X X _
+        # _ O _
+        # O _ _
+        b = Board()
+        for pos, fig in [(1, "X"), (2, "X"), (5, "O"), (7, "O")]:
+            b.make_move(pos, fig)
+        scores = self.analyzer.evaluate_moves(b, "X")
+        self.assertEqual(PositionAnalyzer.describe(scores[3]), ("win", 1))
+        # Not taking the win lets O win on its next move.
+        self.assertEqual(PositionAnalyzer.describe(scores[9]), ("loss", 2))
+
+        # Same position, but O to move: O wins at 3.
+        scores = self.analyzer.evaluate_moves(b, "O")
+        self.assertEqual(max(scores, key=scores.get), 3)
+
+    def test_matches_minimax_choice(self):
+        b = Board()
+        for pos, fig in [(1, "X"), (5, "O"), (9, "X")]:
+            b.make_move(pos, fig)
+        scores = self.analyzer.evaluate_moves(b, "O")
+        best = max(scores.values())
+        self.assertIn(TicTacToeAI().choose_move(b, "O", "X"), [p for p, s in scores.items() if s == best])
+
+    def test_table_is_reused_after_a_move(self):
+        b = Board()
+        self.analyzer.evaluate_moves(b, "X")
+        solved = len(self.analyzer.table)
+        b.make_move(5, "X")
+        self.analyzer.evaluate_moves(b, "O")
+        self.assertEqual(len(self.analyzer.table), solved)
+
+    def test_finished_game_has_no_hints(self):
+        b = Board()
+        for pos in (1, 2, 3):
+            b.make_move(pos, "X")
+        self.assertEqual(self.analyzer.evaluate_moves(b, "O"), {})
+
+    def test_variants_are_solved_separately(self):
+        self.analyzer.evaluate_moves(Board(), "X")
+        # Three in a row wins on 4x4 k=3, but not on 4x4 k=4.
+        for win_length, outcome in ((3, "win"), (4, "draw")):
+            b = Board(4, win_length)
+            for pos in (1, 5, 2, 6, 16, 13):
+                b.make_move(pos, "X" if pos in (1, 2, 16) else "O")
+            scores = PositionAnalyzer().evaluate_moves(b, "X")
+            self.assertEqual(PositionAnalyzer.describe(scores[3])[0], outcome)
+            self.assertEqual(self.analyzer.evaluate_moves(b, "X")[3], scores[3])
+        # The 3x3 table is still there.
+        self.assertEqual(self.analyzer.evaluate_moves(Board(), "X"), {pos: 0 for pos in range(1, 10)})
+
+    def test_budget_gives_up_on_large_boards(self):
+        analyzer = PositionAnalyzer(max_nodes=20_000)
+        self.assertEqual(len(analyzer.evaluate_moves(Board(), "X")), 9)
+        board = Board(5, 4)
+        with self.assertRaises(BudgetExhausted):
+            analyzer.evaluate_moves(board, "X")
+        # Redraws of the same position fail without searching again.
+        analyzer.nodes = 0
+        with self.assertRaises(BudgetExhausted):
+            analyzer.evaluate_moves(board, "X")
+        self.assertEqual(analyzer.nodes, 0)
+
+
+class TestGameLoopHints(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.game = GameLoop(state_dir=self.tmp.name)
+        self.game.show_hints = True
+        self.human = Player("Player 1", "X", goes_first=True)
+
+    def tearDown(self):
+        self.game.search_pool.shutdown()
+        self.tmp.cleanup()
+
+    def test_hints_are_computed_off_the_draw_path(self):
+        self.game.board = Board(5, 4)
+        self.assertIsNone(self.game._hints(self.human))
+        future = self.game._hint_future
+        self.assertIsNotNone(future)
+        future.exception()
+        # Redraws of the same position reuse the analysis and say why there's no heatmap.
+        self.assertIsNone(self.game._hints(self.human))
+        self.assertIs(self.game._hint_future, future)
+        self.assertIn("unavailable", self.game.hint_status)
+
+        self.game.show_hints = False
+        self.assertIsNone(self.game._hints(self.human))
+        self.assertIsNone(self.game.hint_status)
+
+
+if __name__ == "__main__":
+    unittest.main()
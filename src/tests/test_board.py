@@ -59,6 +59,21 @@ class TestBoard(unittest.TestCase):
             self.assertTrue(self.board.make_move(pos, fig))
         self.assertIsNone(self.board.check_winner())
         self.assertTrue(self.board.is_full())
+
+    def test_win_length_on_larger_board(self):
+        board = Board(size=5, win_length=4)
+        for pos in (7, 13, 19):
+            board.make_move(pos, "X")
+        self.assertIsNone(board.check_winner())
+        board.make_move(25, "X")
+        self.assertEqual(board.check_winner(), "X")
+        self.assertEqual(board.clone().win_length, 4)
+
+    def test_reject_bad_variants(self):
+        with self.assertRaises(ValueError):
+            Board(size=2)
+        with self.assertRaises(ValueError):
+            Board(size=4, win_length=5)
         
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+from tic_tac_toe.core.ai.book import BookAI, BookError, OpeningBook, build_book, relative_cells, write_book
+from tic_tac_toe.core.ai.symmetry import Canonicalizer
+from tic_tac_toe.core.game.board import Board
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "book.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_symmetric_positions_share_a_key(self):
+        canon = Canonicalizer(4)
+        keys = set()
+        for corner in (1, 4, 13, 16):
+            board = Board(4)
+            board.make_move(corner, "X")
+            keys.add(canon.key(relative_cells(board, "O"))[0])
+        self.assertEqual(len(keys), 1)
+
+    def test_replies_follow_the_board_orientation(self):
+        board = Board(4)
+        board.make_move(1, "X")
+        canon = Canonicalizer(4)
+        key, ts = canon.key(relative_cells(board, "O"))
+        # Book says: answer the corner move with a cell next to it (2, or its mirror 5).
+        write_book(self.path, 4, 4, {(key, canon.to_canonical(1, ts)): [10, 6, 2]})
+
+        with OpeningBook(self.path) as book:
+            self.assertIn(book.best_reply(board, "O"), (2, 5))
+            rotated = Board(4)
+            rotated.make_move(4, "X")  # Same position turned 90 degrees clockwise.
+            self.assertIn(book.best_reply(rotated, "O"), (3, 8))
+            self.assertIsNone(book.best_reply(rotated, "O", min_games=11))
+            self.assertEqual(book.replies(Board(5, 4), "X"), [])
+
+    def test_build_merges_runs(self):
+        first = build_book(self.path, 3, games=20, depth=2, spec="random", workers=1, seed=1)
+        self.assertEqual(first.games, 20)
+        build_book(self.path, 3, games=30, depth=2, spec="random", workers=1, seed=2)
+
+        with OpeningBook(self.path) as book:
+            root = book.replies(Board(3), "X")
+            self.assertEqual(sum(games for _, games, _, _ in root), 50)
+            # Nine first moves collapse to corner, edge and centre.
+            self.assertLessEqual(len(root), 3)
+            for _, games, wins, draws in root:
+                self.assertLessEqual(wins + draws, games)
+
+        with self.assertRaises(BookError):
+            build_book(self.path, 4, games=1, spec="random", workers=1)
+
+    def test_book_agent_falls_back_to_search(self):
+        build_book(self.path, 3, games=20, depth=1, spec="random", workers=1)
+        agent = BookAI(self.path, min_games=1)
+
+        board = Board(3)
+        first = agent.choose_move(board, "X", "O")
+        self.assertIn(first, board.get_available_moves())
+        self.assertEqual(agent.book_moves, 1)
+
+        # Out of book: O must block the row.
+        for pos, figure in ((1, "X"), (5, "O"), (2, "X")):
+            board.make_move(pos, figure)
+        self.assertEqual(agent.choose_move(board, "O", "X"), 3)
+        self.assertEqual(agent.book_moves, 1)
+
+        # The book stays mapped until the agent is closed.
+        with agent:
+            self.assertFalse(agent.book._mm.closed)
+        self.assertTrue(agent.book._mm.closed)
+
+    def test_default_book_beats_lowest_index_play(self):
+        build_book(self.path, 5, 4, games=20, depth=2, workers=1)
+        with OpeningBook(self.path) as book:
+            root = book.replies(Board(5, 4), "X")
+            # Self-play opens in the centre, not in cell 1.
+            self.assertEqual(max(root, key=lambda reply: reply[1])[0], 13)
+            self.assertEqual(book.best_reply(Board(5, 4), "X", min_games=5), 13)
+
+        with BookAI(self.path, min_games=5, nodes=500, patterns=1) as agent:
+            board = Board(5, 4)
+            figures = ("X", "O")
+            ply = 0
+            while board.check_winner() is None and not board.is_full():
+                if ply % 2:
+                    move = board.get_available_moves()[0]
+                else:
+                    move = agent.choose_move(board, "X", "O")
+                board.make_move(move, figures[ply % 2])
+                ply += 1
+        self.assertEqual(board.check_winner(), "X")
+        self.assertGreater(agent.book_moves, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
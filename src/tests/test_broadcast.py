@@ -0,0 +1,113 @@
+import asyncio
+import tempfile
+import unittest
+
+from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.core.game.broadcast import KIND_DELTAS, KIND_SNAPSHOT, BoardMirror, Channel, run_exhibition
+from tic_tac_toe.core.game.player import Player
+from tic_tac_toe.gameloop import GameLoop
+
+
+class TestBroadcast(unittest.TestCase):
+
+    def test_snapshot_then_batched_deltas(self):
+        channel = Channel(("X", "O"))
+        channel.publish_move(5, "X")
+        spectator = channel.subscribe()
+        channel.flush()
+
+        mirror = BoardMirror()
+        message = spectator.poll()
+        self.assertEqual(message[0], KIND_SNAPSHOT)
+        mirror.apply(message)
+
+        channel.publish_move(1, "O")
+        channel.publish_move(9, "X")
+        channel.flush()
+        message = spectator.poll()
+        self.assertEqual(message[0], KIND_DELTAS)
+        self.assertEqual(len(message), 6 + 2 * 2)  # One message for both moves.
+        self.assertIsNone(spectator.poll())
+
+        mirror.apply(message)
+        self.assertEqual(mirror.current_state, [["O", " ", " "], [" ", "X", " "], [" ", " ", "X"]])
+
+    def test_slow_spectator_resyncs_from_snapshot(self):
+        channel = Channel(("X", "O"))
+        slow = channel.subscribe(max_pending=2)
+        for pos, fig in [(1, "X"), (2, "O"), (3, "X"), (4, "O")]:
+            channel.publish_move(pos, fig)
+            channel.flush()
+
+        # The full backlog was replaced by a snapshot, followed by the latest deltas.
+        self.assertEqual([m[0] for m in slow.queue], [KIND_SNAPSHOT, KIND_DELTAS])
+        self.assertEqual(slow.dropped, 2)
+
+        mirror = BoardMirror()
+        while slow.queue:
+            mirror.apply(slow.poll())
+        self.assertEqual(mirror.current_state[0], ["X", "O", "X"])
+        self.assertEqual(mirror.current_state[1][0], "O")
+
+    def test_exhibition_reaches_spectators(self):
+        async def watch():
+            channel = Channel(("🦦", "🌮"))
+            spectator = channel.subscribe(max_pending=100)
+            winner = await run_exhibition(channel, "random", "random", delay=0)
+            await asyncio.sleep(0)
+            mirror = BoardMirror()
+            while spectator.queue:
+                mirror.apply(await spectator.get())
+            return winner, mirror
+
+        winner, mirror = asyncio.run(watch())
+        board = Board()
+        board.current_state = mirror.current_state
+        self.assertEqual(board.check_winner(), winner)
+
+    def test_larger_boards(self):
+        board = Board(5, 4)
+        board.make_move(13, "X")
+        channel = Channel(("X", "O"))
+        channel.reset(board, ("X", "O"))
+        spectator = channel.subscribe()
+        channel.publish_move(25, "O")
+        channel.flush()
+
+        mirror = BoardMirror()
+        mirror.apply(spectator.poll())
+        self.assertEqual(mirror.size, 5)
+        self.assertEqual(mirror.current_state[2][2], "X")
+        self.assertEqual(mirror.current_state[4][4], "O")
+        with self.assertRaises(ValueError):
+            channel.publish_move(26, "X")
+
+        channel.unsubscribe(spectator)
+        channel.unsubscribe(spectator)
+        self.assertEqual(channel.spectators, set())
+
+    def test_gameloop_publishes_its_moves(self):
+        channel = Channel(("X", "O"))
+        spectator = channel.subscribe()
+        with tempfile.TemporaryDirectory() as tmp:
+            game = GameLoop(state_dir=tmp, channel=channel)
+            game.open_sessions()
+            players, _ = game._start_game(None, Player("Player 2", "O", goes_first=False))
+            game._play_move(5, players[0], 1)
+            self.assertFalse(game._play_move(5, players[1], 0))
+            game._play_move(1, players[1], 0)
+            game.close_sessions()
+            game.search_pool.shutdown()
+
+        mirror = BoardMirror()
+        kinds = []
+        while spectator.queue:
+            message = spectator.poll()
+            kinds.append(message[0])
+            mirror.apply(message)
+        self.assertEqual(kinds, [KIND_SNAPSHOT, KIND_DELTAS, KIND_DELTAS])
+        self.assertEqual(mirror.current_state, [["O", " ", " "], [" ", "X", " "], [" ", " ", " "]])
+
+
+if __name__ == "__main__":
+    unittest.main()
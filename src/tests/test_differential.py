@@ -0,0 +1,57 @@
+import unittest
+
+from tic_tac_toe.core.verify import differential
+from tic_tac_toe.core.verify.differential import check_position, enumerate_positions, run_equivalence
+
+
+class TestDifferential(unittest.TestCase):
+
+    def test_enumerates_every_reachable_position(self):
+        positions = enumerate_positions()
+        self.assertEqual(len(positions), 5478)
+        self.assertEqual(positions[0], ())
+
+    def test_optimized_engines_match_reference(self):
+        report = run_equivalence(min_plies=6, workers=1, variants=((3, 3),))
+        self.assertTrue(report.ok, report.format())
+        self.assertIn("search:budgeted", report.speedups())
+        self.assertIn("board:session-store", report.speedups())
+
+    def test_mismatch_reported_as_minimal_sequence(self):
+        # Always playing the first free cell is not optimal.
+        differential.SEARCH_ENGINES["first-free"] = lambda board, figure, opponent: board.get_available_moves()[0]
+        try:
+            report = run_equivalence(min_plies=5, workers=1, variants=((3, 3),))
+        finally:
+            del differential.SEARCH_ENGINES["first-free"]
+
+        self.assertFalse(report.ok)
+        for (variant, moves), problems in report.failures.items():
+            self.assertEqual(variant, (3, 3))
+            self.assertTrue(any(p.startswith("first-free") for p in problems))
+            self.assertGreaterEqual(len(moves), 5)
+        # Longer failing sequences are grouped under their failing prefix.
+        self.assertTrue(report.extensions)
+        for (variant, moves), extensions in report.extensions.items():
+            self.assertIn((variant, moves), report.failures)
+            self.assertTrue(all(ext[:len(moves)] == moves and len(ext) > len(moves) for ext in extensions))
+
+    def test_larger_variants_are_sampled_and_shrunk(self):
+        differential.SEARCH_ENGINES["first-free"] = lambda board, figure, opponent: board.get_available_moves()[0]
+        try:
+            report = run_equivalence(samples=100, search_limit=7, workers=1, variants=((4, 3), (5, 4)))
+            self.assertEqual(report.positions, 200)
+            self.assertEqual({variant for variant, _ in report.failures}, {(4, 3), (5, 4)})
+            for (variant, moves), problems in report.failures.items():
+                self.assertTrue(any(p.startswith("first-free") for p in problems))
+                # Shrunk: no shorter prefix fails.
+                for length in range(len(moves)):
+                    self.assertEqual(check_position(variant, moves[:length], 7), [])
+            # Each sampled sequence is kept next to the prefix it shrank to.
+            self.assertTrue(report.extensions)
+        finally:
+            del differential.SEARCH_ENGINES["first-free"]
+
+
+if __name__ == "__main__":
+    unittest.main()
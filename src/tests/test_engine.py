@@ -0,0 +1,134 @@
+import io
+import threading
+import time
+import unittest
+
+from tic_tac_toe.core.ai.agents import BudgetedAI
+from tic_tac_toe.core.engine.protocol import Engine, run
+from tic_tac_toe.core.game.board import Board
+
+
+def session(*lines):
+    out = io.StringIO()
+    run(io.StringIO("".join(line + "\n" for line in lines)), out)
+    return out.getvalue().splitlines()
+
+
+class TestEngineProtocol(unittest.TestCase):
+
+    def test_handshake_and_sync(self):
+        replies = session("tttp", "isready", "quit", "isready")
+        self.assertEqual(replies[0], "id name TicTacToe")
+        self.assertEqual(replies[-2:], ["tttpok", "readyok"])
+
+    def test_minimax_finds_the_win(self):
+        replies = session("position cells XX.OO....", "go")
+        self.assertEqual(replies[-1], "bestmove 3")
+
+    def test_budgeted_search_streams_info(self):
+        replies = session("agent budgeted", "position startpos moves 1 5", "go nodes 500")
+        infos = [line for line in replies if line.startswith("info depth")]
+        self.assertGreater(len(infos), 0)
+        self.assertTrue(infos[0].startswith("info depth 1 score"))
+        self.assertTrue(replies[-1].startswith("bestmove "))
+
+    def test_search_limits_keep_the_agent_settings(self):
+        # Patterns: same move as the configured agent given the same budget.
+        board = Board(5, 4)
+        for pos, figure in ((13, "X"), (7, "O"), (12, "X")):
+            board.make_move(pos, figure)
+        expected = BudgetedAI(nodes=1500, patterns=1).choose_move(board, "O", "X")
+        replies = session("variant 5 4", "agent budgeted:patterns=1", "position startpos moves 13 7 12", "go nodes 1500")
+        self.assertEqual(replies[-1], f"bestmove {expected}")
+
+        # Seed: the noisy moves come from the agent's own random stream.
+        agent = BudgetedAI(noise=1.0, seed=5)
+        expected = [f"bestmove {agent.choose_move(Board(), 'X', 'O')}" for _ in range(5)]
+        replies = session("agent budgeted:noise=1,seed=5", *["position startpos", "go nodes 100"] * 5)
+        self.assertEqual([line for line in replies if line.startswith("bestmove")], expected)
+
+    def test_variant_and_finished_games(self):
+        replies = session(
+            "variant 4 3", "agent budgeted:nodes=200",
+            "position cells XX.OO...........", "go",
+            "position startpos moves 1 5 2 6 3", "go",
+        )
+        bestmoves = [line for line in replies if line.startswith("bestmove")]
+        self.assertEqual(bestmoves, ["bestmove 3", "bestmove (none)"])
+
+    def test_errors_are_reported_not_fatal(self):
+        replies = session("frobnicate", "position startpos moves 1 1", "variant 2", "position cells X", "isready")
+        self.assertEqual(len([line for line in replies if line.startswith("info string error")]), 4)
+        self.assertEqual(replies[-1], "readyok")
+
+    def test_bad_agent_spec_is_reported(self):
+        replies = session(
+            "agent book:path=missing.bin", "agent minimax:width=2", "agent nosuch",
+            "position cells XX.OO....", "go", "isready",
+        )
+        errors = [line for line in replies if line.startswith("info string error")]
+        self.assertEqual(len(errors), 3)
+        self.assertIn("missing.bin", errors[0])
+        # The previous agent stays in use.
+        self.assertEqual(replies[-2:], ["bestmove 3", "readyok"])
+
+    def test_movetime_timer_ends_with_the_search(self):
+        out = io.StringIO()
+        engine = Engine(out)
+        engine.handle("position cells XX.OO....")
+        engine.handle("go movetime 60000")
+        engine.close()
+        self.assertEqual(out.getvalue().splitlines()[-1], "bestmove 3")
+        for timer in [t for t in threading.enumerate() if isinstance(t, threading.Timer)]:
+            timer.join(1)
+            self.assertFalse(timer.is_alive())
+
+    def test_bad_search_limits_are_reported(self):
+        replies = session("go nodes", "go nodes 100", "agent budgeted", "go nodes 100 movetime", "isready")
+        errors = [line for line in replies if line.startswith("info string error")]
+        self.assertEqual(len(errors), 3)
+        self.assertIn("no node budget", errors[1])
+        self.assertFalse([line for line in replies if line.startswith("bestmove")])
+
+    def test_info_lines_are_streamed(self):
+        flushed = []
+
+        class Out(io.StringIO):
+            def flush(self):
+                flushed.append(self.getvalue())
+
+        run(io.StringIO("agent budgeted\nposition startpos\ngo nodes 2000\nquit\n"), Out())
+        self.assertTrue(any("info depth 1 " in text and "bestmove" not in text for text in flushed))
+
+    def test_quit_stops_the_search(self):
+        started = time.perf_counter()
+        # Full minimax on the empty 4x4 board would run for hours.
+        replies = session("variant 4", "agent minimax", "position startpos", "go", "quit")
+        self.assertLess(time.perf_counter() - started, 2)
+        self.assertTrue(replies[-1].startswith("bestmove "))
+
+    def test_stop_ends_the_search(self):
+        out = io.StringIO()
+        engine = Engine(out)
+        engine.handle("position startpos")
+        started = time.perf_counter()
+        engine.handle("go")  # Full minimax on the empty board takes seconds.
+        engine.handle("stop")
+        engine.handle("isready")
+        engine.close()
+        self.assertLess(time.perf_counter() - started, 2)
+        self.assertIn("info string search stopped", out.getvalue())
+        self.assertTrue(out.getvalue().splitlines()[-2].startswith("bestmove "))
+
+    def test_pipelined_batch(self):
+        lines = ["agent budgeted:nodes=100"]
+        for first in range(1, 10):
+            for second in range(1, 10):
+                if second != first:
+                    lines += [f"position startpos moves {first} {second}", "go"]
+        replies = session(*lines)
+        self.assertEqual(len([line for line in replies if line.startswith("bestmove")]), 72)
+
+
+if __name__ == "__main__":
+    unittest.main()
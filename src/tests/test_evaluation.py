@@ -0,0 +1,89 @@
+import random
+import unittest
+
+from tic_tac_toe.core.ai.agents import BudgetedAI
+from tic_tac_toe.core.ai.evaluation import PatternEvaluator, PatternState
+from tic_tac_toe.core.game.board import Board
+
+
+class TestPatternEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.evaluator = PatternEvaluator(7, 4)
+
+    def test_open_and_blocked_runs(self):
+        state = PatternState(self.evaluator)
+        # Three in a row in the middle of row 3: both windows around it are open.
+        for cell in (23, 24, 25):
+            state.play(cell, 0)
+        counts = self.evaluator.counts(state.bits)
+        self.assertEqual(counts[(0, 3, True)], 2)
+
+        # A stone of side 1 at one end blocks them and kills the window it lands in.
+        state.play(22, 1)
+        counts = self.evaluator.counts(state.bits)
+        self.assertNotIn((0, 3, True), counts)
+        self.assertEqual(counts[(0, 3, False)], 1)
+        self.assertGreater(state.score(0), 0)
+        self.assertEqual(state.score(1), -state.score(0))
+
+    def test_edge_windows_are_blocked(self):
+        state = PatternState(PatternEvaluator(5, 4))
+        for cell in (6, 7, 8):
+            state.play(cell, 0)
+        counts = state.evaluator.counts(state.bits)
+        self.assertEqual(counts.get((0, 3, True), 0), 0)
+        self.assertEqual(counts[(0, 3, False)], 2)
+
+    def test_incremental_matches_full_rescore(self):
+        rng = random.Random(3)
+        state = PatternState(self.evaluator)
+        played = []
+        for _ in range(200):
+            if played and (rng.random() < 0.4 or len(played) == 49):
+                cell, side = played.pop(rng.randrange(len(played)))
+                state.undo(cell, side)
+            else:
+                free = [c for c in range(49) if not (state.bits[0] | state.bits[1]) >> c & 1]
+                cell, side = rng.choice(free), rng.randrange(2)
+                state.play(cell, side)
+                played.append((cell, side))
+            full = sum(self.evaluator.value(i, state.bits) for i in range(len(self.evaluator.masks)))
+            self.assertEqual(state.total, full)
+
+    def test_batch_children_match_playing_each_move(self):
+        board = Board(7, 4)
+        for pos, figure in ((25, "X"), (24, "O"), (18, "X"), (32, "O")):
+            board.make_move(pos, figure)
+        state = PatternState.from_board(board, "X")
+        free = [pos - 1 for pos in board.get_available_moves()]
+        for side in (0, 1):
+            expected = []
+            for cell in free:
+                state.play(cell, side)
+                expected.append(state.score(side))
+                state.undo(cell, side)
+            self.assertEqual(state.evaluate_children(free, side), expected)
+
+    def test_shallow_search_blocks_an_open_three(self):
+        board = Board(7, 4)
+        for pos in (24, 25, 26):
+            board.make_move(pos, "O")
+        for pos in (1, 49):
+            board.make_move(pos, "X")
+        agent = BudgetedAI(nodes=300, patterns=True)
+        self.assertIn(agent.choose_move(board, "X", "O"), (23, 27))
+
+    def test_full_search_is_unchanged_on_small_boards(self):
+        board = Board()
+        for pos, figure in ((1, "X"), (5, "O"), (9, "X")):
+            board.make_move(pos, figure)
+        plain = BudgetedAI().choose_move(board.clone(), "O", "X")
+        with_patterns = BudgetedAI(patterns=True).choose_move(board.clone(), "O", "X")
+        # Any edge holds the draw; a corner loses.
+        self.assertIn(plain, (2, 4, 6, 8))
+        self.assertIn(with_patterns, (2, 4, 6, 8))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import random
+import time
+import unittest
+
+from tic_tac_toe.core.ai.agents import BudgetedAI
+from tic_tac_toe.core.ai.difficulty import DIFFICULTIES
+from tic_tac_toe.core.ai.registry import create_agent
+from tic_tac_toe.core.game.board import Board
+
+# Wall-clock ceilings are checked with this much slack, so a loaded CI machine doesn't
+# fail them. Run with TTT_LATENCY_MARGIN=1 on a quiet machine to check the real ceilings.
+MARGIN = float(os.environ.get("TTT_LATENCY_MARGIN", "5"))
+
+
+def reply_positions(size: int, samples: int, seed: int = 0):
+    """
+    Positions where the CPU (O) replies: every first move, then random deeper ones.
+    """
+    positions = []
+    for first in range(1, size * size + 1):
+        board = Board(size)
+        board.make_move(first, "X")
+        positions.append(board)
+
+    rng = random.Random(seed)
+    while len(positions) < size * size + samples:
+        board = Board(size)
+        figures = ["X", "O"]
+        for ply in range(rng.randrange(1, size * size // 2) * 2 - 1):
+            board.make_move(rng.choice(board.get_available_moves()), figures[ply % 2])
+            if board.check_winner():
+                break
+        else:
+            positions.append(board)
+    return positions
+
+
+class TestLatency(unittest.TestCase):
+
+    def test_budgeted_levels_stay_within_their_node_budget(self):
+        for size in Board.SUPPORTED_SIZES:
+            positions = reply_positions(size, samples=20)
+            for key, difficulty in DIFFICULTIES.items():
+                agent = create_agent(difficulty.spec, seed=0)
+                if not isinstance(agent, BudgetedAI):
+                    continue
+                # Timing out early is fine; searching past the node budget is not.
+                agent.max_time = None
+                agent.noise = 0.0
+                worst = 0
+                for board in positions:
+                    move = agent.choose_move(board.clone(), "O", "X")
+                    worst = max(worst, agent.nodes)
+                    self.assertIn(move, board.get_available_moves())
+                with self.subTest(size=size, level=key):
+                    self.assertLessEqual(worst, agent.max_nodes + 1)
+
+    def test_levels_respect_their_ceiling(self):
+        for size in Board.SUPPORTED_SIZES:
+            positions = reply_positions(size, samples=20)
+            for key, difficulty in DIFFICULTIES.items():
+                agent = create_agent(difficulty.spec)
+                # Exhaustive search costs the same for symmetric openings: time the
+                # three distinct first moves (corner, edge, centre) only.
+                if difficulty.spec == "minimax":
+                    checked = [positions[0], positions[1], positions[size * size // 2]]
+                else:
+                    checked = positions
+                worst = 0.0
+                for board in checked:
+                    start = time.perf_counter()
+                    move = agent.choose_move(board.clone(), "O", "X")
+                    worst = max(worst, (time.perf_counter() - start) * 1000)
+                    self.assertIn(move, board.get_available_moves())
+                with self.subTest(size=size, level=key):
+                    self.assertLessEqual(worst, difficulty.ceiling_ms * MARGIN)
+
+
+class TestBudgetedAI(unittest.TestCase):
+
+    def test_wins_and_blocks_without_noise(self):
+        b = Board()
+        for pos, fig in [(1, "X"), (2, "X"), (5, "O"), (9, "O")]:
+            b.make_move(pos, fig)
+        self.assertEqual(BudgetedAI().choose_move(b, "X", "O"), 3)
+        self.assertEqual(BudgetedAI(nodes=500).choose_move(b, "O", "X"), 3)
+
+    def test_node_budget_interrupts_search(self):
+        ai = BudgetedAI(nodes=100)
+        move = ai.choose_move(Board(), "X", "O")
+        self.assertIn(move, range(1, 10))
+        self.assertLessEqual(ai.nodes, 101)
+        self.assertLess(ai.completed_depth, 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from tic_tac_toe.core.ai.learning import LearnedAI, ValueTable, train
+from tic_tac_toe.core.game.board import Board
+
+
+class TestLearning(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "values.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_symmetric_positions_share_an_entry(self):
+        table = ValueTable.new(3)
+        indices = set()
+        for corner in (1, 3, 7, 9):
+            board = Board()
+            board.make_move(corner, "X")
+            indices.add(table.index(board, "O"))
+        self.assertEqual(len(indices), 1)
+
+    def test_checkpoint_maps_without_copying(self):
+        table = ValueTable.new(3)
+        table.values[42] = 0.5
+        table.games = 7
+        table.save(self.path)
+
+        with ValueTable.open(self.path) as mapped:
+            self.assertIsInstance(mapped.values, memoryview)
+            self.assertTrue(mapped.values.readonly)
+            self.assertEqual(mapped.values[42], 0.5)
+            self.assertEqual(mapped.games, 7)
+        with self.assertRaises(ValueError):
+            ValueTable.new(5)
+
+    def test_incompatible_tables_and_boards_are_rejected(self):
+        for data in (b"", b"TTTV\x01\x00"):
+            with open(self.path, "wb") as f:
+                f.write(data)
+            with self.assertRaisesRegex(ValueError, "too short"):
+                ValueTable.open(self.path)
+
+        ValueTable.new(3).save(self.path)
+        agent = LearnedAI(self.path)
+        with self.assertRaisesRegex(ValueError, "trained on 3x3"):
+            agent.choose_move(Board(4, 3), "X", "O")
+        agent.table.close()
+
+    def test_training_converges_and_resumes(self):
+        report = train(self.path, games=2000, workers=1, batch=250, seed=1, eval_every=2000)
+        self.assertEqual(report.games, 2000)
+        self.assertGreater(report.games_per_second, 0)
+        games, share = report.history[-1]
+        self.assertEqual(games, 2000)
+        self.assertGreater(share, 0.8)
+
+        again = train(self.path, games=500, workers=1, seed=2, eval_every=500)
+        self.assertEqual(again.history[-1][0], 2500)
+
+        agent = LearnedAI(self.path)
+        board = Board()
+        for pos, figure in ((1, "X"), (5, "O"), (2, "X")):
+            board.make_move(pos, figure)
+        # O must block the top row.
+        self.assertEqual(agent.choose_move(board, "O", "X"), 3)
+        board.make_move(4, "O")
+        # X wins at 3 rather than anything else.
+        self.assertEqual(agent.choose_move(board, "X", "O"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from tic_tac_toe.core.ai.agents import RandomAI
+from tic_tac_toe.core.ai.proof import OracleAI, ProofOracle, ProofSolver, write_proof
+from tic_tac_toe.core.game.board import Board
+
+
+def play(board, agents, figures=("X", "O")):
+    """
+    Play `board` out between two agents, the first one moving first. Returns the winner or None.
+    """
+    side = 0
+    while board.check_winner() is None and not board.is_full():
+        figure, opponent = figures[side], figures[1 - side]
+        board.make_move(agents[side].choose_move(board, figure, opponent), figure)
+        side = 1 - side
+    return board.check_winner()
+
+
+class TestProofSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "proof.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_classic_board_is_a_draw(self):
+        board = Board()
+        result = ProofSolver().solve(board, "X", "O")
+        self.assertEqual(result.outcome, "draw")
+        self.assertEqual(board.get_available_moves(), list(range(1, 10)))
+
+    def test_small_table_gives_the_same_strategy_size(self):
+        full = ProofSolver().solve(Board(), "X", "O")
+        small = ProofSolver(max_entries=200).solve(Board(), "X", "O")
+        self.assertGreater(small.gc_runs, 0)
+        self.assertEqual(small.outcome, "draw")
+        self.assertEqual(len(small.strategy), len(full.strategy))
+
+    def test_mid_game_position(self):
+        board = Board()
+        for pos, figure in ((1, "X"), (4, "O"), (2, "X"), (5, "O")):
+            board.make_move(pos, figure)
+        # X to move completes the top row.
+        self.assertEqual(ProofSolver().solve(board, "X", "O").outcome, "first")
+        # X wasted a move: O, the second player, completes the middle row.
+        board.make_move(9, "X")
+        self.assertEqual(ProofSolver().solve(board, "O", "X").outcome, "second")
+
+    def test_oracle_never_loses_the_draw(self):
+        write_proof(self.path, ProofSolver().solve(Board(), "X", "O"))
+        with ProofOracle(self.path) as oracle:
+            self.assertEqual(oracle.outcome, "draw")
+            self.assertIsNone(oracle.move(Board(4), "X"))
+
+        oracle_ai = OracleAI(self.path)
+        for game in range(20):
+            if game % 2:
+                self.assertNotEqual(play(Board(), (RandomAI(seed=game), oracle_ai)), "X")
+            else:
+                self.assertNotEqual(play(Board(), (oracle_ai, RandomAI(seed=game))), "O")
+        # Every CPU move came from the stored strategies.
+        self.assertGreater(oracle_ai.oracle_moves, 0)
+        self.assertEqual(oracle_ai.search.nodes, 0)
+
+    def test_four_by_four_three_in_a_row_is_a_first_player_win(self):
+        result = ProofSolver().solve(Board(4, 3), "X", "O")
+        self.assertEqual(result.outcome, "first")
+        write_proof(self.path, result)
+
+        oracle_ai = OracleAI(self.path)
+        for game in range(10):
+            self.assertEqual(play(Board(4, 3), (oracle_ai, RandomAI(seed=game))), "X")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import tempfile
+import unittest
+
+from tic_tac_toe.core.ai.analysis import PositionAnalyzer
+from tic_tac_toe.core.ai.book import relative_cells
+from tic_tac_toe.core.ai.puzzles import (
+    ForcedWinSearch, PuzzleError, PuzzleSet, mine_puzzles, within_reach, write_puzzles,
+)
+from tic_tac_toe.core.ai.symmetry import Canonicalizer
+from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.core.game.player import Player
+from tic_tac_toe.core.game.puzzle import PuzzleRun
+
+
+class TestForcedWinSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.search = ForcedWinSearch()
+
+    def test_fork_is_a_win_in_two(self):
+        board = Board()
+        for pos, figure in ((1, "X"), (5, "O"), (9, "X"), (3, "O")):
+            board.make_move(pos, figure)
+        # X must block at 7, which also makes two threats (4 and 8).
+        self.assertEqual(self.search.solve(board, "X", "O", 3), (2, [7]))
+        self.assertFalse(self.search.wins_within(board, "X", "O", 1))
+        self.assertEqual(board.get_available_moves(), [2, 4, 6, 7, 8])
+
+    def test_defence_blocks_the_threat(self):
+        board = Board()
+        for pos, figure in ((1, "X"), (2, "X"), (5, "O")):
+            board.make_move(pos, figure)
+        self.assertEqual(self.search.best_defence(board, "O", "X", 2), 3)
+        self.assertFalse(self.search.loses_within(board, "X", "O", 1))
+
+    def test_larger_board(self):
+        board = Board(5, 4)
+        for pos in (7, 8, 9):
+            board.make_move(pos, "X")
+        board.make_move(1, "O")
+        board.make_move(25, "O")
+        # An open three on an m,n,k board: 6 and 10 both win next move.
+        self.assertEqual(self.search.solve(board, "X", "O", 2)[0], 1)
+        board.undo_move(9)
+        self.assertTrue(within_reach(board, "X", "O", 2))
+        self.assertEqual(self.search.solve(board, "X", "O", 2)[0], 2)
+
+
+class TestPuzzleMining(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "puzzles.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_puzzles_agree_with_exhaustive_analysis(self):
+        report = mine_puzzles(self.path, 3, games=300, workers=1)
+        self.assertGreater(report.total, 0)
+
+        analyzer = PositionAnalyzer()
+        canon = Canonicalizer(3)
+        keys = set()
+        with PuzzleSet(self.path) as puzzles:
+            for index in range(len(puzzles)):
+                puzzle = puzzles[index]
+                board = puzzle.board("X", "O")
+                key, ts = canon.key(relative_cells(board, "X"))
+                self.assertEqual(key, puzzle.key)
+                keys.add(key)
+
+                outcomes = {pos: PositionAnalyzer.describe(score)
+                            for pos, score in analyzer.evaluate_moves(board, "X").items()}
+                plies = 2 * puzzle.moves - 1
+                self.assertEqual(outcomes[puzzle.solution], ("win", plies))
+                # Every other move that wins as fast is a mirror image of the solution.
+                fastest = {canon.to_canonical(pos - 1, ts) for pos, (outcome, n) in outcomes.items()
+                           if outcome == "win" and n <= plies}
+                self.assertEqual(fastest, {puzzle.solution - 1})
+        self.assertEqual(len(keys), report.total)
+
+    def test_runs_merge_and_deduplicate(self):
+        first = mine_puzzles(self.path, 3, games=100, workers=1, seed=1)
+        second = mine_puzzles(self.path, 3, games=100, workers=1, seed=1)
+        self.assertEqual(second.added, 0)
+        self.assertEqual(second.total, first.total)
+        with PuzzleSet(self.path) as puzzles:
+            moves = [puzzles[i].moves for i in range(len(puzzles))]
+        self.assertEqual(moves, sorted(moves))
+
+    def test_parallel_matches_inline(self):
+        inline = mine_puzzles(self.path, 3, games=100, workers=1, seed=2)
+        parallel_path = os.path.join(self.tmp.name, "parallel.bin")
+        parallel = mine_puzzles(parallel_path, 3, games=100, workers=2, seed=2)
+        self.assertEqual(parallel.total, inline.total)
+        with open(self.path, "rb") as a, open(parallel_path, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_wrong_variant_is_rejected(self):
+        write_puzzles(self.path, 4, 3, {})
+        with self.assertRaises(PuzzleError):
+            mine_puzzles(self.path, 3, games=1, workers=1)
+
+
+class TestPuzzleRun(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "puzzles.bin")
+        mine_puzzles(self.path, 3, games=300, moves=(2,), workers=1)
+        self.puzzles = PuzzleSet(self.path)
+        self.run = PuzzleRun(self.puzzles, Player("Player 1", "X"))
+
+    def tearDown(self):
+        self.puzzles.close()
+        self.tmp.cleanup()
+
+    def test_solution_against_best_defence(self):
+        run = self.run
+        self.assertTrue(run.play(run.puzzle.solution))
+        self.assertFalse(run.finished)
+        reply = run.defend()
+        self.assertIsNotNone(reply)
+        run.reply(reply)
+        self.assertFalse(run.finished)
+        winner = ForcedWinSearch().winning_moves(run.board, "X", "O", 1)[0]
+        self.assertTrue(run.play(winner))
+        self.assertEqual(run.result, "solved")
+        self.assertEqual(run.solved, 1)
+
+        run.step(1)
+        self.assertEqual(run.index, 1 % len(self.puzzles))
+        self.assertEqual(run.moves_left, run.puzzle.moves)
+
+    def test_wrong_move_misses(self):
+        run = self.run
+        wrong = next(pos for pos in run.board.get_available_moves()
+                     if not ForcedWinSearch().loses_within(_after(run.board, pos), "X", "O", 1))
+        self.assertTrue(run.play(wrong))
+        self.assertIsNone(run.result)
+        # The check runs with the defence, off the UI thread.
+        reply = run.defend()
+        self.assertIsNone(reply)
+        run.reply(reply)
+        self.assertEqual(run.result, "missed")
+        self.assertFalse(run.play(run.puzzle.solution))
+
+        run.retry()
+        self.assertIsNone(run.result)
+        self.assertTrue(run.board.is_valid_move(wrong))
+
+
+def _after(board: Board, pos: int) -> Board:
+    board = board.clone()
+    board.make_move(pos, "X")
+    return board
+
+
+if __name__ == "__main__":
+    unittest.main()
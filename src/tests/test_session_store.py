@@ -0,0 +1,97 @@
+import tracemalloc
+import unittest
+
+from tic_tac_toe.core.ai.agents import TicTacToeAI
+from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.core.game.player import Player
+from tic_tac_toe.core.game.session_store import SessionStore
+
+
+class TestSessionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = SessionStore()
+        self.sid = self.store.create(
+            Player("Player 1", "X", goes_first=True),
+            Player("TicTaco", "🌮", goes_first=False, is_cpu=True),
+        )
+
+    def test_board_view_matches_board(self):
+        view = self.store.board(self.sid)
+        reference = Board()
+        self.assertIsInstance(view, Board)
+        for pos, fig in [(1, "X"), (5, "🌮"), (2, "X"), (9, "🌮"), (3, "X")]:
+            self.assertEqual(view.make_move(pos, fig), reference.make_move(pos, fig))
+            self.assertEqual(view.current_state, reference.current_state)
+            self.assertEqual(view.get_available_moves(), reference.get_available_moves())
+            self.assertEqual(view.check_winner(), reference.check_winner())
+        self.assertFalse(view.make_move(1, "🌮"))
+        self.assertEqual(view.check_winner(), "X")
+
+    def test_cursor_and_reset(self):
+        view = self.store.board(self.sid)
+        view.move_cursor("down")
+        view.move_cursor("left")
+        self.assertEqual(view.get_cursor_position(), (1, 2))
+        self.assertTrue(view.apply_cursor_move("X"))
+        self.assertFalse(view.is_valid_move(6))
+        view.reset()
+        self.assertEqual(view.get_available_moves(), list(range(1, 10)))
+
+    def test_player_views(self):
+        p1, p2 = self.store.players(self.sid)
+        self.assertEqual((p2.name, p2.figure, p2.is_cpu, p2.goes_first), ("TicTaco", "🌮", True, False))
+        p1.make_move(5)
+        p1.make_move(1)
+        self.assertEqual(p1.moves, [5, 1])
+        self.assertEqual(p1.get_last_move(), 1)
+        self.assertEqual(p2.get_last_move(), -1)
+        p1.figure = "🔥"
+        self.assertEqual(self.store.players(self.sid)[0].figure, "🔥")
+        p1.reset()
+        self.assertEqual(p1.moves, [])
+
+    def test_ai_plays_on_view(self):
+        view = self.store.board(self.sid)
+        for pos, fig in [(1, "🌮"), (2, "🌮"), (5, "X"), (9, "X")]:
+            view.make_move(pos, fig)
+        self.assertEqual(TicTacToeAI().choose_move(view, "X", "🌮"), 3)
+
+    def test_release_recycles_slot(self):
+        self.store.release(self.sid)
+        with self.assertRaises(KeyError):
+            self.store.board(self.sid)
+        self.assertEqual(self.store.create(Player(), Player()), self.sid)
+
+    def test_many_distinct_names(self):
+        sids = [self.store.create(Player(f"Player {n}", "X"), Player(f"Rival {n}", "O")) for n in range(1000)]
+        p1, p2 = self.store.players(sids[-1])
+        self.assertEqual((p1.name, p2.name), ("Player 999", "Rival 999"))
+        p1.name = "Renamed"
+        self.assertEqual(self.store.players(sids[-1])[0].name, "Renamed")
+        self.assertEqual(self.store.players(sids[0])[1].name, "Rival 0")
+
+    def test_rejected_game_takes_no_slot(self):
+        cheater = Player("Cheater", "X")
+        for pos in range(1, 8):
+            cheater.make_move(pos)
+        with self.assertRaises(OverflowError):
+            self.store.create(cheater, Player())
+        self.assertEqual(len(self.store), 1)
+        self.store.rebuild_free_list()
+        self.assertEqual(len(self.store), 1)
+
+    def test_idle_game_memory(self):
+        store = SessionStore()
+        games = 20000
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(games):
+            store.create(Player("Player 1", "X"), Player("Randy", "🦦", is_cpu=True))
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertLess((after - before) / games, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import time
+import unittest
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from tic_tac_toe.core.ai.agents import SearchCancelled
+from tic_tac_toe.core.game.player import Player
+from tic_tac_toe.core.game.simul import FrameCounter, Simul, init_worker
+
+
+class FlakyExecutor(ThreadPoolExecutor):
+    """
+    Fails the next `failures` searches as if their worker had crashed.
+    """
+
+    def __init__(self, failures: int) -> None:
+        super().__init__(max_workers=2)
+        self.failures = failures
+
+    def submit(self, fn, *args, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            future = Future()
+            future.set_exception(RuntimeError("worker died"))
+            return future
+        return super().submit(fn, *args, **kwargs)
+
+
+class BrokenExecutor(ThreadPoolExecutor):
+
+    def submit(self, fn, *args, **kwargs):
+        raise BrokenProcessPool("pool is broken")
+
+
+class TestSimul(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.simul = Simul(Player("Player 1", "X"), ("easy", "tricky", "easy"), self.executor)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def _wait_for_replies(self):
+        deadline = time.monotonic() + 5
+        while any(b.thinking for b in self.simul.boards) and time.monotonic() < deadline:
+            self.simul.poll()
+            time.sleep(0.001)
+
+    def test_cpu_replies_land_on_their_board(self):
+        self.assertTrue(self.simul.play(0, 5))
+        self.assertTrue(self.simul.play(1, 1))
+        self.assertTrue(self.simul.boards[0].thinking)
+        # No moves on a board while its CPU is thinking.
+        self.assertFalse(self.simul.play(0, 1))
+
+        self._wait_for_replies()
+        for simul_board in self.simul.boards[:2]:
+            self.assertEqual(len(simul_board.board.get_available_moves()), 7)
+            self.assertEqual(simul_board.latency.count, 1)
+            self.assertTrue(simul_board.awaiting_human)
+        self.assertEqual(self.simul.boards[2].latency.count, 0)
+
+    def test_finished_board_records_result(self):
+        board = self.simul.boards[2].board
+        board.make_move(1, "X")
+        board.make_move(2, "X")
+        self.assertTrue(self.simul.play(2, 3))
+        self.assertEqual(self.simul.boards[2].result, "win")
+        self.assertFalse(self.simul.boards[2].thinking)
+        self.assertEqual(self.simul.score(), (1, 0, 0))
+        self.assertFalse(self.simul.finished)
+
+    def test_focus_skips_busy_boards(self):
+        self.simul.play(1, 5)
+        self.simul.switch_focus(1, awaiting_only=True)
+        self.assertEqual(self.simul.focus, 2)
+        self.simul.switch_focus(1)
+        self.assertEqual(self.simul.focus, 0)
+        self.simul.switch_focus(-1)
+        self.assertEqual(self.simul.focus, 2)
+        self._wait_for_replies()
+
+    def _simul_on(self, executor):
+        self.executor.shutdown()
+        self.executor = executor
+        self.simul = Simul(Player("Player 1", "X"), ("easy", "tricky", "easy"), executor)
+
+    def test_failed_search_is_retried(self):
+        self._simul_on(FlakyExecutor(failures=1))
+        self.simul.play(0, 5)
+        self._wait_for_replies()
+        simul_board = self.simul.boards[0]
+        self.assertEqual(len(simul_board.board.get_available_moves()), 7)
+        self.assertIsNone(simul_board.result)
+        self.assertEqual(simul_board.latency.count, 1)
+
+    def test_failing_board_ends_alone(self):
+        self._simul_on(FlakyExecutor(failures=2))
+        self.simul.play(0, 5)
+        self._wait_for_replies()
+        self.assertEqual(self.simul.boards[0].result, "error")
+        self.assertEqual(self.simul.boards[0].error, "worker died")
+        self.assertFalse(self.simul.play(0, 1))
+
+        # The other boards play on.
+        self.assertTrue(self.simul.play(1, 5))
+        self._wait_for_replies()
+        self.assertEqual(len(self.simul.boards[1].board.get_available_moves()), 7)
+        self.assertEqual(self.simul.score(), (0, 0, 0))
+
+    def test_broken_executor_ends_the_board(self):
+        self._simul_on(BrokenExecutor(max_workers=1))
+        self.assertTrue(self.simul.play(2, 5))
+        self.assertEqual(self.simul.boards[2].result, "error")
+        self.assertFalse(self.simul.boards[2].thinking)
+        self.assertIn("broken", self.simul.boards[2].error)
+
+    def test_cancel_stops_running_searches(self):
+        stop_flags = bytearray(2)
+        self._simul_on(ThreadPoolExecutor(max_workers=2, initializer=init_worker, initargs=(stop_flags,)))
+        self.simul = Simul(Player("Player 1", "X"), ("hard", "easy"), self.executor, stop_flags)
+        self.simul.play(0, 1)
+        future = self.simul.boards[0].pending
+        while not future.running():
+            time.sleep(0.001)
+
+        started = time.monotonic()
+        self.simul.cancel()
+        self.assertIsInstance(future.exception(timeout=5), SearchCancelled)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(stop_flags[0], 1)
+        self.assertFalse(self.simul.boards[0].thinking)
+
+    def test_frame_counter(self):
+        frames = FrameCounter(window=1.0)
+        for i in range(30):
+            frames.tick(now=10 + i / 20)  # 20 fps for 1.5 s
+        self.assertAlmostEqual(frames.fps, 21, delta=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from tic_tac_toe.core.game.player import Player
+from tic_tac_toe.core.game.session_store import SessionStore
+from tic_tac_toe.core.game.snapshot import JOURNAL_FILE, SnapshotManager
+from tic_tac_toe.gameloop import GameLoop
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _populate(self, manager):
+        store = manager.store
+        human = store.create(Player("Player 1", "X"), Player("TicTaco", "🌮", goes_first=False, is_cpu=True))
+        store.set_agent(human, "minimax")
+        other = store.create(Player("Alice", "🔥"), Player("Bob", "🧊", goes_first=False))
+        board = store.board(human)
+        board.make_move(5, "X")
+        store.players(human)[0].make_move(5)
+        store.set_current_player(human, 1)
+        return human, other
+
+    def test_restore_snapshot_and_log(self):
+        manager = SnapshotManager(SessionStore(), self.dir)
+        human, other = self._populate(manager)
+        manager.snapshot()
+
+        # Changes after the snapshot only live in the write-ahead log.
+        manager.store.board(human).make_move(1, "🌮")
+        manager.store.players(human)[1].make_move(1)
+        manager.store.players(other)[0].name = "Carol"
+        manager.store.release(other)
+        third = manager.store.create(Player("Dave", "💎"), Player("Eve", "🎯", goes_first=False))
+        manager.close()  # simulated crash: no final snapshot
+
+        restored = SnapshotManager.open(self.dir).store
+        self.assertEqual(len(restored), 2)
+        board = restored.board(human)
+        self.assertEqual(board.current_state[0][0], "🌮")
+        self.assertEqual(board.current_state[1][1], "X")
+        p1, p2 = restored.players(human)
+        self.assertEqual((p1.moves, p2.moves), ([5], [1]))
+        self.assertEqual((p2.name, p2.figure, p2.is_cpu), ("TicTaco", "🌮", True))
+        self.assertEqual(restored.agent(human), "minimax")
+        self.assertEqual(restored.current_player(human), 1)
+        self.assertEqual(restored.players(third)[0].name, "Dave")
+        self.assertEqual(third, other)  # recycled slot
+
+    def test_names_past_one_byte_ids(self):
+        manager = SnapshotManager(SessionStore(), self.dir)
+        for n in range(150):
+            manager.store.create(Player(f"Early {n}", "X"), Player(f"Rival {n}", "O"))
+        manager.snapshot()
+        late = manager.store.create(Player("Late", "X"), Player("Latest", "O"))
+        manager.close()
+
+        restored = SnapshotManager.open(self.dir).store
+        self.assertEqual(len(restored), 151)
+        self.assertEqual([p.name for p in restored.players(late)], ["Late", "Latest"])
+
+    def test_torn_log_tail_is_ignored(self):
+        manager = SnapshotManager(SessionStore(), self.dir)
+        human, _ = self._populate(manager)
+        manager.store.board(human).make_move(9, "🌮")
+        manager.close()
+
+        with open(os.path.join(self.dir, JOURNAL_FILE), "r+b") as f:
+            f.truncate(os.path.getsize(f.name) - 3)
+
+        board = SnapshotManager.open(self.dir).store.board(human)
+        self.assertEqual(board.current_state[1][1], "X")
+        self.assertTrue(board.is_valid_move(9))
+
+    def test_change_is_logged_before_it_is_applied(self):
+        manager = SnapshotManager(SessionStore(), self.dir)
+        human, _ = self._populate(manager)
+
+        class FailingJournal:
+            def record_changed(self, store, sid, record):
+                raise OSError("disk full")
+
+        manager.store.journal = FailingJournal()
+        with self.assertRaises(OSError):
+            manager.store.board(human).make_move(9, "🌮")
+        # The write never reached the record, so memory and disk still agree.
+        self.assertTrue(manager.store.board(human).is_valid_move(9))
+        manager.close()
+
+
+class TestGameLoopRecovery(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _game(self):
+        game = GameLoop(state_dir=self.tmp.name)
+        game.open_sessions()
+        players, turn = game._start_game("minimax", Player("TicTaco", "🌮", goes_first=False, is_cpu=True))
+        return game, players, turn
+
+    def test_unfinished_game_survives_a_crash(self):
+        game, players, turn = self._game()
+        self.assertEqual(turn, 0)
+        self.assertTrue(game._play_move(5, players[0], 1))
+        game.search_pool.shutdown()
+        # No close_sessions(): the process died with the game in progress.
+
+        resumed, players, turn = self._game()
+        self.assertEqual(turn, 1)
+        self.assertEqual(resumed.board.current_state[1][1], "X")
+        self.assertEqual(players[0].moves, [5])
+        self.assertTrue(players[1].is_cpu)
+
+        # Another mode starts its own game.
+        _, turn = resumed._start_game(None, Player("Player 2", "O", goes_first=False))
+        self.assertEqual(resumed.board.get_available_moves(), list(range(1, 10)))
+        resumed.close_sessions()
+        resumed.search_pool.shutdown()
+
+    def test_a_move_is_all_or_nothing(self):
+        game, players, _ = self._game()
+        journal = game.sessions.journal
+        entries = journal.entries
+        game._play_move(5, players[0], 1)
+        game._play_move(1, players[1], 0)
+        # Board cell, move list and turn: one entry per move.
+        self.assertEqual(journal.entries, entries + 2)
+        self.assertFalse(game._play_move(5, players[0], 1))
+        self.assertEqual(journal.entries, entries + 2)
+        game.search_pool.shutdown()
+
+        wal = os.path.join(self.tmp.name, JOURNAL_FILE)
+        with open(wal, "rb") as f:
+            log = f.read()
+        for length in range(len(log) + 1):
+            crashed = os.path.join(self.tmp.name, f"crash-{length}")
+            os.makedirs(crashed)
+            for name in os.listdir(self.tmp.name):
+                if name.startswith("sessions."):
+                    shutil.copy(os.path.join(self.tmp.name, name), crashed)
+            with open(os.path.join(crashed, JOURNAL_FILE), "r+b") as f:
+                f.truncate(length)
+
+            manager = SnapshotManager.open(crashed)
+            store = manager.store
+            for sid in store.sids():
+                p1, p2 = store.players(sid)
+                filled = 9 - len(store.board(sid).get_available_moves())
+                self.assertEqual(filled, len(p1.moves) + len(p2.moves))
+                self.assertEqual(store.current_player(sid), filled % 2)
+            manager.close()
+            shutil.rmtree(crashed)
+
+    def test_cursor_is_not_journalled(self):
+        game, _, _ = self._game()
+        entries = game.sessions.journal.entries
+        game.board.cursor_row, game.board.cursor_col = 2, 1
+        self.assertEqual((game.board.cursor_row, game.board.cursor_col), (2, 1))
+        self.assertEqual(game.sessions.journal.entries, entries)
+        game.close_sessions()
+        game.search_pool.shutdown()
+
+    def test_finished_game_is_dropped(self):
+        game, players, _ = self._game()
+        game.board.make_move(1, "X")
+        game._finish_game()
+        self.assertEqual(game.board.current_state[0][0], "X")
+        game.close_sessions()
+        game.search_pool.shutdown()
+
+        resumed, _, _ = self._game()
+        self.assertEqual(resumed.board.get_available_moves(), list(range(1, 10)))
+        resumed.close_sessions()
+        resumed.search_pool.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
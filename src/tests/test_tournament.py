@@ -0,0 +1,104 @@
+import math
+import random
+import unittest
+
+from tic_tac_toe.core.ai.registry import create_agent, parse_agent_spec
+from tic_tac_toe.core.ai.agents import RandomAI
+from tic_tac_toe.core.tournament.elo import compute_ratings, elo_from_score, score_z, sprt_llr
+from tic_tac_toe.core.tournament.runner import Pairing, Tournament, TournamentFormat, play_game
+
+
+class TestElo(unittest.TestCase):
+
+    def test_even_score_is_zero_elo(self):
+        self.assertAlmostEqual(elo_from_score(0.5), 0.0)
+        self.assertAlmostEqual(elo_from_score(0.75), 190.8, places=1)
+
+    def test_score_z(self):
+        self.assertEqual(score_z([0.5] * 10), 0.0)
+        self.assertEqual(score_z([1.0] * 10), math.inf)
+        self.assertGreater(score_z([1.0, 0.5, 1.0, 0.0, 1.0, 1.0]), 0)
+
+    def test_sprt_llr(self):
+        self.assertEqual(sprt_llr([], 0, 50), 0.0)
+        self.assertGreater(sprt_llr([1.0, 0.5, 1.0, 0.0, 1.0, 1.0], 0, 50), 0)
+        self.assertLess(sprt_llr([0.5, 1.0, 0.0, 0.5], 0, 50), 0)
+        self.assertEqual(sprt_llr([1.0] * 10, 0, 50), math.inf)
+
+    def test_sprt_rarely_separates_equal_agents(self):
+        # Equal agents: 30% wins, 40% draws, 30% losses each. The test looks after
+        # every batch of 20 games, as the tournament does.
+        rng = random.Random(0)
+        runs, separated, decided = 300, 0, 0
+        for _ in range(runs):
+            pairing = Pairing("a", "b")
+            while pairing.games < 2000:
+                pairing.scores += rng.choices((1.0, 0.5, 0.0), (0.3, 0.4, 0.3), k=20)
+                verdict = pairing.sprt(50.0, 0.05, 0.05)
+                if verdict is not None:
+                    decided += 1
+                    separated += verdict != "equal"
+                    break
+        self.assertGreater(decided, runs * 0.95)
+        # Two one-sided tests at 5% each.
+        self.assertLessEqual(separated / runs, 0.10)
+
+    def test_ratings_are_finite_and_ordered(self):
+        ratings = compute_ratings({("a", "b"): [1.0] * 20, ("b", "c"): [1.0] * 20})
+        self.assertGreater(ratings["a"][0], ratings["b"][0])
+        self.assertGreater(ratings["b"][0], ratings["c"][0])
+        self.assertAlmostEqual(sum(elo for elo, _ in ratings.values()), 0.0, places=6)
+        self.assertTrue(all(math.isfinite(hw) for _, hw in ratings.values()))
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_agent_specs(self):
+        self.assertEqual(parse_agent_spec("random"), ("random", {}))
+        self.assertIsInstance(create_agent("random"), RandomAI)
+        with self.assertRaises(ValueError):
+            parse_agent_spec("nope")
+
+    def test_bad_settings_fail_before_any_game(self):
+        self.assertEqual(parse_agent_spec("minimax:depth=2,noise=0.1"), ("minimax", {"depth": 2, "noise": 0.1}))
+        with self.assertRaises(TypeError):
+            Tournament(["minimax:width=2", "random"], workers=1)
+
+    def test_minimax_never_loses_to_random(self):
+        for seed in range(4):
+            self.assertIn(play_game("minimax", "random", seed, 2), (0.5, 1.0))
+        # After a random first move the second player can always hold the draw.
+        self.assertIn(play_game("random", "minimax", 0, 1), (0.0, 0.5))
+
+    def test_games_replay_from_their_seed(self):
+        for seed in range(3):
+            self.assertEqual(play_game("random", "budgeted:noise=0.5", seed, 0),
+                             play_game("random", "budgeted:noise=0.5", seed, 0))
+
+        def scores():
+            tournament = Tournament(["random", "budgeted:nodes=200,noise=0.5"], max_games=20, min_games=20,
+                                    opening_plies=2, seed=3, workers=1)
+            tournament.run()
+            return tournament.pairings[0].scores
+        self.assertEqual(scores(), scores())
+
+    def test_gauntlet_stops_early(self):
+        tournament = Tournament(
+            ["minimax", "random"],
+            fmt=TournamentFormat.GAUNTLET,
+            max_games=60,
+            min_games=10,
+            batch=5,
+            opening_plies=3,
+            workers=1,
+        )
+        ratings = tournament.run()
+        pairing = tournament.pairings[0]
+        self.assertTrue(pairing.finished)
+        self.assertLess(pairing.games, 60)
+        self.assertEqual(pairing.verdict, "stronger")
+        self.assertGreater(ratings["minimax"][0], ratings["random"][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.utils import tracing
+
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "trace.json")
+
+    def tearDown(self):
+        tracing.disable()
+        self.tmp.cleanup()
+
+    def test_disabled_records_nothing(self):
+        @tracing.traced
+        def work():
+            return 42
+
+        self.assertEqual(work(), 42)
+        with tracing.span("nothing"):
+            pass
+        self.assertFalse(tracing.is_enabled())
+
+    def test_spans_are_written_as_chrome_trace(self):
+        tracer = tracing.enable(self.path)
+
+        @tracing.traced
+        def search():
+            with tracing.span("inner"):
+                return Board().clone()
+
+        search()
+        worker = threading.Thread(target=search)
+        worker.start()
+        worker.join()
+        tracing.flush()
+
+        with open(self.path) as f:
+            events = json.load(f)["traceEvents"]
+        names = [event["name"] for event in events]
+        self.assertEqual(names.count("inner"), 2)
+        self.assertEqual(len({event["tid"] for event in events}), 2)
+        for event in events:
+            self.assertEqual(event["ph"], "X")
+            self.assertGreaterEqual(event["dur"], 0)
+        # Inner spans end before their parent's end.
+        outer = next(e for e in events if e["name"].endswith("search"))
+        self.assertLessEqual(events[0]["ts"] + events[0]["dur"], outer["ts"] + outer["dur"])
+        self.assertEqual(len(tracer.spans), 4)
+
+    def test_ring_buffer_keeps_latest_spans(self):
+        tracer = tracing.enable(self.path, capacity=3)
+        for n in range(5):
+            with tracing.span(f"s{n}"):
+                pass
+        self.assertEqual([s[0] for s in tracer.spans], ["s2", "s3", "s4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,13 +2,203 @@
 
 """
 Entry point for the Tic-Tac-Toe game.
-Initializes and runs the gameloop.
+Initializes and runs the gameloop, or one of the command line tools.
 """
 
+import argparse
+
+from typing import List, Optional
+
 from tic_tac_toe.gameloop import GameLoop
 
-def main():
-    game = GameLoop()
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ttt", description="A simple command line tic-tac-toe game.")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Record timing spans to PATH in Chrome trace format (or set TTT_TRACE)")
+    parser.add_argument("--puzzles", metavar="PATH", default=None,
+                        help="Puzzle file for the puzzle mode (default: puzzles.bin)")
+    parser.add_argument("--state", metavar="DIR", default=None,
+                        help="Directory where unfinished games are saved (default: ~/.tic_tac_toe)")
+    commands = parser.add_subparsers(dest="command")
+
+    tournament = commands.add_parser("tournament", help="Run matches between CPU agents and rate them.")
+    tournament.add_argument("agents", nargs="+", help="Agent specs, e.g. random minimax")
+    tournament.add_argument("--format", choices=["round-robin", "gauntlet"], default="round-robin",
+                            help="gauntlet plays the first agent against every other one")
+    tournament.add_argument("--games", type=int, default=200, help="Maximum games per pairing")
+    tournament.add_argument("--min-games", type=int, default=20, help="Games before early stopping is allowed")
+    tournament.add_argument("--opening-plies", type=int, default=2, help="Random moves at the start of each game")
+    tournament.add_argument("--seed", type=int, default=0)
+    tournament.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    tournament.add_argument("--z", type=float, default=1.96, help="Confidence level of the rating intervals")
+    tournament.add_argument("--elo1", type=float, default=50.0, help="Elo difference the early-stopping test looks for")
+    tournament.add_argument("--alpha", type=float, default=0.05, help="Early-stopping false positive rate")
+    tournament.add_argument("--beta", type=float, default=0.05, help="Early-stopping false negative rate")
+
+    verify = commands.add_parser("verify", help="Check optimized engines against the reference Board/TicTacToeAI.")
+    verify.add_argument("--samples", type=int, default=1_000_000, help="Positions sampled per board variant larger than 3x3")
+    verify.add_argument("--min-plies", type=int, default=0, help="Skip positions with fewer moves played")
+    verify.add_argument("--search-limit", type=int, default=9, help="Only compare best moves with at most this many empty cells")
+    verify.add_argument("--seed", type=int, default=0)
+    verify.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+
+    book = commands.add_parser("book", help="Build or extend an opening book from self-play.")
+    book.add_argument("path", help="Book file; new games are merged into it if it exists")
+    book.add_argument("--size", type=int, default=5, help="Board size")
+    book.add_argument("--win-length", type=int, default=None, help="Marks in a row to win (default: board size)")
+    book.add_argument("--games", type=int, default=1000, help="Self-play games to add")
+    book.add_argument("--depth", type=int, default=8, help="Plies per game recorded in the book")
+    book.add_argument("--agent", default="budgeted:nodes=2000,patterns=1,noise=0.1", help="Agent spec playing both sides")
+    book.add_argument("--seed", type=int, default=0)
+    book.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+
+    solve = commands.add_parser("solve", help="Prove the result of a board variant with proof-number search.")
+    solve.add_argument("--size", type=int, default=4, help="Board size")
+    solve.add_argument("--win-length", type=int, default=None, help="Marks in a row to win (default: board size)")
+    solve.add_argument("--max-entries", type=int, default=1_000_000, help="Transposition table capacity")
+    solve.add_argument("--out", metavar="PATH", help="Save the proven strategies for the oracle agent")
+
+    commands.add_parser("engine", help="Serve the text engine protocol on stdin/stdout.")
+
+    train = commands.add_parser("train", help="Train the learned agent's value table by self-play.")
+    train.add_argument("path", help="Value table file; training resumes from it if it exists")
+    train.add_argument("--games", type=int, default=20_000, help="Self-play games to train on")
+    train.add_argument("--batch", type=int, default=250, help="Games per worker between table updates")
+    train.add_argument("--alpha", type=float, default=0.5, help="Learning rate")
+    train.add_argument("--epsilon", type=float, default=0.2, help="Share of random exploring moves")
+    train.add_argument("--eval-every", type=int, default=5000, help="Games between convergence checks")
+    train.add_argument("--seed", type=int, default=0)
+    train.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+
+    puzzles = commands.add_parser("puzzles", help="Mine verified forced-win puzzles from random or self-play games.")
+    puzzles.add_argument("path", help="Puzzle file; new puzzles are merged into it if it exists")
+    puzzles.add_argument("--size", type=int, default=3, help="Board size")
+    puzzles.add_argument("--win-length", type=int, default=None, help="Marks in a row to win (default: board size)")
+    puzzles.add_argument("--moves", type=int, nargs="+", default=[2, 3], help="Keep forced wins in these many moves")
+    puzzles.add_argument("--games", type=int, default=1000, help="Games to mine positions from")
+    puzzles.add_argument("--agent", default="random", help="Agent spec playing both sides, or random")
+    puzzles.add_argument("--seed", type=int, default=0)
+    puzzles.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+
+    return parser
+
+def run_tournament(args: argparse.Namespace) -> None:
+    from tic_tac_toe.core.tournament.runner import Tournament, TournamentFormat
+
+    tournament = Tournament(
+        args.agents,
+        fmt=TournamentFormat(args.format),
+        max_games=args.games,
+        min_games=args.min_games,
+        opening_plies=args.opening_plies,
+        seed=args.seed,
+        workers=args.workers,
+        z=args.z,
+        elo1=args.elo1,
+        alpha=args.alpha,
+        beta=args.beta,
+    )
+    tournament.run()
+    print(tournament.report())
+
+def run_verify(args: argparse.Namespace) -> int:
+    from tic_tac_toe.core.verify.differential import run_equivalence
+
+    report = run_equivalence(
+        samples=args.samples,
+        search_limit=args.search_limit,
+        min_plies=args.min_plies,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    print(report.format())
+    return 0 if report.ok else 1
+
+def run_book(args: argparse.Namespace) -> None:
+    from tic_tac_toe.core.ai.book import build_book
+
+    report = build_book(
+        args.path,
+        size=args.size,
+        win_length=args.win_length,
+        games=args.games,
+        depth=args.depth,
+        spec=args.agent,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    print(report.format())
+
+def run_solve(args: argparse.Namespace) -> None:
+    from tic_tac_toe.core.ai.proof import ProofSolver, write_proof
+    from tic_tac_toe.core.game.board import Board
+
+    result = ProofSolver(max_entries=args.max_entries).solve(Board(args.size, args.win_length), "X", "O")
+    print(result.format())
+    if args.out:
+        write_proof(args.out, result)
+
+def run_train(args: argparse.Namespace) -> None:
+    from tic_tac_toe.core.ai.learning import train
+
+    report = train(
+        args.path,
+        games=args.games,
+        workers=args.workers,
+        batch=args.batch,
+        alpha=args.alpha,
+        epsilon=args.epsilon,
+        seed=args.seed,
+        eval_every=args.eval_every,
+    )
+    print(report.format())
+
+def run_puzzles(args: argparse.Namespace) -> None:
+    from tic_tac_toe.core.ai.puzzles import mine_puzzles
+
+    report = mine_puzzles(
+        args.path,
+        size=args.size,
+        win_length=args.win_length,
+        moves=args.moves,
+        games=args.games,
+        spec=args.agent,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    print(report.format())
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+
+    if args.trace:
+        from tic_tac_toe.utils import tracing
+        tracing.enable(args.trace)
+
+    if args.command == "tournament":
+        run_tournament(args)
+        return
+    if args.command == "verify":
+        raise SystemExit(run_verify(args))
+    if args.command == "book":
+        run_book(args)
+        return
+    if args.command == "solve":
+        run_solve(args)
+        return
+    if args.command == "train":
+        run_train(args)
+        return
+    if args.command == "puzzles":
+        run_puzzles(args)
+        return
+    if args.command == "engine":
+        import sys
+        from tic_tac_toe.core.engine.protocol import run
+        run(sys.stdin, sys.stdout)
+        return
+
+    game = GameLoop(puzzle_path=args.puzzles, state_dir=args.state)
     game.run()
 
 if __name__ == "__main__":
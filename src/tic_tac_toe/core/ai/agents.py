@@ -1,31 +1,61 @@
 import math
 import random
+import threading
+import time
 
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
+from tic_tac_toe.core.ai.evaluation import PatternState
 from tic_tac_toe.core.game.board import Board
 
+class SearchCancelled(Exception):
+    """
+    Raised inside a search when its stop event is set.
+    """
+
 class RandomAI:
     """
     Chooses any available move at random.
     """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.rng = random.Random(seed)
     
-    def choose_move(self, board: Board, figure: str) -> int:
-        return random.choice(board.get_available_moves())
+    def choose_move(self, board: Board, figure: str, opponent: Optional[str] = None) -> int:
+        return self.rng.choice(board.get_available_moves())
     
 class TicTacToeAI:
     """
     Tic-Tac-Toe AI using Minimax.
+
+    By default it searches to the end of the game. `depth` limits the search to that
+    many plies (positions past the horizon count as draws), and with probability
+    `noise` a random legal move is played instead, for weaker settings.
     """
+
+    def __init__(self, depth: Optional[int] = None, noise: float = 0.0, seed: Optional[int] = None) -> None:
+        if depth is not None and depth < 1:
+            raise ValueError("Minimax depth must be at least 1.")
+        self.depth = depth
+        self.noise = noise
+        self.rng = random.Random(seed)
     
-    def choose_move(self, board: Board, figure: str, opponent: str) -> int:
+    def choose_move(self, board: Board, figure: str, opponent: str, stop: Optional[threading.Event] = None) -> int:
+        """
+        Returns the best move for `figure`.
+        If `stop` is given and gets set while searching, raises SearchCancelled.
+        """
+        if self.noise and self.rng.random() < self.noise:
+            return self.rng.choice(board.get_available_moves())
+
         best_score = -math.inf
         best_move = None
+        depth = self.depth - 1 if self.depth is not None else None
 
         for move in board.get_available_moves():
             # simulate
             board.make_move(move, figure)
-            score = self._minimax(board, False, figure, opponent)
+            score = self._minimax(board, False, figure, opponent, stop, depth)
             # undo
             board.current_state = self._undo_move(board, move)
             if score > best_score:
@@ -34,30 +64,36 @@ class TicTacToeAI:
 
         # Fallback if something weird happens
         if best_move is None:
-            return random.choice(board.get_available_moves())
+            return self.rng.choice(board.get_available_moves())
         return best_move
     
     #--------------
     # Helpers
     #--------------
 
-    def _minimax(self, board: Board, maximizing: bool, figure: str, opponent: str) -> float:
+    def _minimax(self, board: Board, maximizing: bool, figure: str, opponent: str,
+                 stop: Optional[threading.Event] = None, depth: Optional[int] = None) -> float:
         """
         Minimax algorithm implementation.
+        `depth` is the number of plies left to search (None for no limit).
         """
+        if stop is not None and stop.is_set():
+            raise SearchCancelled()
+
         winner = board.check_winner()
         if winner == figure:
             return 1
         elif winner == opponent:
             return -1
-        elif board.is_full():
+        elif board.is_full() or depth == 0:
             return 0
 
+        child_depth = depth - 1 if depth is not None else None
         if maximizing:
             best_score = -math.inf
             for move in board.get_available_moves():
                 board.make_move(move, figure)
-                score = self._minimax(board, False, figure, opponent)
+                score = self._minimax(board, False, figure, opponent, stop, child_depth)
                 board.current_state = self._undo_move(board, move)
                 best_score = max(best_score, score)
             return best_score
@@ -65,7 +101,7 @@ class TicTacToeAI:
             best_score = math.inf
             for move in board.get_available_moves():
                 board.make_move(move, opponent)
-                score = self._minimax(board, True, figure, opponent)
+                score = self._minimax(board, True, figure, opponent, stop, child_depth)
                 board.current_state = self._undo_move(board, move)
                 best_score = min(best_score, score)
             return best_score
@@ -80,4 +116,146 @@ class TicTacToeAI:
         new_state = [row[:] for row in board.current_state]
         new_state[i][j] = " "
         return new_state
-    
\ No newline at end of file
+
+
+class BudgetExhausted(Exception):
+    """
+    Raised inside a search when its node or time budget runs out.
+    """
+
+class BudgetedAI:
+    """
+    Anytime negamax with alpha-beta, bounded by a node and/or time budget.
+
+    The search deepens one ply at a time and can be interrupted at any node; the move
+    from the deepest completed iteration is played. With probability `noise` a random
+    legal move is played instead, which makes weaker levels fallible on purpose.
+
+    With `patterns` set, positions at the search horizon are scored by a
+    `PatternEvaluator` instead of 0, and root moves are ordered by it. Heuristic
+    scores stay below `HEURISTIC_BOUND`, so forced wins and losses always rank first.
+
+    If set, `on_iteration(depth, score, move)` is called after every completed iteration.
+    """
+
+    WIN_SCORE = 1000
+    HEURISTIC_BOUND = WIN_SCORE // 2
+
+    def __init__(self, nodes: Optional[int] = None, time_ms: Optional[float] = None,
+                 noise: float = 0.0, seed: Optional[int] = None, patterns: bool = False) -> None:
+        self.max_nodes = nodes
+        self.max_time = time_ms / 1000 if time_ms is not None else None
+        self.noise = noise
+        self.rng = random.Random(seed)
+        self.patterns = bool(patterns)
+        self._eval: Optional[PatternState] = None
+
+        self.nodes = 0
+        self.completed_depth = 0
+        self._deadline: Optional[float] = None
+        self._stop: Optional[threading.Event] = None
+        self._lines_through: List[List[List[int]]] = []
+        self.on_iteration: Optional[Callable[[int, int, int], None]] = None
+
+    def choose_move(self, board: Board, figure: str, opponent: str, stop: Optional[threading.Event] = None) -> int:
+        moves = board.get_available_moves()
+        if self.noise and self.rng.random() < self.noise:
+            return self.rng.choice(moves)
+
+        cells = [cell for row in board.current_state for cell in row]
+        lines = [[i * board.size + j for i, j in line] for line in board._winning_lines()]
+        self._lines_through = [[line for line in lines if idx in line] for idx in range(len(cells))]
+
+        self.nodes = 0
+        self.completed_depth = 0
+        self._deadline = time.perf_counter() + self.max_time if self.max_time is not None else None
+        self._stop = stop
+
+        best_move = moves[0]
+        order = [pos - 1 for pos in moves]
+        self._eval = PatternState.from_board(board, figure) if self.patterns else None
+        if self._eval is not None:
+            scores = self._eval.evaluate_children(order, 0)
+            order = [idx for _, idx in sorted(zip(scores, order), key=lambda item: -item[0])]
+        for depth in range(1, len(order) + 1):
+            try:
+                score, move = self._root(cells, order, depth, figure, opponent)
+            except BudgetExhausted:
+                break
+            best_move = move + 1
+            self.completed_depth = depth
+            if self.on_iteration is not None:
+                self.on_iteration(depth, score, best_move)
+            # Search the best move first in the next iteration.
+            order.remove(move)
+            order.insert(0, move)
+            if abs(score) >= self.WIN_SCORE - len(cells):
+                break  # Forced result found, deeper searches can't change it.
+        return best_move
+
+    # --------------
+    # Helpers
+    # --------------
+
+    def _tick(self) -> None:
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise BudgetExhausted()
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise BudgetExhausted()
+        if self._stop is not None and self._stop.is_set():
+            raise SearchCancelled()
+
+    def _place(self, cells: List[str], idx: int, figure: str, side: int) -> None:
+        cells[idx] = figure
+        if self._eval is not None:
+            self._eval.play(idx, side)
+
+    def _take_back(self, cells: List[str], idx: int, side: int) -> None:
+        cells[idx] = " "
+        if self._eval is not None:
+            self._eval.undo(idx, side)
+
+    def _wins(self, cells: List[str], idx: int, figure: str) -> bool:
+        return any(all(cells[i] == figure for i in line) for line in self._lines_through[idx])
+
+    def _root(self, cells: List[str], order: List[int], depth: int, figure: str, opponent: str) -> Tuple[int, int]:
+        alpha, best_move = -math.inf, order[0]
+        for idx in order:
+            self._place(cells, idx, figure, 0)
+            try:
+                score = -self._negamax(cells, idx, depth - 1, -math.inf, -alpha, opponent, figure, 1)
+            finally:
+                self._take_back(cells, idx, 0)
+            if score > alpha:
+                alpha, best_move = score, idx
+        return int(alpha), best_move
+
+    def _negamax(self, cells: List[str], last: int, depth: int, alpha: float, beta: float,
+                 figure: str, opponent: str, ply: int) -> float:
+        """
+        Score for `figure` (to move) after `opponent` played `last`.
+        """
+        self._tick()
+        if self._wins(cells, last, opponent):
+            return -(self.WIN_SCORE - ply)
+        if " " not in cells:
+            return 0  # Draw.
+        if depth == 0:
+            # Unknown beyond the horizon. The root player is side 0 on even plies.
+            return self._eval.bounded_score(ply % 2, self.HEURISTIC_BOUND) if self._eval is not None else 0
+
+        best = -math.inf
+        for idx, cell in enumerate(cells):
+            if cell != " ":
+                continue
+            self._place(cells, idx, figure, ply % 2)
+            try:
+                score = -self._negamax(cells, idx, depth - 1, -beta, -alpha, opponent, figure, ply + 1)
+            finally:
+                self._take_back(cells, idx, ply % 2)
+            best = max(best, score)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best
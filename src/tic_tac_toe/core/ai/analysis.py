@@ -0,0 +1,130 @@
+from typing import Dict, List, Optional, Tuple
+
+from tic_tac_toe.core.ai.agents import BudgetExhausted
+from tic_tac_toe.core.game.board import Board
+
+# Scores are from the point of view of the player to move:
+#   WIN_SCORE - n  -> win in n plies,  -(WIN_SCORE - n) -> loss in n plies,  0 -> draw.
+WIN_SCORE = 100
+
+EMPTY, MINE, THEIRS = 0, 1, 2
+
+
+class PositionAnalyzer:
+    """
+    Exact evaluation of every empty cell, for the in-game hint heatmap.
+
+    Positions are stored relative to the player to move (mine/theirs/empty), so the
+    same table serves both sides and any pair of figures. The table is kept between
+    calls: after a move, the new position and all its children were already solved as
+    part of the previous search, so the heatmap updates with lookups only. Each board
+    variant (size, win length) gets its own lines and table.
+
+    With `max_nodes` set, `evaluate_moves` gives up with BudgetExhausted once a call
+    has scored that many new moves, so the solve stays instant on 3x3 and bails out
+    quickly on larger boards instead of hanging.
+    """
+
+    def __init__(self, max_nodes: Optional[int] = None) -> None:
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        # (size, win length) -> (winning lines, solved positions)
+        self._variants: Dict[Tuple[int, int], Tuple[List[Tuple[int, ...]], Dict[bytes, int]]] = {}
+        self._lines: List[Tuple[int, ...]] = []
+        self.table: Dict[bytes, int] = {}
+        # Last position asked for and its scores (None if it was over budget).
+        self._last: Optional[Tuple[Tuple[int, int], bytes, Optional[Dict[int, int]]]] = None
+
+    def _encode(self, board: Board, figure: str) -> bytes:
+        return bytes(
+            EMPTY if cell == " " else MINE if cell == figure else THEIRS
+            for row in board.current_state for cell in row
+        )
+
+    def _wins(self, cells: bytearray, mark: int) -> bool:
+        return any(all(cells[i] == mark for i in line) for line in self._lines)
+
+    def _child_score(self, cells: bytearray, index: int) -> int:
+        """
+        Score for the player to move of playing `index` in `cells` (modified in place
+        and restored).
+        """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise BudgetExhausted()
+        cells[index] = MINE
+        try:
+            if self._wins(cells, MINE):
+                return WIN_SCORE - 1
+            if EMPTY not in cells:
+                return 0
+            # Swap sides so the opponent is "mine" in the child position.
+            swapped = cells.translate(_SWAP)
+            value = -self._solve(swapped)
+            # One ply further away from the result.
+            return value - 1 if value > 0 else value + 1 if value < 0 else 0
+        finally:
+            cells[index] = EMPTY
+
+    def _solve(self, cells: bytearray) -> int:
+        key = bytes(cells)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        best = -WIN_SCORE
+        for index, cell in enumerate(cells):
+            if cell == EMPTY:
+                best = max(best, self._child_score(cells, index))
+                if best == WIN_SCORE - 1:
+                    break
+        self.table[key] = best
+        return best
+
+    def evaluate_moves(self, board: Board, figure: str) -> Dict[int, int]:
+        """
+        Score of every available move (board position) for `figure`, the player to move.
+        Returns an empty dict once the game is over. Raises BudgetExhausted when the
+        position needs more than `max_nodes` (asking again for it fails at once).
+        """
+        variant = (board.size, board.win_length)
+        if variant not in self._variants:
+            lines = [tuple(i * board.size + j for i, j in line) for line in board._winning_lines()]
+            self._variants[variant] = (lines, {})
+        self._lines, self.table = self._variants[variant]
+
+        key = self._encode(board, figure)
+        if self._last is not None and self._last[:2] == (variant, key):
+            if self._last[2] is None:
+                raise BudgetExhausted()
+            return self._last[2]
+
+        cells = bytearray(key)
+        scores: Dict[int, int] = {}
+        self.nodes = 0
+        try:
+            if not self._wins(cells, THEIRS) and not self._wins(cells, MINE):
+                for index, cell in enumerate(cells):
+                    if cell == EMPTY:
+                        scores[index + 1] = self._child_score(cells, index)
+        except BudgetExhausted:
+            self._last = (variant, key, None)
+            raise
+
+        self._last = (variant, key, scores)
+        return scores
+
+    @staticmethod
+    def describe(score: int) -> Tuple[str, int]:
+        """
+        Split a score into its outcome ("win", "draw" or "loss") and the distance
+        in plies to the end of the game (0 for draws).
+        """
+        if score > 0:
+            return "win", WIN_SCORE - score
+        if score < 0:
+            return "loss", WIN_SCORE + score
+        return "draw", 0
+
+
+_SWAP = bytes([EMPTY, THEIRS, MINE]) + bytes(range(3, 256))
@@ -0,0 +1,323 @@
+import mmap
+import os
+import struct
+import threading
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from tic_tac_toe.core.ai.agents import BudgetedAI
+from tic_tac_toe.core.ai.analysis import EMPTY, MINE, THEIRS
+from tic_tac_toe.core.ai.registry import create_agent
+from tic_tac_toe.core.ai.symmetry import Canonicalizer, key_width
+from tic_tac_toe.core.game.board import Board
+
+# ---------------------------------------------------------------------------
+# Opening book file (memory-mapped, read only at runtime):
+#
+#   header   magic, version, board size, win length, key width, record count
+#   records  record count * (key, reply cell, games, wins, draws), sorted by key
+#
+# Keys are canonical positions: cells relative to the player to move (empty, mine,
+# theirs) read as a base-3 number, minimized over the 8 symmetries of the square,
+# stored big-endian in the fewest bytes that fit, so byte order is numeric order.
+# Reply cells are 0-based indices in the canonical orientation. Statistics are from
+# the point of view of the player to move.
+# ---------------------------------------------------------------------------
+
+BOOK_MAGIC = b"TTTB"
+VERSION = 1
+
+BOOK_HEADER = struct.Struct(">4sHBBBxI")
+HEADER_SIZE = 16
+
+# (games, wins, draws) for one reply in one position.
+Stats = Dict[Tuple[bytes, int], List[int]]
+
+
+class BookError(Exception):
+    """
+    Raised when an opening book file is truncated or built for another variant.
+    """
+
+
+def relative_cells(board: Board, figure: str) -> List[int]:
+    """
+    Board cells relative to `figure`, the player to move.
+    """
+    return [
+        EMPTY if cell == " " else MINE if cell == figure else THEIRS
+        for row in board.current_state for cell in row
+    ]
+
+
+# -----------------
+# Building
+# -----------------
+
+def self_play(size: int, win_length: int, games: int, depth: int, spec: str, seed: int) -> Stats:
+    """
+    Play `games` games of `spec` against itself and count, for every position of the
+    first `depth` plies, how the reply played there turned out for the player to move.
+    """
+    # Every batch gets its own random stream, or all batches would replay the same games.
+    agent = create_agent(spec, seed)
+    canon = Canonicalizer(size)
+    figures = ("X", "O")
+    stats: Stats = {}
+
+    for _ in range(games):
+        board = Board(size, win_length)
+        played: List[Tuple[bytes, int, int]] = []
+        winner: Optional[str] = None
+
+        ply = 0
+        while True:
+            side = ply % 2
+            figure, opponent = figures[side], figures[1 - side]
+            move = agent.choose_move(board, figure, opponent)
+            if ply < depth:
+                key, ts = canon.key(relative_cells(board, figure))
+                played.append((key, canon.to_canonical(move - 1, ts), side))
+
+            board.make_move(move, figure)
+            winner = board.check_winner()
+            if winner is not None or board.is_full():
+                break
+            ply += 1
+
+        for key, cell, side in played:
+            entry = stats.setdefault((key, cell), [0, 0, 0])
+            entry[0] += 1
+            if winner is None:
+                entry[2] += 1
+            elif winner == figures[side]:
+                entry[1] += 1
+    return stats
+
+
+def merge_stats(into: Stats, other: Stats) -> Stats:
+    """
+    Add the counts of `other` to `into`.
+    """
+    for key, (games, wins, draws) in other.items():
+        entry = into.setdefault(key, [0, 0, 0])
+        entry[0] += games
+        entry[1] += wins
+        entry[2] += draws
+    return into
+
+
+def _record_struct(width: int) -> struct.Struct:
+    return struct.Struct(f">{width}sHIII")
+
+
+def write_book(path: str, size: int, win_length: int, stats: Stats) -> None:
+    """
+    Write `stats` as a sorted book file. The file is written next to `path` and
+    renamed over it, so readers never see a half-written book.
+    """
+    width = key_width(size)
+    record = _record_struct(width)
+    total = HEADER_SIZE + len(stats) * record.size
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w+b") as f:
+        f.truncate(total)
+        with mmap.mmap(f.fileno(), total) as mm:
+            mm[:BOOK_HEADER.size] = BOOK_HEADER.pack(BOOK_MAGIC, VERSION, size, win_length, width, len(stats))
+            pos = HEADER_SIZE
+            for (key, cell), (games, wins, draws) in sorted(stats.items()):
+                record.pack_into(mm, pos, key, cell, games, wins, draws)
+                pos += record.size
+            mm.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_stats(path: str, size: int, win_length: int) -> Stats:
+    """
+    Load every record of a book file, to merge new games into it.
+    """
+    stats: Stats = {}
+    with OpeningBook(path) as book:
+        if (book.size, book.win_length) != (size, win_length):
+            raise BookError(
+                f"{path} is a {book.size}x{book.size} k={book.win_length} book, "
+                f"not {size}x{size} k={win_length}."
+            )
+        for key, cell, games, wins, draws in book.records():
+            stats[(key, cell)] = [games, wins, draws]
+    return stats
+
+
+class BuildReport:
+    """
+    Outcome of one `build_book` run.
+    """
+
+    def __init__(self, games: int, positions: int, records: int, elapsed: float) -> None:
+        self.games = games
+        self.positions = positions
+        self.records = records
+        self.elapsed = elapsed
+
+    def format(self) -> str:
+        rate = self.games / self.elapsed if self.elapsed else 0.0
+        return (
+            f"{self.games} games in {self.elapsed:.1f}s ({rate:.0f} games/s), "
+            f"book now holds {self.records} replies over {self.positions} positions"
+        )
+
+
+def build_book(path: str, size: int, win_length: Optional[int] = None, games: int = 1000,
+               depth: int = 8, spec: str = "budgeted:nodes=2000,patterns=1,noise=0.1",
+               workers: Optional[int] = None, seed: int = 0, batch: int = 50) -> BuildReport:
+    """
+    Play `games` self-play games in worker processes and merge their statistics into
+    the book at `path` (created if missing, extended otherwise).
+
+    The default agent scores positions by open lines: on 5x5 a plain budgeted search
+    only reaches depth 1 and plays cells in index order, which would fill the book
+    with noise.
+    """
+    win_length = size if win_length is None else win_length
+    Board(size, win_length)  # Validate the variant before spawning workers.
+    started = time.perf_counter()
+
+    stats = read_stats(path, size, win_length) if os.path.exists(path) else {}
+    tasks = []
+    for index, start in enumerate(range(0, games, batch)):
+        tasks.append((size, win_length, min(batch, games - start), depth, spec, seed * 1_000_003 + index))
+
+    if workers == 1:
+        for task in tasks:
+            merge_stats(stats, self_play(*task))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            for result in executor.map(self_play, *zip(*tasks)):
+                merge_stats(stats, result)
+
+    write_book(path, size, win_length, stats)
+    positions = len({key for key, _ in stats})
+    return BuildReport(games, positions, len(stats), time.perf_counter() - started)
+
+
+# -----------------
+# Lookup
+# -----------------
+
+class OpeningBook:
+    """
+    Read-only, memory-mapped view of a book file. Lookups binary-search the sorted
+    records in place; nothing is loaded up front.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            length = os.fstat(f.fileno()).st_size
+            if length < HEADER_SIZE:
+                raise BookError(f"{path} is too short to be an opening book.")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, size, win_length, width, count = BOOK_HEADER.unpack_from(self._mm, 0)
+        if magic != BOOK_MAGIC or version != VERSION or width != key_width(size):
+            self.close()
+            raise BookError(f"{path} is not a compatible opening book.")
+        self.size = size
+        self.win_length = win_length
+        self.count = count
+        self._record = _record_struct(width)
+        if HEADER_SIZE + count * self._record.size > length:
+            self.close()
+            raise BookError(f"{path} is truncated.")
+        self._canon = Canonicalizer(size)
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _key_at(self, index: int) -> bytes:
+        pos = HEADER_SIZE + index * self._record.size
+        return self._mm[pos:pos + self._canon.width]
+
+    def records(self):
+        for index in range(self.count):
+            yield self._record.unpack_from(self._mm, HEADER_SIZE + index * self._record.size)
+
+    def matches(self, board: Board) -> bool:
+        return (board.size, board.win_length) == (self.size, self.win_length)
+
+    def replies(self, board: Board, figure: str) -> List[Tuple[int, int, int, int]]:
+        """
+        Book replies for `figure` to move on `board`, as (position, games, wins, draws).
+        """
+        if not self.matches(board):
+            return []
+        key, ts = self._canon.key(relative_cells(board, figure))
+
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        replies = []
+        while lo < self.count and self._key_at(lo) == key:
+            _, cell, games, wins, draws = self._record.unpack_from(self._mm, HEADER_SIZE + lo * self._record.size)
+            replies.append((self._canon.from_canonical(cell, ts) + 1, games, wins, draws))
+            lo += 1
+        return replies
+
+    def best_reply(self, board: Board, figure: str, min_games: int = 1) -> Optional[int]:
+        """
+        The reply with the best score (wins plus half the draws, per game) among those
+        played at least `min_games` times, or None when the position is out of book.
+        """
+        best, best_score = None, -1.0
+        for pos, games, wins, draws in self.replies(board, figure):
+            if games < min_games or not board.is_valid_move(pos):
+                continue
+            score = (wins + draws / 2) / games
+            if score > best_score:
+                best, best_score = pos, score
+        return best
+
+
+class BookAI:
+    """
+    Plays from an opening book while the position is in it, and searches with
+    `BudgetedAI` once it leaves the book (or when the book is for another variant).
+    """
+
+    def __init__(self, path: str, min_games: int = 5, nodes: Optional[int] = None,
+                 time_ms: Optional[float] = None, seed: Optional[int] = None, patterns: bool = False) -> None:
+        self.book = OpeningBook(path)
+        self.min_games = min_games
+        self.search = BudgetedAI(nodes=nodes, time_ms=time_ms, seed=seed, patterns=patterns)
+        self.book_moves = 0
+
+    def __enter__(self) -> "BookAI":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.book.close()
+
+    def choose_move(self, board: Board, figure: str, opponent: str, stop: Optional[threading.Event] = None) -> int:
+        move = self.book.best_reply(board, figure, self.min_games)
+        if move is not None:
+            self.book_moves += 1
+            return move
+        return self.search.choose_move(board, figure, opponent, stop)
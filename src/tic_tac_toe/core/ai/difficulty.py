@@ -0,0 +1,33 @@
+from typing import Dict
+
+
+class Difficulty:
+    """
+    One CPU level: which agent plays, the persona it plays as, and its documented
+    worst-case response time.
+
+    `ceiling_ms` is the longest a single CPU move may take when replying to the
+    player (the CPU never moves first), on every size in `Board.SUPPORTED_SIZES`.
+    It is checked by tests/test_latency.py (with slack, see TTT_LATENCY_MARGIN there).
+    Budgeted levels cap their own search time below the ceiling, so the guarantee
+    holds even on bigger boards, and their node budget is checked exactly.
+    """
+
+    def __init__(self, label: str, spec: str, ceiling_ms: float, cpu_name: str, cpu_figure: str) -> None:
+        self.label = label
+        self.spec = spec
+        self.ceiling_ms = ceiling_ms
+        self.cpu_name = cpu_name
+        self.cpu_figure = cpu_figure
+
+
+DIFFICULTIES: Dict[str, Difficulty] = {
+    # Random legal moves.                                   worst case: 10 ms
+    "easy": Difficulty("Easy", "random", 10, "Randy", "🦦"),
+    # ~300 node search, a random move 25% of the time.      worst case: 50 ms
+    "medium": Difficulty("Medium", "budgeted:nodes=300,time_ms=30,noise=0.25", 50, "Nacho", "🧀"),
+    # ~3000 node search, a random move 5% of the time.      worst case: 100 ms
+    "tricky": Difficulty("Tricky", "budgeted:nodes=3000,time_ms=60,noise=0.05", 100, "Churro", "🥨"),
+    # Exhaustive minimax, never loses.                      worst case: 3 s
+    "hard": Difficulty("Hard", "minimax", 3000, "TicTaco", "🌮"),
+}
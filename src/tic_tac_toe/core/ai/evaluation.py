@@ -0,0 +1,154 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tic_tac_toe.core.game.board import Board
+
+
+class PatternEvaluator:
+    """
+    Static evaluation of m,n,k positions from runs inside line windows.
+
+    Every window of `win_length` cells along a row, column or diagonal is a bit mask
+    over the board; a side's stones are one integer bitboard per side, so counting the
+    stones of a window is an AND plus a popcount. A window holding stones of one side
+    only is a run of that length; it is open when the cells just past both of its ends
+    are on the board and empty, blocked otherwise. Windows holding both sides are dead.
+    """
+
+    def __init__(self, size: int, win_length: int,
+                 weights: Optional[Sequence[Tuple[int, int]]] = None) -> None:
+        self.size = size
+        self.win_length = win_length
+        # weights[length] = (blocked, open) value of a run of `length` stones.
+        self.weights = list(weights) if weights is not None else [
+            (10 ** (length - 1), 2 * 10 ** (length - 1)) if length else (0, 0)
+            for length in range(win_length + 1)
+        ]
+
+        self.masks: List[int] = []
+        self.ends: List[int] = []
+        self.closed: List[bool] = []
+        # Windows whose value depends on each cell: it's inside them or just past an end.
+        self.touching: List[List[int]] = [[] for _ in range(size * size)]
+
+        for line in Board(size, win_length)._winning_lines():
+            cells = [i * size + j for i, j in line]
+            (i0, j0), (i1, j1) = line[0], line[1]
+            di, dj = i1 - i0, j1 - j0
+            before = (i0 - di, j0 - dj)
+            after = (line[-1][0] + di, line[-1][1] + dj)
+            end_cells = [i * size + j for i, j in (before, after) if 0 <= i < size and 0 <= j < size]
+
+            index = len(self.masks)
+            self.masks.append(sum(1 << cell for cell in cells))
+            self.ends.append(sum(1 << cell for cell in end_cells))
+            # A window at the edge of the board can never be open.
+            self.closed.append(len(end_cells) < 2)
+            for cell in cells + end_cells:
+                self.touching[cell].append(index)
+
+    @classmethod
+    def for_board(cls, board: Board) -> "PatternEvaluator":
+        return cls(board.size, board.win_length)
+
+    def window(self, index: int, bits: Sequence[int]) -> Tuple[int, int, bool]:
+        """
+        (side, length, open) of window `index` for the bitboards `bits`,
+        with side -1 for empty or dead windows.
+        """
+        mask = self.masks[index]
+        first = (bits[0] & mask).bit_count()
+        second = (bits[1] & mask).bit_count()
+        if (first and second) or not (first or second):
+            return -1, 0, False
+        is_open = not self.closed[index] and not (self.ends[index] & (bits[0] | bits[1]))
+        return (0, first, is_open) if first else (1, second, is_open)
+
+    def value(self, index: int, bits: Sequence[int]) -> int:
+        """
+        Value of window `index` for side 0 (negative when it favours side 1).
+        """
+        side, length, is_open = self.window(index, bits)
+        if side < 0:
+            return 0
+        weight = self.weights[length][is_open]
+        return weight if side == 0 else -weight
+
+    def counts(self, bits: Sequence[int]) -> Dict[Tuple[int, int, bool], int]:
+        """
+        Number of (side, length, open) runs over every window, for reporting.
+        """
+        counts: Dict[Tuple[int, int, bool], int] = {}
+        for index in range(len(self.masks)):
+            key = self.window(index, bits)
+            if key[0] >= 0:
+                counts[key] = counts.get(key, 0) + 1
+        return counts
+
+
+class PatternState:
+    """
+    Incrementally updated evaluation of one position: a move only re-scores the
+    windows touching its cell.
+    """
+
+    def __init__(self, evaluator: PatternEvaluator) -> None:
+        self.evaluator = evaluator
+        self.bits = [0, 0]
+        self.values = [0] * len(evaluator.masks)
+        self.total = 0
+
+    @classmethod
+    def from_board(cls, board: Board, figure: str,
+                   evaluator: Optional[PatternEvaluator] = None) -> "PatternState":
+        """
+        State of `board` with `figure` as side 0.
+        """
+        state = cls(evaluator if evaluator is not None else PatternEvaluator.for_board(board))
+        for index, cell in enumerate(c for row in board.current_state for c in row):
+            if cell != " ":
+                state.play(index, 0 if cell == figure else 1)
+        return state
+
+    def _rescore(self, cell: int) -> None:
+        evaluator, bits, values = self.evaluator, self.bits, self.values
+        for index in evaluator.touching[cell]:
+            value = evaluator.value(index, bits)
+            self.total += value - values[index]
+            values[index] = value
+
+    def play(self, cell: int, side: int) -> None:
+        self.bits[side] |= 1 << cell
+        self._rescore(cell)
+
+    def undo(self, cell: int, side: int) -> None:
+        self.bits[side] &= ~(1 << cell)
+        self._rescore(cell)
+
+    def score(self, side: int) -> int:
+        """
+        Evaluation from the point of view of `side`.
+        """
+        return self.total if side == 0 else -self.total
+
+    def bounded_score(self, side: int, bound: int) -> int:
+        """
+        `score(side)` squashed into (-bound, bound), keeping its order.
+        """
+        score = self.score(side)
+        scale = self.evaluator.weights[self.evaluator.win_length - 1][1]
+        return bound * score // (abs(score) + scale)
+
+    def evaluate_children(self, cells: Sequence[int], side: int) -> List[int]:
+        """
+        Score for `side` after it plays each of `cells`, in one pass and without
+        changing the state: only the windows touching each cell are re-scored.
+        """
+        evaluator, values = self.evaluator, self.values
+        scores = []
+        for cell in cells:
+            bits = list(self.bits)
+            bits[side] |= 1 << cell
+            delta = sum(evaluator.value(index, bits) - values[index] for index in evaluator.touching[cell])
+            total = self.total + delta
+            scores.append(total if side == 0 else -total)
+        return scores
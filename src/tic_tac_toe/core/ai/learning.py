@@ -0,0 +1,292 @@
+import mmap
+import os
+import random
+import struct
+import threading
+import time
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from tic_tac_toe.core.ai.analysis import EMPTY, MINE, THEIRS, PositionAnalyzer
+from tic_tac_toe.core.ai.positions import FIGURES, enumerate_positions, replay
+from tic_tac_toe.core.ai.symmetry import Canonicalizer
+from tic_tac_toe.core.game.board import Board
+
+# ---------------------------------------------------------------------------
+# Value table file (memory-mapped at game time):
+#
+#   header   magic, version, board size, games trained on
+#   values   3 ** (size * size) float32, native byte order
+#
+# values[i] is the learned value, in [-1, 1], of the canonical position whose
+# base-3 key (cells relative to the player to move) is i, for the player to move.
+# Positions that are not canonical are never read or written.
+# ---------------------------------------------------------------------------
+
+TABLE_MAGIC = b"TTTV"
+VERSION = 1
+
+TABLE_HEADER = struct.Struct("<4sHHQ")
+HEADER_SIZE = 32
+
+# Largest table this scheme is used for (3x3 is 19683 entries, 4x4 would be 43M).
+MAX_ENTRIES = 1 << 22
+
+
+class ValueTable:
+    """
+    Learned values indexed by canonical position. `values` is a writable array
+    while training, or a zero-copy view of a memory-mapped file when opened.
+    """
+
+    def __init__(self, size: int, values, games: int = 0, mm: Optional[mmap.mmap] = None) -> None:
+        self.size = size
+        # Self-play trains on boards where the full row wins.
+        self.win_length = size
+        self.values = values
+        self.games = games
+        self._mm = mm
+        self._canon = Canonicalizer(size)
+
+    @classmethod
+    def new(cls, size: int) -> "ValueTable":
+        entries = 3 ** (size * size)
+        if entries > MAX_ENTRIES:
+            raise ValueError(f"A {size}x{size} value table would need {entries} entries.")
+        return cls(size, array("f", bytes(4 * entries)))
+
+    @classmethod
+    def open(cls, path: str) -> "ValueTable":
+        """
+        Map a saved table read-only; values are read straight from the page cache.
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER_SIZE:
+                raise ValueError(f"{path} is too short to be a value table.")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, games = TABLE_HEADER.unpack_from(mm, 0)
+        if magic != TABLE_MAGIC or version != VERSION or len(mm) != HEADER_SIZE + 4 * 3 ** (size * size):
+            mm.close()
+            raise ValueError(f"{path} is not a compatible value table.")
+        return cls(size, memoryview(mm)[HEADER_SIZE:].cast("f"), games, mm)
+
+    @classmethod
+    def load(cls, path: str) -> "ValueTable":
+        """
+        Read a saved table into a writable array, to continue training it.
+        """
+        with cls.open(path) as mapped:
+            table = cls(mapped.size, array("f", mapped.values), mapped.games)
+        return table
+
+    def __enter__(self) -> "ValueTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self.values.release()
+            self._mm.close()
+            self._mm = None
+
+    def save(self, path: str) -> None:
+        """
+        Write a checkpoint next to `path` and rename it over the old one.
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            header = TABLE_HEADER.pack(TABLE_MAGIC, VERSION, self.size, self.games)
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.write(memoryview(self.values).cast("B"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def index(self, board: Board, figure: str) -> int:
+        """
+        Table index of `board` with `figure` to move.
+        """
+        cells = [
+            EMPTY if cell == " " else MINE if cell == figure else THEIRS
+            for row in board.current_state for cell in row
+        ]
+        return int.from_bytes(self._canon.key(cells)[0], "big")
+
+    def move_values(self, board: Board, figure: str, opponent: str) -> List[Tuple[int, float]]:
+        """
+        (move, value for `figure`) of every available move: 1 for a win, 0 for a
+        draw, minus the opponent's learned value otherwise.
+        """
+        values = []
+        for pos in board.get_available_moves():
+            board.make_move(pos, figure)
+            if board.check_winner() is not None:
+                value = 1.0
+            elif board.is_full():
+                value = 0.0
+            else:
+                value = -self.values[self.index(board, opponent)]
+            board.undo_move(pos)
+            values.append((pos, value))
+        return values
+
+
+class LearnedAI:
+    """
+    Plays the move with the best learned value from a trained `ValueTable` file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.table = ValueTable.open(path)
+
+    def __enter__(self) -> "LearnedAI":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.table.close()
+
+    def choose_move(self, board: Board, figure: str, opponent: str, stop: Optional[threading.Event] = None) -> int:
+        if (board.size, board.win_length) != (self.table.size, self.table.win_length):
+            raise ValueError(
+                f"The value table was trained on {self.table.size}x{self.table.size} "
+                f"(win length {self.table.win_length}), not {board.size}x{board.size} "
+                f"(win length {board.win_length})."
+            )
+        values = self.table.move_values(board.clone(), figure, opponent)
+        return max(values, key=lambda item: item[1])[0]
+
+
+# -----------------
+# Training
+# -----------------
+
+def self_play(path: str, games: int, epsilon: float, seed: int) -> Tuple[array, array]:
+    """
+    Worker entry point: play `games` epsilon-greedy games against the checkpoint at
+    `path` and return the TD targets as parallel (index, target) arrays. Each target
+    is the best value reachable in one move, so exploring moves don't bias it.
+    """
+    rng = random.Random(seed)
+    indices, targets = array("I"), array("f")
+    with ValueTable.open(path) as table:
+        figures = ("X", "O")
+        for _ in range(games):
+            board = Board(table.size)
+            side = 0
+            while True:
+                figure, opponent = figures[side], figures[1 - side]
+                values = table.move_values(board, figure, opponent)
+                best_move, best_value = max(values, key=lambda item: item[1])
+                indices.append(table.index(board, figure))
+                targets.append(best_value)
+
+                move = rng.choice(values)[0] if rng.random() < epsilon else best_move
+                board.make_move(move, figure)
+                if board.check_winner() is not None or board.is_full():
+                    break
+                side = 1 - side
+    return indices, targets
+
+
+def agreement(table: ValueTable) -> float:
+    """
+    Share of reachable positions where the learned move is an optimal one, as
+    proven by exhaustive search. Like `TicTacToeAI`, only the outcome counts: a
+    slower win is still optimal.
+    """
+    analyzer = PositionAnalyzer()
+    total = optimal = 0
+    for moves in enumerate_positions(table.size):
+        board = replay(moves, Board(table.size))
+        if board.check_winner() is not None or board.is_full():
+            continue
+        figure, opponent = FIGURES[len(moves) % 2], FIGURES[1 - len(moves) % 2]
+        exact = analyzer.evaluate_moves(board, figure)
+        move = max(table.move_values(board, figure, opponent), key=lambda item: item[1])[0]
+        total += 1
+        optimal += PositionAnalyzer.describe(exact[move])[0] == PositionAnalyzer.describe(max(exact.values()))[0]
+    return optimal / total if total else 1.0
+
+
+class TrainingReport:
+    """
+    Throughput and convergence of one `train` run.
+    """
+
+    def __init__(self) -> None:
+        self.games = 0
+        # Seconds spent training, excluding convergence checks.
+        self.elapsed = 0.0
+        # (games trained so far, agreement with exhaustive search)
+        self.history: List[Tuple[int, float]] = []
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def format(self) -> str:
+        lines = [f"{'games':>9}  {'optimal moves':>13}"]
+        lines += [f"{games:>9}  {share:>12.1%}" for games, share in self.history]
+        lines.append(f"{self.games} games in {self.elapsed:.1f}s ({self.games_per_second:.0f} games/s)")
+        return "\n".join(lines)
+
+
+def train(path: str, games: int = 20_000, size: int = 3, workers: Optional[int] = None,
+          batch: int = 250, alpha: float = 0.5, epsilon: float = 0.2, seed: int = 0,
+          eval_every: int = 5000) -> TrainingReport:
+    """
+    Train the table at `path` (created if missing, resumed otherwise) by self-play.
+
+    Each round, every worker reads the latest checkpoint through mmap, plays `batch`
+    games and sends back its TD targets; the central table applies them, then the
+    new checkpoint is written for the next round.
+    """
+    table = ValueTable.load(path) if os.path.exists(path) else ValueTable.new(size)
+    workers = workers or os.cpu_count() or 1
+    report = TrainingReport()
+    started = time.perf_counter()
+    eval_time = 0.0
+    next_eval = eval_every
+    values = table.values
+
+    executor = ProcessPoolExecutor(workers) if workers != 1 else None
+    try:
+        round_index = 0
+        while report.games < games:
+            table.save(path)
+            counts = [min(batch, games - report.games - i * batch) for i in range(workers)]
+            tasks = [(path, count, epsilon, seed * 1_000_003 + round_index * workers + i)
+                     for i, count in enumerate(counts) if count > 0]
+            if executor is None:
+                results = [self_play(*task) for task in tasks]
+            else:
+                results = list(executor.map(self_play, *zip(*tasks)))
+
+            for indices, targets in results:
+                for index, target in zip(indices, targets):
+                    values[index] += alpha * (target - values[index])
+            played = sum(task[1] for task in tasks)
+            report.games += played
+            table.games += played
+            round_index += 1
+
+            if report.games >= next_eval or report.games >= games:
+                eval_started = time.perf_counter()
+                report.history.append((table.games, agreement(table)))
+                eval_time += time.perf_counter() - eval_started
+                next_eval += eval_every
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    table.save(path)
+    # Throughput counts training only, not the convergence checks.
+    report.elapsed = time.perf_counter() - started - eval_time
+    return report
@@ -0,0 +1,64 @@
+import random
+
+from collections import deque
+from typing import List, Optional, Tuple
+
+from tic_tac_toe.core.game.board import Board
+
+FIGURES = ("X", "O")
+
+# A position is identified by the moves (board positions) that lead to it, X moving first.
+MoveSequence = Tuple[int, ...]
+
+
+def replay(moves: MoveSequence, board: Board) -> Board:
+    for ply, pos in enumerate(moves):
+        if not board.make_move(pos, FIGURES[ply % 2]):
+            raise ValueError(f"Illegal move {pos} in {moves}")
+    return board
+
+
+def enumerate_positions(size: int = 3, win_length: Optional[int] = None) -> List[MoveSequence]:
+    """
+    Every reachable position, each with the lexicographically smallest shortest move
+    sequence leading to it (breadth first, so sequences are minimal).
+    """
+    start: MoveSequence = ()
+    seen = {tuple(" " for _ in range(size * size))}
+    positions = [start]
+    queue = deque([start])
+    while queue:
+        moves = queue.popleft()
+        board = replay(moves, Board(size, win_length))
+        if board.check_winner() is not None or board.is_full():
+            continue
+        for pos in board.get_available_moves():
+            board.make_move(pos, FIGURES[len(moves) % 2])
+            key = tuple(cell for row in board.current_state for cell in row)
+            i, j = board.valid_moves[pos]
+            board.current_state[i][j] = " "
+            if key not in seen:
+                seen.add(key)
+                child = moves + (pos,)
+                positions.append(child)
+                queue.append(child)
+    return positions
+
+
+def sample_positions(size: int, count: int, seed: int, win_length: Optional[int] = None) -> List[MoveSequence]:
+    """
+    Random positions from random playouts of random length, for boards too big to enumerate.
+    """
+    rng = random.Random(seed)
+    positions: List[MoveSequence] = []
+    for _ in range(count):
+        board = Board(size, win_length)
+        moves: List[int] = []
+        for ply in range(rng.randrange(size * size + 1)):
+            if board.check_winner() is not None or board.is_full():
+                break
+            pos = rng.choice(board.get_available_moves())
+            board.make_move(pos, FIGURES[ply % 2])
+            moves.append(pos)
+        positions.append(tuple(moves))
+    return positions
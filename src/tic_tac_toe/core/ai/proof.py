@@ -0,0 +1,390 @@
+import mmap
+import os
+import struct
+import threading
+import time
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from tic_tac_toe.core.ai.agents import BudgetedAI
+from tic_tac_toe.core.ai.symmetry import Canonicalizer, key_width
+from tic_tac_toe.core.game.board import Board
+
+# Proof and disproof numbers are "from the point of view of the player to move":
+#   phi   - how hard it is to show the player to move reaches its goal
+#   delta - how hard it is to show it doesn't
+# The attacker's goal is to win; the defender's goal is to stop that (draw or win).
+INF = 10 ** 12
+
+# Cells are stored as the first player's / second player's marks, so one key means
+# the same thing whoever plays which figure.
+EMPTY, FIRST, SECOND = 0, 1, 2
+
+OUTCOMES = ("draw", "first", "second")
+
+# ---------------------------------------------------------------------------
+# Proof file (memory-mapped, read only at runtime):
+#
+#   header   magic, version, board size, win length, key width, outcome, record count
+#   records  record count * (key, move cell), sorted by key
+#
+# One record per position where a player following a proven strategy is to move:
+# the winner's winning strategy, or both players' drawing strategies. Keys and cells
+# are canonical, as in the opening book.
+# ---------------------------------------------------------------------------
+
+PROOF_MAGIC = b"TTTP"
+VERSION = 1
+
+PROOF_HEADER = struct.Struct(">4sHBBBBI")
+HEADER_SIZE = 16
+
+
+class ProofError(Exception):
+    """
+    Raised when a proof file is truncated or not a proof file.
+    """
+
+
+def absolute_cells(board: Board, figure: str) -> List[int]:
+    """
+    Board cells as first/second player marks, `figure` being the player to move.
+    """
+    cells = [cell for row in board.current_state for cell in row]
+    mine = sum(cell == figure for cell in cells)
+    theirs = sum(cell != " " and cell != figure for cell in cells)
+    mine_mark, theirs_mark = (FIRST, SECOND) if mine == theirs else (SECOND, FIRST)
+    return [EMPTY if cell == " " else mine_mark if cell == figure else theirs_mark for cell in cells]
+
+
+class ProofResult:
+    """
+    Game-theoretic value of a position and the strategies proving it.
+    `strategy` maps canonical positions to the canonical cell to play there.
+    """
+
+    def __init__(self, size: int, win_length: int, outcome: str, strategy: Dict[bytes, int],
+                 nodes: int, elapsed: float, gc_runs: int) -> None:
+        self.size = size
+        self.win_length = win_length
+        self.outcome = outcome
+        self.strategy = strategy
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.gc_runs = gc_runs
+
+    def format(self) -> str:
+        verdict = "draw" if self.outcome == "draw" else f"{self.outcome} player wins"
+        return (
+            f"{self.size}x{self.size} k={self.win_length}: {verdict} "
+            f"({self.nodes} nodes in {self.elapsed:.1f}s, {self.gc_runs} table collections, "
+            f"{len(self.strategy)} strategy positions)"
+        )
+
+
+class ProofSolver:
+    """
+    Depth-first proof-number search (df-pn) over the `Board` move API.
+
+    A position is solved with two searches: "the first player wins", and if that is
+    disproved, "the second player wins"; if both are disproved the game is a draw.
+    The transposition table is keyed by canonical position and holds at most
+    `max_entries` entries: when full, the unsolved entries with the least search
+    work behind them are dropped first.
+    """
+
+    def __init__(self, max_entries: int = 1_000_000) -> None:
+        self.max_entries = max_entries
+        self.table: Dict[bytes, List[int]] = {}
+        self.nodes = 0
+        self.gc_runs = 0
+        self._canon: Optional[Canonicalizer] = None
+        self._attacker = ""
+
+    def solve(self, board: Board, figure: str, opponent: str) -> ProofResult:
+        """
+        Solve `board` with `figure` to move. The board is left as it was.
+        """
+        started = time.perf_counter()
+        self._canon = Canonicalizer(board.size)
+        self.nodes = 0
+        self.gc_runs = 0
+        stones = sum(cell != " " for row in board.current_state for cell in row)
+        first, second = (figure, opponent) if stones % 2 == 0 else (opponent, figure)
+
+        strategy: Dict[bytes, int] = {}
+        if self._prove(board, figure, opponent, attacker=first):
+            outcome = "first"
+            self._extract(board, figure, opponent, first, strategy, set())
+        else:
+            # The second player's drawing strategy comes from this disproof: keep it
+            # before the table is reused for the other search.
+            defence: Dict[bytes, int] = {}
+            self._extract(board, figure, opponent, second, defence, set())
+            if self._prove(board, figure, opponent, attacker=second):
+                outcome = "second"
+                self._extract(board, figure, opponent, second, strategy, set())
+            else:
+                outcome = "draw"
+                self._extract(board, figure, opponent, first, strategy, set())
+                strategy.update(defence)
+
+        self.table.clear()
+        return ProofResult(board.size, board.win_length, outcome, strategy,
+                           self.nodes, time.perf_counter() - started, self.gc_runs)
+
+    # -----------------
+    # df-pn
+    # -----------------
+
+    def _prove(self, board: Board, figure: str, opponent: str, attacker: str) -> bool:
+        """
+        True if `attacker` wins from `board` with `figure` to move.
+        """
+        self.table.clear()
+        self._attacker = attacker
+        terminal = self._terminal(board, opponent, figure)
+        if terminal is None:
+            terminal = self._mid(board, figure, opponent, self._key(board, figure), INF, INF)
+        phi, delta = terminal
+        # phi == 0: the player to move reaches its goal.
+        return (phi == 0) == (figure == attacker)
+
+    def _key(self, board: Board, figure: str) -> bytes:
+        return self._canon.key(absolute_cells(board, figure))[0]
+
+    def _terminal(self, board: Board, mover: str, other: str) -> Optional[Tuple[int, int]]:
+        """
+        (phi, delta) for `other` to move if `mover`'s last move ended the game, else None.
+        """
+        if board.check_winner() is not None:
+            return INF, 0
+        if board.is_full():
+            # A draw is a success for the defender only.
+            return (INF, 0) if other == self._attacker else (0, INF)
+        return None
+
+    def _lookup(self, key: bytes) -> Tuple[int, int]:
+        entry = self.table.get(key)
+        if entry is None:
+            return 1, 1
+        return entry[0], entry[1]
+
+    def _store(self, key: bytes, phi: int, delta: int, work: int) -> None:
+        entry = self.table.get(key)
+        if entry is None:
+            self.table[key] = [phi, delta, work]
+            if len(self.table) > self.max_entries:
+                self._collect()
+        else:
+            entry[0], entry[1], entry[2] = phi, delta, entry[2] + work
+
+    def _collect(self) -> None:
+        """
+        Shrink the table to 3/4 of its capacity, dropping unsolved, cheap entries first.
+        """
+        self.gc_runs += 1
+        target = self.max_entries * 3 // 4
+        ranked = sorted(
+            self.table.items(),
+            key=lambda item: (item[1][0] == 0 or item[1][1] == 0, item[1][2]),
+        )
+        for key, _ in ranked[:len(self.table) - target]:
+            del self.table[key]
+
+    def _mid(self, board: Board, mover: str, other: str, key: bytes,
+             th_phi: int, th_delta: int) -> Tuple[int, int]:
+        """
+        Expand the position with `mover` to move until its proof or disproof number
+        reaches its threshold. Returns its (phi, delta).
+        """
+        self.nodes += 1
+        start = self.nodes
+
+        children: List[Tuple[int, Optional[bytes], Optional[Tuple[int, int]]]] = []
+        for pos in board.get_available_moves():
+            board.make_move(pos, mover)
+            terminal = self._terminal(board, mover, other)
+            child_key = self._key(board, other) if terminal is None else None
+            board.undo_move(pos)
+            children.append((pos, child_key, terminal))
+
+        while True:
+            phi, delta, second, best = INF, 0, INF, 0
+            for index, (_, child_key, terminal) in enumerate(children):
+                c_phi, c_delta = terminal if terminal is not None else self._lookup(child_key)
+                delta = min(INF, delta + c_phi)
+                if c_delta < phi:
+                    phi, second, best = c_delta, phi, index
+                elif c_delta < second:
+                    second = c_delta
+
+            if phi >= th_phi or delta >= th_delta:
+                self._store(key, phi, delta, self.nodes - start + 1)
+                return phi, delta
+
+            pos, child_key, terminal = children[best]
+            c_phi, _ = self._lookup(child_key)
+            child_th_phi = min(INF, th_delta - delta + c_phi)
+            child_th_delta = min(th_phi, second + 1)
+            board.make_move(pos, mover)
+            try:
+                self._mid(board, other, mover, child_key, child_th_phi, child_th_delta)
+            finally:
+                board.undo_move(pos)
+
+    # -----------------
+    # Strategy extraction
+    # -----------------
+
+    def _child_fails(self, board: Board, mover: str, other: str) -> bool:
+        """
+        True if `other` (to move after `mover`'s move) can't reach its goal, solving
+        the position again if its entry was collected.
+        """
+        terminal = self._terminal(board, mover, other)
+        if terminal is not None:
+            return terminal[1] == 0
+        key = self._key(board, other)
+        phi, delta = self._lookup(key)
+        if phi != 0 and delta != 0:
+            phi, delta = self._mid(board, other, mover, key, INF, INF)
+        return delta == 0
+
+    def _extract(self, board: Board, mover: str, other: str, side: str,
+                 strategy: Dict[bytes, int], seen: Set[bytes]) -> None:
+        """
+        Record the moves of `side`, who reaches its goal in the current search, in
+        every position of its strategy reachable from `board`.
+        """
+        key, ts = self._canon.key(absolute_cells(board, mover))
+        if key in seen:
+            return
+        seen.add(key)
+
+        for pos in board.get_available_moves():
+            board.make_move(pos, mover)
+            try:
+                if mover == side:
+                    if not self._child_fails(board, mover, other):
+                        continue
+                    strategy[key] = self._canon.to_canonical(pos - 1, ts)
+                if self._terminal(board, mover, other) is None:
+                    self._extract(board, other, mover, side, strategy, seen)
+            finally:
+                board.undo_move(pos)
+            if mover == side:
+                return
+
+
+# -----------------
+# Proof files
+# -----------------
+
+def write_proof(path: str, result: ProofResult) -> None:
+    """
+    Write the strategy of `result` as a sorted proof file (written next to `path`
+    and renamed over it).
+    """
+    width = key_width(result.size)
+    record = struct.Struct(f">{width}sH")
+    total = HEADER_SIZE + len(result.strategy) * record.size
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w+b") as f:
+        f.truncate(total)
+        with mmap.mmap(f.fileno(), total) as mm:
+            mm[:PROOF_HEADER.size] = PROOF_HEADER.pack(
+                PROOF_MAGIC, VERSION, result.size, result.win_length, width,
+                OUTCOMES.index(result.outcome), len(result.strategy),
+            )
+            pos = HEADER_SIZE
+            for key, cell in sorted(result.strategy.items()):
+                record.pack_into(mm, pos, key, cell)
+                pos += record.size
+            mm.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ProofOracle:
+    """
+    Read-only, memory-mapped view of a proof file: the proven move, if any, for the
+    player to move in a position.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            length = os.fstat(f.fileno()).st_size
+            if length < HEADER_SIZE:
+                raise ProofError(f"{path} is too short to be a proof file.")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, size, win_length, width, outcome, count = PROOF_HEADER.unpack_from(self._mm, 0)
+        if magic != PROOF_MAGIC or version != VERSION or width != key_width(size) or outcome >= len(OUTCOMES):
+            self.close()
+            raise ProofError(f"{path} is not a compatible proof file.")
+        self.size = size
+        self.win_length = win_length
+        self.outcome = OUTCOMES[outcome]
+        self.count = count
+        self._record = struct.Struct(f">{width}sH")
+        if HEADER_SIZE + count * self._record.size > length:
+            self.close()
+            raise ProofError(f"{path} is truncated.")
+        self._canon = Canonicalizer(size)
+
+    def __enter__(self) -> "ProofOracle":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _key_at(self, index: int) -> bytes:
+        pos = HEADER_SIZE + index * self._record.size
+        return self._mm[pos:pos + self._canon.width]
+
+    def move(self, board: Board, figure: str) -> Optional[int]:
+        """
+        The proven move for `figure` to move on `board`, or None if the position is
+        not part of the stored strategies (or the board is another variant).
+        """
+        if (board.size, board.win_length) != (self.size, self.win_length):
+            return None
+        key, ts = self._canon.key(absolute_cells(board, figure))
+
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.count or self._key_at(lo) != key:
+            return None
+        _, cell = self._record.unpack_from(self._mm, HEADER_SIZE + lo * self._record.size)
+        return self._canon.from_canonical(cell, ts) + 1
+
+
+class OracleAI:
+    """
+    Plays proven moves from a proof file, and searches with `BudgetedAI` in
+    positions the proof doesn't cover (e.g. on the losing side).
+    """
+
+    def __init__(self, path: str, nodes: Optional[int] = None, time_ms: Optional[float] = None,
+                 seed: Optional[int] = None) -> None:
+        self.oracle = ProofOracle(path)
+        self.search = BudgetedAI(nodes=nodes, time_ms=time_ms, seed=seed)
+        self.oracle_moves = 0
+
+    def choose_move(self, board: Board, figure: str, opponent: str, stop: Optional[threading.Event] = None) -> int:
+        move = self.oracle.move(board, figure)
+        if move is not None and board.is_valid_move(move):
+            self.oracle_moves += 1
+            return move
+        return self.search.choose_move(board, figure, opponent, stop)
@@ -0,0 +1,489 @@
+import mmap
+import os
+import random
+import struct
+import threading
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tic_tac_toe.core.ai.agents import SearchCancelled
+from tic_tac_toe.core.ai.analysis import EMPTY, MINE, THEIRS
+from tic_tac_toe.core.ai.book import relative_cells
+from tic_tac_toe.core.ai.registry import create_agent
+from tic_tac_toe.core.ai.symmetry import Canonicalizer, key_width
+from tic_tac_toe.core.game.board import Board
+
+# ---------------------------------------------------------------------------
+# Puzzle file (memory-mapped, records decoded one at a time):
+#
+#   header   magic, version, board size, win length, key width, record count
+#   records  record count * (key, solution cell, moves), sorted by (moves, key)
+#
+# Keys are canonical positions as in opening books: cells relative to the solver
+# (empty, mine, theirs) read as a base-3 number, minimized over the 8 symmetries.
+# The solution cell is 0-based in the canonical orientation, and `moves` is how many
+# moves of the solver the forced win takes, the winning move included.
+# ---------------------------------------------------------------------------
+
+PUZZLE_MAGIC = b"TTTZ"
+VERSION = 1
+
+PUZZLE_HEADER = struct.Struct(">4sHBBBxI")
+HEADER_SIZE = 16
+
+# Canonical key -> (solution cell, moves).
+Found = Dict[bytes, Tuple[int, int]]
+
+
+class PuzzleError(Exception):
+    """
+    Raised when a puzzle file is truncated or built for another variant.
+    """
+
+
+# -----------------
+# Verification
+# -----------------
+
+class ForcedWinSearch:
+    """
+    Exhaustive, depth-limited AND/OR search for forced wins.
+
+    It only asks whether the player to move can win within a number of its own moves,
+    whatever the defence, rather than searching to the end of the game. The same
+    pruning a human would use keeps it exhaustive but small: a player facing one
+    immediate threat must block it, and two threats can't be blocked.
+
+    This is deliberately not built on `TicTacToeAI`: its unbounded minimax has to
+    search to the end of the game, which is far too slow on boards larger than 3x3.
+    """
+
+    def __init__(self, stop: Optional[threading.Event] = None) -> None:
+        self.stop = stop
+        self.nodes = 0
+        # (size, win length) -> the winning lines through each cell.
+        self._through: Dict[Tuple[int, int], List[List[List[int]]]] = {}
+
+    def wins_within(self, board: Board, figure: str, opponent: str, moves: int) -> bool:
+        """
+        True if `figure` to move on `board` can force a win within `moves` moves.
+        """
+        cells, through = self._prepare(board)
+        return self._attack(cells, through, figure, opponent, moves)
+
+    def loses_within(self, board: Board, figure: str, opponent: str, moves: int) -> bool:
+        """
+        True if `opponent` to move on `board` can't stop `figure` from winning within
+        `moves` more moves.
+        """
+        cells, through = self._prepare(board)
+        return self._defend_fails(cells, through, figure, opponent, moves)
+
+    def winning_moves(self, board: Board, figure: str, opponent: str, moves: int) -> List[int]:
+        """
+        Every move that forces a win for `figure` within `moves` moves, itself included.
+        """
+        cells, through = self._prepare(board)
+        winners = []
+        for cell in [i for i, c in enumerate(cells) if c == " "]:
+            cells[cell] = figure
+            try:
+                if self._wins(cells, through, cell, figure) or (
+                        moves > 1 and self._defend_fails(cells, through, figure, opponent, moves - 1)):
+                    winners.append(cell + 1)
+            finally:
+                cells[cell] = " "
+        return winners
+
+    def solve(self, board: Board, figure: str, opponent: str,
+              max_moves: int) -> Optional[Tuple[int, List[int]]]:
+        """
+        (moves, winning moves) of the fastest forced win for `figure` within
+        `max_moves` moves, or None if there is none.
+        """
+        for moves in range(1, max_moves + 1):
+            winners = self.winning_moves(board, figure, opponent, moves)
+            if winners:
+                return moves, winners
+        return None
+
+    def best_defence(self, board: Board, figure: str, opponent: str, moves: int) -> int:
+        """
+        Reply for `figure`, defending against `opponent`'s forced win in `moves`: a
+        winning reply if there is one, otherwise one that holds out the longest.
+        """
+        cells, through = self._prepare(board)
+        best, best_delay = None, -1
+        for cell in [i for i, c in enumerate(cells) if c == " "]:
+            cells[cell] = figure
+            try:
+                if self._wins(cells, through, cell, figure):
+                    return cell + 1
+                delay = next(
+                    (n for n in range(1, moves + 1) if self._attack(cells, through, opponent, figure, n)),
+                    moves + 1,
+                )
+            finally:
+                cells[cell] = " "
+            if delay > best_delay:
+                best, best_delay = cell + 1, delay
+        return best
+
+    # -----------------
+    # Helpers
+    # -----------------
+
+    def _prepare(self, board: Board) -> Tuple[List[str], List[List[List[int]]]]:
+        variant = (board.size, board.win_length)
+        through = self._through.get(variant)
+        if through is None:
+            through = [[] for _ in range(board.size * board.size)]
+            for line in board._lines:
+                indices = [i * board.size + j for i, j in line]
+                for index in indices:
+                    through[index].append(indices)
+            self._through[variant] = through
+        return [cell for row in board.current_state for cell in row], through
+
+    @staticmethod
+    def _wins(cells: List[str], through: List[List[List[int]]], cell: int, figure: str) -> bool:
+        """
+        True if `figure`, just played at `cell`, completes a line.
+        """
+        return any(all(cells[i] == figure for i in line) for line in through[cell])
+
+    def _threats(self, cells: List[str], through: List[List[List[int]]],
+                 empty: Sequence[int], figure: str) -> List[int]:
+        """
+        Empty cells where `figure` would win at once.
+        """
+        threats = []
+        for cell in empty:
+            cells[cell] = figure
+            if self._wins(cells, through, cell, figure):
+                threats.append(cell)
+            cells[cell] = " "
+        return threats
+
+    def _tick(self) -> None:
+        self.nodes += 1
+        if self.stop is not None and self.stop.is_set():
+            raise SearchCancelled()
+
+    def _attack(self, cells: List[str], through: List[List[List[int]]],
+                figure: str, opponent: str, moves: int) -> bool:
+        """
+        OR node: `figure` to move wins within `moves` moves.
+        """
+        self._tick()
+        empty = [i for i, c in enumerate(cells) if c == " "]
+        if moves < 1 or not empty:
+            return False
+        if self._threats(cells, through, empty, figure):
+            return True
+        # The defender needs a reply and the attacker another move.
+        if moves == 1 or len(empty) < 3:
+            return False
+
+        candidates = empty
+        blocks = self._threats(cells, through, empty, opponent)
+        if len(blocks) > 1:
+            return False
+        if blocks:
+            candidates = blocks
+
+        for cell in candidates:
+            cells[cell] = figure
+            try:
+                if self._defend_fails(cells, through, figure, opponent, moves - 1):
+                    return True
+            finally:
+                cells[cell] = " "
+        return False
+
+    def _defend_fails(self, cells: List[str], through: List[List[List[int]]],
+                      figure: str, opponent: str, moves: int) -> bool:
+        """
+        AND node: `opponent` to move loses within `moves` moves of `figure`.
+        """
+        self._tick()
+        empty = [i for i, c in enumerate(cells) if c == " "]
+        if not empty or self._threats(cells, through, empty, opponent):
+            return False
+
+        replies = empty
+        threats = self._threats(cells, through, empty, figure)
+        if len(threats) > 1:
+            return moves >= 1
+        if threats:
+            replies = threats
+
+        for cell in replies:
+            cells[cell] = opponent
+            try:
+                if not self._attack(cells, through, figure, opponent, moves):
+                    return False
+            finally:
+                cells[cell] = " "
+        return True
+
+
+# -----------------
+# Mining
+# -----------------
+
+def within_reach(board: Board, figure: str, opponent: str, moves: int) -> bool:
+    """
+    Cheap filter before verifying: some line free of `opponent` already holds enough
+    of `figure`'s marks to be completed in `moves` moves.
+    """
+    state = board.current_state
+    for line in board._lines:
+        marks = [state[i][j] for i, j in line]
+        if opponent not in marks and marks.count(figure) >= board.win_length - moves:
+            return True
+    return False
+
+
+def _source_agent(spec: str, seed: int):
+    if spec == "random":
+        return None
+    # Every batch gets its own noise, or all batches would replay the same games.
+    return create_agent(spec, seed)
+
+
+def mine(size: int, win_length: int, games: int, moves: Sequence[int], spec: str,
+         seed: int) -> Tuple[Found, int]:
+    """
+    Worker entry point: play `games` games with `spec` ("random" for uniformly random
+    moves) on both sides and verify every new position reached along the way. Returns
+    the puzzles found and the number of positions verified.
+    """
+    rng = random.Random(seed)
+    agent = _source_agent(spec, seed)
+    canon = Canonicalizer(size)
+    search = ForcedWinSearch()
+    max_moves = max(moves)
+    figures = ("X", "O")
+    seen = set()
+    found: Found = {}
+    verified = 0
+
+    for _ in range(games):
+        board = Board(size, win_length)
+        ply = 0
+        while True:
+            figure, opponent = figures[ply % 2], figures[1 - ply % 2]
+            key, ts = canon.key(relative_cells(board, figure))
+            if key not in seen:
+                seen.add(key)
+                if within_reach(board, figure, opponent, max_moves):
+                    verified += 1
+                    solved = search.solve(board, figure, opponent, max_moves)
+                    if solved is not None and solved[0] in moves:
+                        # Mirror images of one winning move on a symmetric position are
+                        # the same answer.
+                        cells = {canon.to_canonical(move - 1, ts) for move in solved[1]}
+                        if len(cells) == 1:
+                            found[key] = (cells.pop(), solved[0])
+
+            if agent is None:
+                move = rng.choice(board.get_available_moves())
+            else:
+                move = agent.choose_move(board, figure, opponent)
+            board.make_move(move, figure)
+            if board.check_winner() is not None or board.is_full():
+                break
+            ply += 1
+    return found, verified
+
+
+class MiningReport:
+    """
+    Outcome of one `mine_puzzles` run.
+    """
+
+    def __init__(self, games: int, verified: int, found: int, added: int, total: int, elapsed: float) -> None:
+        self.games = games
+        self.verified = verified
+        self.found = found
+        self.added = added
+        self.total = total
+        self.elapsed = elapsed
+
+    def format(self) -> str:
+        rate = self.verified / self.elapsed if self.elapsed else 0.0
+        return (
+            f"{self.games} games, {self.verified} positions verified in {self.elapsed:.1f}s "
+            f"({rate:.0f} positions/s): {self.found} puzzles, {self.added} new, "
+            f"file now holds {self.total}"
+        )
+
+
+def mine_puzzles(path: str, size: int = 3, win_length: Optional[int] = None,
+                 moves: Sequence[int] = (2, 3), games: int = 1000, spec: str = "random",
+                 workers: Optional[int] = None, seed: int = 0, batch: int = 50) -> MiningReport:
+    """
+    Mine puzzles with a unique forced win in one of `moves` moves from `games` games
+    played in worker processes, and merge them into the file at `path` (created if
+    missing, extended otherwise).
+    """
+    win_length = size if win_length is None else win_length
+    Board(size, win_length)  # Validate the variant before spawning workers.
+    if not moves or min(moves) < 1:
+        raise ValueError("Puzzles need at least one move to win.")
+    started = time.perf_counter()
+
+    puzzles = read_puzzles(path, size, win_length) if os.path.exists(path) else {}
+    before = len(puzzles)
+    tasks = []
+    for index, start in enumerate(range(0, games, batch)):
+        tasks.append((size, win_length, min(batch, games - start), tuple(moves), spec, seed * 1_000_003 + index))
+
+    found: Found = {}
+    verified = 0
+    if workers == 1:
+        results = [mine(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(mine, *zip(*tasks)))
+    for batch_found, batch_verified in results:
+        # Batches only deduplicate their own positions; the same puzzle from two
+        # batches is the same record.
+        found.update(batch_found)
+        verified += batch_verified
+
+    puzzles.update(found)
+    write_puzzles(path, size, win_length, puzzles)
+    return MiningReport(games, verified, len(found), len(puzzles) - before, len(puzzles),
+                        time.perf_counter() - started)
+
+
+# -----------------
+# Puzzle files
+# -----------------
+
+def _record_struct(width: int) -> struct.Struct:
+    return struct.Struct(f">{width}sHB")
+
+
+def write_puzzles(path: str, size: int, win_length: int, puzzles: Found) -> None:
+    """
+    Write `puzzles` as a puzzle file, easiest first (written next to `path` and
+    renamed over it).
+    """
+    width = key_width(size)
+    record = _record_struct(width)
+    total = HEADER_SIZE + len(puzzles) * record.size
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w+b") as f:
+        f.truncate(total)
+        with mmap.mmap(f.fileno(), total) as mm:
+            mm[:PUZZLE_HEADER.size] = PUZZLE_HEADER.pack(PUZZLE_MAGIC, VERSION, size, win_length, width, len(puzzles))
+            pos = HEADER_SIZE
+            for key, (cell, moves) in sorted(puzzles.items(), key=lambda item: (item[1][1], item[0])):
+                record.pack_into(mm, pos, key, cell, moves)
+                pos += record.size
+            mm.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_puzzles(path: str, size: int, win_length: int) -> Found:
+    """
+    Load every record of a puzzle file, to merge new puzzles into it.
+    """
+    with PuzzleSet(path) as puzzles:
+        if (puzzles.size, puzzles.win_length) != (size, win_length):
+            raise PuzzleError(
+                f"{path} holds {puzzles.size}x{puzzles.size} k={puzzles.win_length} puzzles, "
+                f"not {size}x{size} k={win_length}."
+            )
+        return {key: (cell, moves) for key, cell, moves in puzzles.records()}
+
+
+class Puzzle:
+    """
+    One puzzle: the solver to move wins in `moves` moves, starting with `solution`.
+    """
+
+    def __init__(self, size: int, win_length: int, key: bytes, cell: int, moves: int) -> None:
+        self.size = size
+        self.win_length = win_length
+        self.key = key
+        self.solution = cell + 1
+        self.moves = moves
+
+    def cells(self) -> List[int]:
+        """
+        Cells relative to the solver (empty, mine, theirs), decoded from the key.
+        """
+        value = int.from_bytes(self.key, "big")
+        cells = [EMPTY] * (self.size * self.size)
+        for index in reversed(range(len(cells))):
+            value, cells[index] = divmod(value, 3)
+        return cells
+
+    def board(self, figure: str, opponent: str) -> Board:
+        """
+        The puzzle position with the solver playing `figure`.
+        """
+        board = Board(self.size, self.win_length)
+        for index, cell in enumerate(self.cells()):
+            if cell == MINE:
+                board.make_move(index + 1, figure)
+            elif cell == THEIRS:
+                board.make_move(index + 1, opponent)
+        return board
+
+
+class PuzzleSet:
+    """
+    Read-only, memory-mapped view of a puzzle file. Puzzles are decoded when they
+    are asked for, so opening a large file costs nothing up front.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            length = os.fstat(f.fileno()).st_size
+            if length < HEADER_SIZE:
+                raise PuzzleError(f"{path} is too short to be a puzzle file.")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, size, win_length, width, count = PUZZLE_HEADER.unpack_from(self._mm, 0)
+        if magic != PUZZLE_MAGIC or version != VERSION or width != key_width(size):
+            self.close()
+            raise PuzzleError(f"{path} is not a compatible puzzle file.")
+        self.size = size
+        self.win_length = win_length
+        self.count = count
+        self._record = _record_struct(width)
+        if HEADER_SIZE + count * self._record.size > length:
+            self.close()
+            raise PuzzleError(f"{path} is truncated.")
+
+    def __enter__(self) -> "PuzzleSet":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Puzzle:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        key, cell, moves = self._record.unpack_from(self._mm, HEADER_SIZE + index * self._record.size)
+        return Puzzle(self.size, self.win_length, key, cell, moves)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def records(self):
+        for index in range(self.count):
+            yield self._record.unpack_from(self._mm, HEADER_SIZE + index * self._record.size)
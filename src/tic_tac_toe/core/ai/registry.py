@@ -0,0 +1,83 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from tic_tac_toe.core.ai.agents import BudgetedAI, RandomAI, TicTacToeAI
+
+def _book_agent(**settings: Any) -> Any:
+    # Imported on use: the book module builds its self-play agents through this registry.
+    from tic_tac_toe.core.ai.book import BookAI
+    return BookAI(**settings)
+
+
+def _oracle_agent(**settings: Any) -> Any:
+    from tic_tac_toe.core.ai.proof import OracleAI
+    return OracleAI(**settings)
+
+
+def _learned_agent(**settings: Any) -> Any:
+    from tic_tac_toe.core.ai.learning import LearnedAI
+    return LearnedAI(**settings)
+
+
+# Name -> factory for every agent that can be built from a text spec.
+AGENTS: Dict[str, Callable[..., Any]] = {
+    "random": RandomAI,
+    "minimax": TicTacToeAI,
+    "budgeted": BudgetedAI,
+    "book": _book_agent,
+    "oracle": _oracle_agent,
+    "learned": _learned_agent,
+}
+
+# Agents whose constructor takes a `seed` for their random choices.
+SEEDED_AGENTS = frozenset(("random", "minimax", "budgeted", "book", "oracle"))
+
+
+def _parse_value(raw: str) -> Any:
+    """
+    Convert a spec value to int/float when possible, keep it as a string otherwise.
+    """
+    for cast in (int, float):
+        try:
+            return cast(raw)
+        except ValueError:
+            pass
+    return raw
+
+
+def parse_agent_spec(spec: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Split an agent spec of the form `name[:key=value,...]` into its name and settings.
+    e.g. "minimax" or "minimax:depth=4,noise=0.1". Settings are passed to the agent's
+    constructor as keyword arguments.
+    """
+    name, _, options = spec.partition(":")
+    if name not in AGENTS:
+        raise ValueError(f"Unknown agent '{name}'. Available: {', '.join(sorted(AGENTS))}")
+
+    settings: Dict[str, Any] = {}
+    for option in filter(None, options.split(",")):
+        key, sep, value = option.partition("=")
+        if not sep:
+            raise ValueError(f"Malformed agent option '{option}' in '{spec}'")
+        settings[key.strip()] = _parse_value(value.strip())
+    return name, settings
+
+
+def create_agent(spec: str, seed: Optional[int] = None) -> Any:
+    """
+    Build an agent instance from its text spec. `seed` seeds the agent's random
+    choices, unless the spec sets its own seed or the agent takes none.
+    """
+    name, settings = parse_agent_spec(spec)
+    if seed is not None and name in SEEDED_AGENTS:
+        settings.setdefault("seed", seed)
+    return AGENTS[name](**settings)
+
+
+def close_agent(agent: Any) -> None:
+    """
+    Release what `agent` holds open: book and learned agents keep their file mapped.
+    """
+    close = getattr(agent, "close", None)
+    if close is not None:
+        close()
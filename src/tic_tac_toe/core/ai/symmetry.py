@@ -0,0 +1,76 @@
+from typing import List, Sequence, Tuple
+
+
+def key_width(size: int) -> int:
+    """
+    Bytes needed to store a base-3 key of `size` * `size` cells.
+    """
+    return ((3 ** (size * size)).bit_length() + 7) // 8
+
+
+def symmetries(size: int) -> List[List[int]]:
+    """
+    The 8 symmetries of a `size` x `size` board, each as `perm[i]`: where cell `i` goes.
+    """
+    last = size - 1
+    transforms = (
+        lambda i, j: (i, j),
+        lambda i, j: (j, last - i),
+        lambda i, j: (last - i, last - j),
+        lambda i, j: (last - j, i),
+        lambda i, j: (i, last - j),
+        lambda i, j: (last - i, j),
+        lambda i, j: (j, i),
+        lambda i, j: (last - j, last - i),
+    )
+    perms = []
+    for transform in transforms:
+        perm = [0] * (size * size)
+        for i in range(size):
+            for j in range(size):
+                ti, tj = transform(i, j)
+                perm[i * size + j] = ti * size + tj
+        perms.append(perm)
+    return perms
+
+
+def _inverse(perm: Sequence[int]) -> List[int]:
+    inverse = [0] * len(perm)
+    for src, dst in enumerate(perm):
+        inverse[dst] = src
+    return inverse
+
+
+class Canonicalizer:
+    """
+    Maps positions of one board size to their canonical key and orientation.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.width = key_width(size)
+        self.perms = symmetries(size)
+        self.sources = [_inverse(perm) for perm in self.perms]
+
+    def key(self, cells: Sequence[int]) -> Tuple[bytes, Tuple[int, ...]]:
+        """
+        Canonical key of relative `cells` and the indices of every symmetry producing it
+        (more than one when the position itself is symmetric).
+        """
+        best, best_ts = -1, ()
+        for t, source in enumerate(self.sources):
+            value = 0
+            for idx in source:
+                value = value * 3 + cells[idx]
+            if best < 0 or value < best:
+                best, best_ts = value, (t,)
+            elif value == best:
+                best_ts += (t,)
+        return best.to_bytes(self.width, "big"), best_ts
+
+    def to_canonical(self, cell: int, ts: Sequence[int]) -> int:
+        # Replies that are mirror images on a symmetric position share one record.
+        return min(self.perms[t][cell] for t in ts)
+
+    def from_canonical(self, cell: int, ts: Sequence[int]) -> int:
+        return self.sources[ts[0]][cell]
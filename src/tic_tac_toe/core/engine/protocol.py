@@ -0,0 +1,295 @@
+"""
+Line-based engine protocol over stdin/stdout, in the spirit of UCI.
+
+    tttp                         -> id lines, then "tttpok"
+    isready                      -> "readyok" once every earlier command is done
+    variant <size> [<k>]         -> board size and marks in a row to win; resets the position
+    agent <spec>                 -> agent used by "go", e.g. "minimax" or "budgeted:nodes=5000"
+    position startpos [moves <pos> ...]
+    position cells <cells> [moves <pos> ...]
+                                 -> cells row by row as X, O or "." (X moves first)
+    go [nodes <n>] [movetime <ms>]
+                                 -> "info ..." lines, then "bestmove <pos>" (or "bestmove (none)")
+                                    ("nodes" only for budgeted agents)
+    stop                         -> end the running search now
+    quit                         -> stop the running search and exit
+
+Commands are read and queued while a search runs, so a client can pipeline
+thousands of position/go pairs and read the replies back in order. Agents are
+built once per spec and kept for the whole session, along with their tables.
+"""
+
+import copy
+import threading
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+from tic_tac_toe.core.ai.agents import BudgetedAI, RandomAI, SearchCancelled
+from tic_tac_toe.core.ai.book import BookError
+from tic_tac_toe.core.ai.proof import ProofError
+from tic_tac_toe.core.ai.registry import AGENTS, close_agent, create_agent
+from tic_tac_toe.core.game.board import Board
+
+FIGURES = ("X", "O")
+
+
+class ProtocolError(Exception):
+    """
+    Raised for a malformed command; reported to the client as an "info string".
+    """
+
+
+class Engine:
+    """
+    Executes protocol commands and writes the replies to `out`.
+    """
+
+    NAME = "TicTacToe"
+
+    def __init__(self, out: TextIO) -> None:
+        self.out = out
+        self._lock = threading.Lock()
+        self.board = Board()
+        self.spec = "minimax"
+        self._agents: Dict[str, Any] = {}
+
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine-search")
+        self._search: Optional[Future] = None
+        self._stop: Optional[threading.Event] = None
+
+        self.commands: Dict[str, Callable[[List[str]], None]] = {
+            "tttp": self._hello,
+            "isready": self._isready,
+            "variant": self._variant,
+            "agent": self._agent,
+            "position": self._position,
+            "go": self._go,
+        }
+
+    # -----------------
+    # I/O
+    # -----------------
+
+    def send(self, line: str, flush: bool = False) -> None:
+        with self._lock:
+            self.out.write(line + "\n")
+            if flush:
+                self.out.flush()
+
+    def handle(self, line: str) -> bool:
+        """
+        Run one command line. Returns False once the client asked to quit.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+
+        if command == "stop":
+            if self._stop is not None:
+                self._stop.set()
+            return True
+        if command == "quit":
+            if self._stop is not None:
+                self._stop.set()
+            self.wait()
+            return False
+        # Anything else runs after the current search, in order.
+        self.wait()
+
+        handler = self.commands.get(command)
+        try:
+            if handler is None:
+                raise ProtocolError(f"unknown command '{command}'")
+            handler(args)
+        except (ProtocolError, ValueError) as e:
+            self.send(f"info string error: {e}", flush=True)
+        return True
+
+    def wait(self) -> None:
+        """
+        Block until the running search (if any) has replied.
+        """
+        if self._search is not None:
+            search, self._search = self._search, None
+            try:
+                search.result()
+            except Exception as e:
+                self.send(f"info string error: search failed: {e}", flush=True)
+
+    def close(self) -> None:
+        self.wait()
+        self._pool.shutdown()
+        for agent in self._agents.values():
+            close_agent(agent)
+        self._agents.clear()
+
+    # -----------------
+    # Commands
+    # -----------------
+
+    def _hello(self, args: List[str]) -> None:
+        self.send(f"id name {self.NAME}")
+        self.send(f"id agents {' '.join(sorted(AGENTS))}")
+        self.send("tttpok", flush=True)
+
+    def _isready(self, args: List[str]) -> None:
+        self.send("readyok", flush=True)
+
+    def _variant(self, args: List[str]) -> None:
+        if not 1 <= len(args) <= 2:
+            raise ProtocolError("usage: variant <size> [<k>]")
+        size = int(args[0])
+        self.board = Board(size, int(args[1]) if len(args) == 2 else None)
+
+    def _agent(self, args: List[str]) -> None:
+        if len(args) != 1:
+            raise ProtocolError("usage: agent <spec>")
+        self._get_agent(args[0])
+        self.spec = args[0]
+
+    def _position(self, args: List[str]) -> None:
+        board = Board(self.board.size, self.board.win_length)
+        rest = args
+        if rest[:1] == ["startpos"]:
+            rest = rest[1:]
+        elif rest[:1] == ["cells"] and len(rest) >= 2:
+            self._load_cells(board, rest[1])
+            rest = rest[2:]
+        else:
+            raise ProtocolError("usage: position startpos|cells <cells> [moves <pos> ...]")
+
+        if rest and rest[0] != "moves":
+            raise ProtocolError(f"unexpected '{rest[0]}' in position")
+        for token in rest[1:]:
+            figure = self._to_move(board)
+            if board.check_winner() is not None or not board.make_move(int(token), figure):
+                raise ProtocolError(f"illegal move {token}")
+        self.board = board
+
+    def _go(self, args: List[str]) -> None:
+        if len(args) % 2:
+            raise ProtocolError("usage: go [nodes <n>] [movetime <ms>]")
+        limits: Dict[str, float] = {}
+        for name, value in zip(args[::2], args[1::2]):
+            if name not in ("nodes", "movetime"):
+                raise ProtocolError(f"unknown search limit '{name}'")
+            limits[name] = float(value)
+        if "nodes" in limits and not isinstance(self._get_agent(self.spec), BudgetedAI):
+            raise ProtocolError(f"agent '{self.spec}' has no node budget")
+
+        board = self.board.clone()
+        if board.check_winner() is not None or board.is_full():
+            self.send("bestmove (none)", flush=True)
+            return
+
+        self._stop = threading.Event()
+        self._search = self._pool.submit(self._run_search, board, limits, self._stop)
+
+    # -----------------
+    # Helpers
+    # -----------------
+
+    def _get_agent(self, spec: str) -> Any:
+        agent = self._agents.get(spec)
+        if agent is None:
+            try:
+                agent = create_agent(spec)
+            except (OSError, TypeError, BookError, ProofError) as e:
+                # Missing files, unknown settings: the spec is bad, not the engine.
+                raise ProtocolError(f"cannot build agent '{spec}': {e}")
+            self._agents[spec] = agent
+        return agent
+
+    @staticmethod
+    def _load_cells(board: Board, cells: str) -> None:
+        if len(cells) != board.size * board.size:
+            raise ProtocolError(f"expected {board.size * board.size} cells, got {len(cells)}")
+        for index, cell in enumerate(cells.upper()):
+            if cell in FIGURES:
+                board.make_move(index + 1, cell)
+            elif cell != ".":
+                raise ProtocolError(f"bad cell '{cell}'")
+        x, o = cells.upper().count("X"), cells.upper().count("O")
+        if x - o not in (0, 1):
+            raise ProtocolError("X moves first: X must have as many marks as O, or one more")
+
+    @staticmethod
+    def _to_move(board: Board) -> str:
+        cells = [cell for row in board.current_state for cell in row]
+        return "X" if cells.count("X") == cells.count("O") else "O"
+
+    def _run_search(self, board: Board, limits: Dict[str, float], stop: threading.Event) -> None:
+        figure = self._to_move(board)
+        opponent = FIGURES[1 - FIGURES.index(figure)]
+        agent = self._get_agent(self.spec)
+        timer: Optional[threading.Timer] = None
+        if isinstance(agent, BudgetedAI) and limits:
+            # Search limits replace the agent's own budget for this search only; the
+            # copy keeps its other settings and shares its random stream.
+            agent = copy.copy(agent)
+            agent.max_nodes = limits.get("nodes")
+            agent.max_time = limits["movetime"] / 1000 if "movetime" in limits else None
+        elif "movetime" in limits:
+            timer = threading.Timer(limits["movetime"] / 1000, stop.set)
+            timer.daemon = True
+            timer.start()
+
+        started = time.perf_counter()
+        # Read before searching: a cancelled search may leave moves on `board`.
+        moves = board.get_available_moves()
+        best: List[int] = []
+        empty = len(moves)
+
+        def report(depth: int, score: int, move: int) -> None:
+            best.append(move)
+            elapsed = int((time.perf_counter() - started) * 1000)
+            self.send(f"info depth {depth} score {self._score(score, depth, empty)} "
+                      f"nodes {agent.nodes} time {elapsed} pv {move}", flush=True)
+
+        if isinstance(agent, BudgetedAI):
+            agent.on_iteration = report
+        try:
+            if isinstance(agent, RandomAI):
+                move = agent.choose_move(board, figure, opponent)
+            else:
+                move = agent.choose_move(board, figure, opponent, stop)
+        except SearchCancelled:
+            # Play the deepest result reported so far, or any legal move.
+            move = best[-1] if best else moves[0]
+            self.send("info string search stopped", flush=True)
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if isinstance(agent, BudgetedAI):
+                agent.on_iteration = None
+
+        elapsed = int((time.perf_counter() - started) * 1000)
+        nodes = f" nodes {agent.nodes}" if isinstance(agent, BudgetedAI) else ""
+        self.send(f"info time {elapsed}{nodes}", flush=True)
+        self.send(f"bestmove {move}", flush=True)
+
+    @staticmethod
+    def _score(score: int, depth: int, empty: int) -> str:
+        if score > BudgetedAI.HEURISTIC_BOUND:
+            return f"win {BudgetedAI.WIN_SCORE - score}"
+        if score < -BudgetedAI.HEURISTIC_BOUND:
+            return f"loss {BudgetedAI.WIN_SCORE + score}"
+        # A zero is only a proven draw once the search reached the end of the game.
+        return "draw" if score == 0 and depth >= empty else f"cp {score}"
+
+
+def run(inp: TextIO, out: TextIO) -> None:
+    """
+    Serve commands from `inp` until "quit" or end of input.
+    """
+    engine = Engine(out)
+    try:
+        for line in inp:
+            if not engine.handle(line):
+                break
+    finally:
+        engine.close()
+        out.flush()
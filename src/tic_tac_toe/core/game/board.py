@@ -3,6 +3,7 @@ import curses
 from typing import List, Dict, Tuple, Optional
 
 from tic_tac_toe.core.game.player import Player
+from tic_tac_toe.utils.tracing import traced
 
 from wcwidth import wcswidth
 
@@ -12,14 +13,28 @@ class Board:
     Keeps state, validates/applies moves, and detects winners.
     """
 
-    def __init__(self, size: int = 3) -> None:
-        if size != 3:
-            raise ValueError("This implementation currently supports only 3x3 boards.")
+    # Board sizes the game, the agents and their latency tests support.
+    SUPPORTED_SIZES: Tuple[int, ...] = (3,)
+
+    # Largest m,n,k variant the model itself accepts (analysis tools, opening books).
+    MAX_SIZE = 15
+
+    def __init__(self, size: int = 3, win_length: Optional[int] = None) -> None:
+        """
+        `size` x `size` board where `win_length` in a row wins (the full row by default).
+        """
+        win_length = size if win_length is None else win_length
+        if not 3 <= size <= self.MAX_SIZE:
+            raise ValueError(f"Board size must be between 3 and {self.MAX_SIZE}.")
+        if not 3 <= win_length <= size:
+            raise ValueError("Win length must be between 3 and the board size.")
         
         self.size = size
+        self.win_length = win_length
         self.playable: bool = True
         self.current_state: List[List[str]] = self._empty_board()
         self.valid_moves: Dict[int, Tuple[int, int]] = self._build_valid_moves()
+        self._lines = self._winning_lines()
         
         self.cursor_row = 0
         self.cursor_col = 0
@@ -70,10 +85,14 @@ class Board:
         return s + (" " * max(0, pad_len))
     
     
-    def draw(self, stdscr, top: int = 2, left: int = 2) -> None:
+    @traced
+    def draw(self, stdscr, top: int = 2, left: int = 2,
+             hints: Optional[Dict[int, Tuple[str, int]]] = None, cursor: bool = True) -> None:
         """
         Draw the board on the screen using curses.
         `top` and `left` offset the drawing position.
+        `hints` optionally maps empty positions to a (label, curses attribute) pair
+        drawn in place of the blank cell. `cursor` highlights the cursor cell.
         """
         max_fig_width = max(
             (wcswidth(cell) for row in self.current_state for cell in row if cell),
@@ -90,14 +109,15 @@ class Board:
                 x = left + j * (cell_width + 1)  # +1 for the vertical line
 
                 figure = self.current_state[i][j] if self.current_state[i][j] else " "
+                attr = curses.A_NORMAL
+                hint = hints.get(1 + i * self.size + j) if hints and figure == " " else None
+                if hint is not None:
+                    figure, attr = hint
                 cell_str = self._pad_to_width(f" {figure} ", cell_width)
 
-                if (i, j) == (self.cursor_row, self.cursor_col):
-                    stdscr.attron(curses.A_REVERSE)
-                    stdscr.addstr(y, x, cell_str)
-                    stdscr.attroff(curses.A_REVERSE)
-                else:
-                    stdscr.addstr(y, x, cell_str)
+                if cursor and (i, j) == (self.cursor_row, self.cursor_col):
+                    attr |= curses.A_REVERSE
+                stdscr.addstr(y, x, cell_str, attr)
 
                 if j < self.size - 1:
                     stdscr.addstr(y, x + cell_width, "│")
@@ -110,7 +130,7 @@ class Board:
         """
         Board cloning implementation for the Minmax AI.
         """
-        new_board = Board(size = self.size)
+        new_board = Board(size = self.size, win_length = self.win_length)
         new_board.current_state = [row[:] for row in self.current_state]
         
         return new_board
@@ -138,18 +158,22 @@ class Board:
         self.current_state[i][j] = figure
         
         return True
-        
+    
+    def undo_move(self, pos: int) -> None:
+        """
+        Clear the cell at `pos`, taking back the move played there.
+        """
+        i, j = self.valid_moves[pos]
+        self.current_state[i][j] = " "
     
     def check_winner(self) -> Optional[str]:
         """
         Checks whether there's a winner in the board or not.
         Returns the symbol of the winner if there is one, None otherwise.
         """
-        lines = self._winning_lines()
-        
-        for line in lines:
+        for line in self._lines:
             symbols = [self.current_state[i][j] for i, j in line]
-            if symbols[0] and all(cell == symbols[0] for cell in symbols):
+            if symbols[0] != " " and all(cell == symbols[0] for cell in symbols):
                 return symbols[0]
         return None 
     
@@ -187,21 +211,26 @@ class Board:
     
     def _winning_lines(self) -> List[List[Tuple[int, int]]]:
         """
-        Return all index triplets that constitute winning lanes:
+        Return all index runs of `win_length` cells that constitute winning lanes:
         rows, columns, diagonals.
         """
         lines: List[List[Tuple[int, int]]] = []
+        k, last = self.win_length, self.size - self.win_length
         
         # Rows
         for i in range(self.size):
-            lines.append([(i, j) for j in range(self.size)])
+            for j in range(last + 1):
+                lines.append([(i, j + d) for d in range(k)])
             
         # Columns
         for j in range(self.size):
-            lines.append([(i, j) for i in range(self.size)])
+            for i in range(last + 1):
+                lines.append([(i + d, j) for d in range(k)])
             
         # Diagonals
-        lines.append([(i, i) for i in range(self.size)])
-        lines.append([(i, self.size - 1 - i) for i in range(self.size)])
+        for i in range(last + 1):
+            for j in range(last + 1):
+                lines.append([(i + d, j + d) for d in range(k)])
+                lines.append([(i + d, self.size - 1 - j - d) for d in range(k)])
         
         return lines
\ No newline at end of file
@@ -0,0 +1,243 @@
+import asyncio
+import struct
+
+from collections import deque
+from typing import Deque, List, Optional, Set, Tuple
+
+from tic_tac_toe.core.ai.registry import close_agent, create_agent
+from tic_tac_toe.core.game.board import Board
+
+# ---------------------------------------------------------------------------
+# Wire format (little endian)
+#
+#   SNAPSHOT  kind, seq, board size, figure count, figures (u8 length + utf-8 each),
+#             cells (size * size, one figure id per cell, 0 = empty)
+#   DELTAS    kind, seq of the last move, count, count * (cell index, figure id)
+#
+# Figure ids index the figure table sent in the last snapshot.
+# ---------------------------------------------------------------------------
+
+KIND_SNAPSHOT = 1
+KIND_DELTAS = 2
+
+SNAPSHOT_HEADER = struct.Struct("<BIBB")
+DELTAS_HEADER = struct.Struct("<BIB")
+
+
+class Spectator:
+    """
+    One observer of a `Channel`.
+    Messages are queued up to `max_pending`; when a slow spectator's queue is full,
+    the backlog is dropped and replaced by a single fresh snapshot.
+    """
+
+    def __init__(self, max_pending: int = 64) -> None:
+        self.max_pending = max_pending
+        self.queue: Deque[bytes] = deque()
+        self.needs_resync = True
+        self.dropped = 0
+        self._ready: Optional[asyncio.Event] = None
+
+    @property
+    def is_full(self) -> bool:
+        return len(self.queue) >= self.max_pending
+
+    def push(self, message: bytes) -> None:
+        self.queue.append(message)
+        if self._ready is not None:
+            self._ready.set()
+
+    def poll(self) -> Optional[bytes]:
+        """
+        Return the next message, or None if nothing is pending.
+        """
+        return self.queue.popleft() if self.queue else None
+
+    async def get(self) -> bytes:
+        """
+        Wait for the next message.
+        """
+        if self._ready is None:
+            self._ready = asyncio.Event()
+        while not self.queue:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.queue.popleft()
+
+
+class Channel:
+    """
+    Broadcasts the moves of one game to many spectators.
+
+    Moves published during an event-loop tick are encoded once into a single DELTAS
+    message and fanned out to every spectator on the next tick.
+    """
+
+    def __init__(self, figures: Tuple[str, str], size: int = 3) -> None:
+        self.figures: List[str] = [" ", *figures]
+        self.size = size
+        self.cells = bytearray(size * size)
+        self.seq = 0
+        self.spectators: Set[Spectator] = set()
+        self.pending: List[Tuple[int, int]] = []
+        self._flush_scheduled = False
+
+    def subscribe(self, max_pending: int = 64) -> Spectator:
+        spectator = Spectator(max_pending)
+        self.spectators.add(spectator)
+        self._schedule_flush()
+        return spectator
+
+    def unsubscribe(self, spectator: Spectator) -> None:
+        self.spectators.discard(spectator)
+
+    def reset(self, board: Board, figures: Tuple[str, str]) -> None:
+        """
+        Start broadcasting another game from `board`'s position (new or resumed).
+        Every spectator gets a fresh snapshot on the next flush.
+        """
+        self.figures = [" ", *figures]
+        ids = {figure: fig_id for fig_id, figure in enumerate(self.figures)}
+        try:
+            self.cells = bytearray(ids[cell] for row in board.current_state for cell in row)
+        except KeyError as e:
+            raise ValueError(f"Figure '{e.args[0]}' is not playing in this game.") from None
+        self.size = board.size
+        self.seq += 1
+        self.pending.clear()
+        for spectator in self.spectators:
+            spectator.needs_resync = True
+        self._schedule_flush()
+
+    def publish_move(self, pos: int, figure: str) -> None:
+        """
+        Record a move (board position 1 to size * size) and queue it for the next flush.
+        """
+        try:
+            fig_id = self.figures.index(figure, 1)
+        except ValueError:
+            raise ValueError(f"Figure '{figure}' is not playing in this game.") from None
+        if not 1 <= pos <= len(self.cells):
+            raise ValueError(f"Position {pos} is off the {self.size}x{self.size} board.")
+
+        self.cells[pos - 1] = fig_id
+        self.pending.append((pos - 1, fig_id))
+        self.seq += 1
+        self._schedule_flush()
+
+    def encode_snapshot(self) -> bytes:
+        out = bytearray(SNAPSHOT_HEADER.pack(KIND_SNAPSHOT, self.seq, self.size, len(self.figures)))
+        for figure in self.figures:
+            raw = figure.encode("utf-8")
+            out += bytes([len(raw)]) + raw
+        out += self.cells
+        return bytes(out)
+
+    def encode_deltas(self) -> bytes:
+        out = bytearray(DELTAS_HEADER.pack(KIND_DELTAS, self.seq, len(self.pending)))
+        for cell, fig_id in self.pending:
+            out += bytes((cell, fig_id))
+        return bytes(out)
+
+    def _schedule_flush(self) -> None:
+        if self._flush_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop: the owner calls `flush()` explicitly.
+        self._flush_scheduled = True
+        loop.call_soon(self.flush)
+
+    def flush(self) -> None:
+        """
+        Fan out everything published since the last flush.
+        """
+        self._flush_scheduled = False
+        deltas = self.encode_deltas() if self.pending else None
+        snapshot: Optional[bytes] = None
+        self.pending.clear()
+
+        for spectator in self.spectators:
+            if spectator.needs_resync or (deltas is not None and spectator.is_full):
+                if snapshot is None:
+                    snapshot = self.encode_snapshot()
+                spectator.dropped += len(spectator.queue)
+                spectator.queue.clear()
+                spectator.needs_resync = False
+                spectator.push(snapshot)
+            elif deltas is not None:
+                spectator.push(deltas)
+
+
+class BoardMirror:
+    """
+    Client side reconstruction of a board from SNAPSHOT/DELTAS messages.
+    """
+
+    def __init__(self) -> None:
+        self.figures: List[str] = [" "]
+        # No board until the first snapshot says how big it is.
+        self.size = 0
+        self.cells = bytearray()
+        self.seq = -1
+
+    def apply(self, message: bytes) -> None:
+        kind = message[0]
+        if kind == KIND_SNAPSHOT:
+            _, self.seq, self.size, count = SNAPSHOT_HEADER.unpack_from(message, 0)
+            pos = SNAPSHOT_HEADER.size
+            self.figures = []
+            for _ in range(count):
+                length = message[pos]
+                self.figures.append(message[pos + 1:pos + 1 + length].decode("utf-8"))
+                pos += 1 + length
+            self.cells = bytearray(message[pos:pos + self.size * self.size])
+        elif kind == KIND_DELTAS:
+            _, seq, count = DELTAS_HEADER.unpack_from(message, 0)
+            if self.seq < 0 or seq - count != self.seq:
+                raise ValueError("Received deltas out of sequence; a snapshot is required.")
+            pos = DELTAS_HEADER.size
+            for _ in range(count):
+                cell, fig_id = message[pos], message[pos + 1]
+                self.cells[cell] = fig_id
+                pos += 2
+            self.seq = seq
+        else:
+            raise ValueError(f"Unknown message kind {kind}")
+
+    @property
+    def current_state(self) -> List[List[str]]:
+        size = self.size
+        return [[self.figures[self.cells[i * size + j]] for j in range(size)] for i in range(size)]
+
+
+async def run_exhibition(channel: Channel, first_spec: str, second_spec: str, delay: float = 0.5,
+                         win_length: Optional[int] = None) -> Optional[str]:
+    """
+    Play a CPU vs CPU game between two agent specs on a board of the channel's size,
+    publishing every move on `channel`.
+    Searches run on a worker thread so the event loop keeps serving spectators.
+    Returns the winning figure, or None on a draw.
+    """
+    board = Board(channel.size, win_length)
+    figures = channel.figures[1], channel.figures[2]
+    channel.reset(board, figures)
+    agents = create_agent(first_spec), create_agent(second_spec)
+
+    try:
+        side = 0
+        while True:
+            figure, opponent = figures[side], figures[1 - side]
+            move = await asyncio.to_thread(agents[side].choose_move, board.clone(), figure, opponent)
+            board.make_move(move, figure)
+            channel.publish_move(move, figure)
+
+            winner = board.check_winner()
+            if winner is not None or board.is_full():
+                return winner
+            side = 1 - side
+            await asyncio.sleep(delay)
+    finally:
+        for agent in agents:
+            close_agent(agent)
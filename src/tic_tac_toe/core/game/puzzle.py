@@ -0,0 +1,78 @@
+import threading
+
+from typing import Optional
+
+from tic_tac_toe.core.ai.puzzles import ForcedWinSearch, Puzzle, PuzzleSet
+from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.core.game.player import Player
+
+
+class PuzzleRun:
+    """
+    The human solving the puzzles of a `PuzzleSet` one at a time, against the best
+    defence. Only the puzzle on screen is decoded from the file.
+    """
+
+    def __init__(self, puzzles: PuzzleSet, human: Player) -> None:
+        self.puzzles = puzzles
+        self.human = human
+        self.cpu_figure = "O" if human.figure != "O" else "X"
+        self.solved = 0
+        self.load(0)
+
+    def load(self, index: int) -> None:
+        """
+        Set up puzzle `index` (wrapping around) from its starting position.
+        """
+        self.index = index % len(self.puzzles)
+        self.puzzle: Puzzle = self.puzzles[self.index]
+        self.board: Board = self.puzzle.board(self.human.figure, self.cpu_figure)
+        self.moves_left = self.puzzle.moves
+        # "solved" or "missed" once the attempt is over.
+        self.result: Optional[str] = None
+
+    def step(self, step: int) -> None:
+        self.load(self.index + step)
+
+    def retry(self) -> None:
+        self.load(self.index)
+
+    @property
+    def finished(self) -> bool:
+        return self.result is not None
+
+    def play(self, pos: int) -> bool:
+        """
+        Human move. Returns False if the attempt is over or the move is invalid.
+        Unless it wins or was the last move, the attempt goes on to `defend`.
+        """
+        if self.finished or not self.board.make_move(pos, self.human.figure):
+            return False
+        self.moves_left -= 1
+        if self.board.check_winner() == self.human.figure:
+            self.result = "solved"
+            self.solved += 1
+        elif not self.moves_left:
+            self.result = "missed"
+        return True
+
+    def defend(self, stop: Optional[threading.Event] = None) -> Optional[int]:
+        """
+        The defence's reply on the current position, or None if the human's last move
+        let it escape the forced win. For a worker thread: it searches a copy of the
+        board. `stop` cancels the search.
+        """
+        search = ForcedWinSearch(stop)
+        board = self.board.clone()
+        if not search.loses_within(board, self.human.figure, self.cpu_figure, self.moves_left):
+            return None
+        return search.best_defence(board, self.cpu_figure, self.human.figure, self.moves_left)
+
+    def reply(self, pos: Optional[int]) -> None:
+        """
+        Apply the result of `defend`: its move, or the end of a missed attempt.
+        """
+        if pos is None:
+            self.result = "missed"
+        else:
+            self.board.make_move(pos, self.cpu_figure)
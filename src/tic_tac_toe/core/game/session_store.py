@@ -0,0 +1,552 @@
+from array import array
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.core.game.player import Player
+
+# ---------------------------------------------------------------------------
+# Record layout (one fixed-size record per game, packed into bytearray slabs)
+#
+#   0..8    cell figure ids (0 = empty)
+#   9       cursor (row * 3 + col)
+#   10      flags (see FLAG_*)
+#   11..22  player 1: figure id, turn, move count, moves[5], name id (4 bytes, little endian)
+#   23..34  player 2: same as player 1
+#   35      agent spec id (0 = no CPU agent)
+#   36      index of the player to move
+#   37..39  padding
+#
+# Figures and agent specs come from small fixed sets, so their ids are one byte;
+# player names are free text, so theirs are wide enough for any number of players.
+# ---------------------------------------------------------------------------
+
+SIZE = 3
+CELLS = SIZE * SIZE
+MAX_MOVES = CELLS // 2 + 1
+
+NAME_WIDTH = 4
+
+CURSOR = CELLS
+FLAGS = CURSOR + 1
+P_FIGURE, P_TURN, P_COUNT, P_MOVES = range(4)
+P_NAME = P_MOVES + MAX_MOVES
+PLAYER_SIZE = P_NAME + NAME_WIDTH
+PLAYER_BASE = (FLAGS + 1, FLAGS + 1 + PLAYER_SIZE)
+AGENT = PLAYER_BASE[1] + PLAYER_SIZE
+CURRENT = AGENT + 1
+RECORD_SIZE = 40
+
+FLAG_ACTIVE = 0x01
+FLAG_PLAYABLE = 0x02
+FLAG_P1_FIRST = 0x04
+FLAG_P2_FIRST = 0x08
+FLAG_P1_CPU = 0x10
+FLAG_P2_CPU = 0x20
+
+NO_TURN = 0xFF
+
+_ACTIVE_BIT = bytes(flag & FLAG_ACTIVE for flag in range(256))
+
+SLAB_GAMES = 4096
+
+WINNING_LINES: List[Tuple[int, ...]] = [
+    tuple(i * SIZE + j for i, j in line) for line in Board()._winning_lines()
+]
+
+
+class _Interner:
+    """
+    Maps strings (names, figures) to integer ids of `width` bytes, shared by every
+    game in the store.
+    """
+
+    def __init__(self, initial: List[str], width: int = 1) -> None:
+        self.width = width
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for value in initial:
+            self.intern(value)
+
+    def intern(self, value: str) -> int:
+        idx = self.ids.get(value)
+        if idx is None:
+            if len(self.values) >= 1 << (8 * self.width):
+                raise OverflowError(f"Too many distinct strings for a {self.width} byte id.")
+            idx = len(self.values)
+            self.values.append(value)
+            self.ids[value] = idx
+        return idx
+
+
+class SessionStore:
+    """
+    Compact storage for many concurrent 3x3 games.
+
+    Every game is a fixed 40 byte record inside a bytearray slab, so an idle game costs
+    only its record. `board(sid)` and `players(sid)` return lightweight views that expose
+    the regular `Board`/`Player` API on top of the packed record.
+    """
+
+    def __init__(self) -> None:
+        self.slabs: List[memoryview] = []
+        self.free: array = array("I")
+        self.figures = _Interner([" "] + Player.figures)
+        self.names = _Interner(["Player 1", "Player 2"], NAME_WIDTH)
+        self.agents = _Interner([""])
+        self.count = 0
+
+        # Optional change listener (e.g. a write-ahead log), called with the session id
+        # and the new record image before every write to a record.
+        self.journal = None
+        # Session id -> pending record image of an open `batch`.
+        self._batches: Dict[int, bytearray] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    # -----------------
+    # Slot management
+    # -----------------
+
+    def _record(self, sid: int) -> Tuple[memoryview, int]:
+        pending = self._batches.get(sid)
+        if pending is not None:
+            # Inside a batch, reads and writes see the pending image.
+            return memoryview(pending), 0
+        slab, index = divmod(sid, SLAB_GAMES)
+        try:
+            view = self.slabs[slab]
+        except IndexError:
+            raise KeyError(sid) from None
+        offset = index * RECORD_SIZE
+        if not view[offset + FLAGS] & FLAG_ACTIVE:
+            raise KeyError(sid)
+        return view, offset
+
+    @contextmanager
+    def _edit(self, sid: int) -> Iterator[bytearray]:
+        """
+        Yield a scratch copy of record `sid` to change. On exit the new image goes to
+        the journal first and only then into the slab, so a change is never visible
+        before it is logged; if the body raises, nothing is written. Inside a `batch`
+        the change goes straight into the batch's pending image.
+        """
+        pending = self._batches.get(sid)
+        if pending is not None:
+            self._record(sid)
+            yield pending
+            return
+        view, offset = self._record(sid)
+        record = bytearray(view[offset:offset + RECORD_SIZE])
+        yield record
+        self._commit(sid, view, offset, record)
+
+    @contextmanager
+    def batch(self, sid: int) -> Iterator[None]:
+        """
+        Make every change to game `sid` inside the block one atomic change: it is
+        journalled as a single record image on exit (nothing if the block raises or
+        changed nothing), so a crash can't keep half of it.
+
+            with store.batch(sid):
+                board.make_move(pos, figure)
+                player.make_move(pos)
+                store.set_current_player(sid, 1)
+        """
+        if sid in self._batches:
+            yield
+            return
+        view, offset = self._record(sid)
+        before = bytes(view[offset:offset + RECORD_SIZE])
+        self._batches[sid] = bytearray(before)
+        try:
+            yield
+        finally:
+            record = self._batches.pop(sid)
+        if record != before:
+            self._commit(sid, view, offset, record)
+
+    def _commit(self, sid: int, view: memoryview, offset: int, record: bytearray) -> None:
+        if self.journal is not None:
+            self.journal.record_changed(self, sid, bytes(record))
+        view[offset:offset + RECORD_SIZE] = record
+
+    def _allocate(self) -> int:
+        if not self.free:
+            base = len(self.slabs) * SLAB_GAMES
+            self.slabs.append(memoryview(bytearray(SLAB_GAMES * RECORD_SIZE)))
+            # Pop order hands out the lowest ids first.
+            self.free.extend(range(base + SLAB_GAMES - 1, base - 1, -1))
+        return self.free.pop()
+
+    def create(self, player_1: Player, player_2: Player) -> int:
+        """
+        Store a new empty game between two players and return its session id.
+        """
+        # Validate before taking a slot, so a rejected game never occupies one.
+        for player in (player_1, player_2):
+            if len(player.moves) > MAX_MOVES:
+                raise OverflowError("A player cannot make more than five moves on a 3x3 board.")
+        ids = [(self.figures.intern(player.figure), self.names.intern(player.name))
+               for player in (player_1, player_2)]
+
+        record = bytearray(RECORD_SIZE)
+        flags = FLAG_ACTIVE | FLAG_PLAYABLE
+        for n, player in enumerate((player_1, player_2)):
+            base = PLAYER_BASE[n]
+            figure_id, name_id = ids[n]
+            record[base + P_FIGURE] = figure_id
+            record[base + P_NAME:base + P_NAME + NAME_WIDTH] = name_id.to_bytes(NAME_WIDTH, "little")
+            record[base + P_TURN] = NO_TURN if player.turn is None else player.turn
+            record[base + P_COUNT] = len(player.moves)
+            record[base + P_MOVES:base + P_MOVES + len(player.moves)] = bytes(player.moves)
+            if player.goes_first:
+                flags |= FLAG_P1_FIRST if n == 0 else FLAG_P2_FIRST
+            if player.is_cpu:
+                flags |= FLAG_P1_CPU if n == 0 else FLAG_P2_CPU
+        record[FLAGS] = flags
+        record[CURRENT] = 0 if player_1.goes_first or not player_2.goes_first else 1
+
+        sid = self._allocate()
+        slab, index = divmod(sid, SLAB_GAMES)
+        try:
+            self._commit(sid, self.slabs[slab], index * RECORD_SIZE, record)
+        except Exception:
+            self.free.append(sid)
+            raise
+        self.count += 1
+        return sid
+
+    def release(self, sid: int) -> None:
+        """
+        Drop a game and recycle its slot.
+        """
+        with self._edit(sid) as record:
+            record[FLAGS] = 0
+        self.free.append(sid)
+        self.count -= 1
+
+    def board(self, sid: int) -> "BoardView":
+        self._record(sid)
+        return BoardView(self, sid)
+
+    def players(self, sid: int) -> Tuple["PlayerView", "PlayerView"]:
+        self._record(sid)
+        return PlayerView(self, sid, 0), PlayerView(self, sid, 1)
+
+    def agent(self, sid: int) -> Optional[str]:
+        """
+        Spec of the CPU agent playing in this game (see `core.ai.registry`), if any.
+        """
+        view, offset = self._record(sid)
+        spec_id = view[offset + AGENT]
+        return self.agents.values[spec_id] if spec_id else None
+
+    def set_agent(self, sid: int, spec: Optional[str]) -> None:
+        with self._edit(sid) as record:
+            record[AGENT] = self.agents.intern(spec) if spec else 0
+
+    def current_player(self, sid: int) -> int:
+        """
+        Index (0 or 1) of the player whose turn it is.
+        """
+        view, offset = self._record(sid)
+        return view[offset + CURRENT]
+
+    def set_current_player(self, sid: int, index: int) -> None:
+        with self._edit(sid) as record:
+            record[CURRENT] = index
+
+    def load_records(self, data: memoryview) -> None:
+        """
+        Replace every record with the raw slab bytes in `data` (a multiple of the slab size)
+        and rebuild the free list.
+        """
+        slab_bytes = SLAB_GAMES * RECORD_SIZE
+        if len(data) % slab_bytes:
+            raise ValueError("Record data is not a whole number of slabs.")
+
+        self.slabs = [
+            memoryview(bytearray(data[start:start + slab_bytes]))
+            for start in range(0, len(data), slab_bytes)
+        ]
+        self.rebuild_free_list()
+
+    def restore_record(self, sid: int, record: bytes) -> None:
+        """
+        Overwrite the raw record of `sid`, growing the slabs if needed.
+        Call `rebuild_free_list` once all records are restored.
+        """
+        slab, index = divmod(sid, SLAB_GAMES)
+        while len(self.slabs) <= slab:
+            self.slabs.append(memoryview(bytearray(SLAB_GAMES * RECORD_SIZE)))
+        offset = index * RECORD_SIZE
+        self.slabs[slab][offset:offset + RECORD_SIZE] = record
+
+    def sids(self) -> List[int]:
+        """
+        Ids of every active game, lowest first.
+        """
+        active = []
+        for n, slab in enumerate(self.slabs):
+            flags = slab[FLAGS::RECORD_SIZE].tobytes().translate(_ACTIVE_BIT)
+            i = flags.find(1)
+            while i != -1:
+                active.append(n * SLAB_GAMES + i)
+                i = flags.find(1, i + 1)
+        return active
+
+    def rebuild_free_list(self) -> None:
+        """
+        Recompute the free slots and game count from the records' active flags.
+        """
+        inactive: List[int] = []
+        for n, slab in enumerate(self.slabs):
+            base = n * SLAB_GAMES
+            # One byte per game: 1 if active, 0 otherwise.
+            active = slab[FLAGS::RECORD_SIZE].tobytes().translate(_ACTIVE_BIT)
+            i = active.find(0)
+            while i != -1:
+                inactive.append(base + i)
+                i = active.find(0, i + 1)
+        # Pop order hands out the lowest ids first, like `_allocate`.
+        self.free = array("I", reversed(inactive))
+        self.count = len(self.slabs) * SLAB_GAMES - len(inactive)
+
+    def nbytes(self) -> int:
+        """
+        Bytes held by the record slabs and the free list.
+        """
+        return len(self.slabs) * SLAB_GAMES * RECORD_SIZE + self.free.itemsize * len(self.free)
+
+
+class BoardView(Board):
+    """
+    `Board` API backed by a record of a `SessionStore`.
+    """
+
+    size = SIZE
+    win_length = SIZE
+    valid_moves = Board().valid_moves
+
+    def __init__(self, store: SessionStore, sid: int) -> None:
+        self._store = store
+        self._sid = sid
+
+    def _cells(self) -> Tuple[memoryview, int]:
+        return self._store._record(self._sid)
+
+    # -----------------
+    # State
+    # -----------------
+
+    @property
+    def current_state(self) -> List[List[str]]:
+        view, offset = self._cells()
+        figures = self._store.figures.values
+        return [
+            [figures[view[offset + i * SIZE + j]] for j in range(SIZE)]
+            for i in range(SIZE)
+        ]
+
+    @current_state.setter
+    def current_state(self, state: List[List[str]]) -> None:
+        intern = self._store.figures.intern
+        with self._store._edit(self._sid) as record:
+            for i in range(SIZE):
+                for j in range(SIZE):
+                    record[i * SIZE + j] = intern(state[i][j])
+
+    @property
+    def playable(self) -> bool:
+        view, offset = self._cells()
+        return bool(view[offset + FLAGS] & FLAG_PLAYABLE)
+
+    @playable.setter
+    def playable(self, value: bool) -> None:
+        with self._store._edit(self._sid) as record:
+            if value:
+                record[FLAGS] |= FLAG_PLAYABLE
+            else:
+                record[FLAGS] &= ~FLAG_PLAYABLE & 0xFF
+
+    @property
+    def cursor_row(self) -> int:
+        view, offset = self._cells()
+        return view[offset + CURSOR] // SIZE
+
+    # The cursor is cosmetic and moves on every arrow key: it is written in place,
+    # without a journal entry (and its fsync). Snapshots and the next logged change
+    # of the record still carry it.
+
+    @cursor_row.setter
+    def cursor_row(self, row: int) -> None:
+        view, offset = self._cells()
+        view[offset + CURSOR] = row * SIZE + view[offset + CURSOR] % SIZE
+
+    @property
+    def cursor_col(self) -> int:
+        view, offset = self._cells()
+        return view[offset + CURSOR] % SIZE
+
+    @cursor_col.setter
+    def cursor_col(self, col: int) -> None:
+        view, offset = self._cells()
+        view[offset + CURSOR] = (view[offset + CURSOR] // SIZE) * SIZE + col
+
+    # -----------------
+    # Board API
+    # -----------------
+
+    def apply_cursor_move(self, figure: str) -> bool:
+        view, offset = self._cells()
+        cell = view[offset + CURSOR]
+        if view[offset + cell] == 0:
+            with self._store._edit(self._sid) as record:
+                record[cell] = self._store.figures.intern(figure)
+            return True
+        return False
+
+    def reset(self) -> None:
+        with self._store._edit(self._sid) as record:
+            record[:CELLS] = bytes(CELLS)
+            record[FLAGS] |= FLAG_PLAYABLE
+
+    def clone(self) -> Board:
+        new_board = Board(size=self.size)
+        new_board.current_state = self.current_state
+        return new_board
+
+    def is_valid_move(self, pos: int) -> bool:
+        if not isinstance(pos, int) or not 1 <= pos <= CELLS:
+            return False
+        view, offset = self._cells()
+        return view[offset + pos - 1] == 0
+
+    def make_move(self, pos: int, figure: str) -> bool:
+        if not self.is_valid_move(pos):
+            return False
+        with self._store._edit(self._sid) as record:
+            record[pos - 1] = self._store.figures.intern(figure)
+        return True
+
+    def undo_move(self, pos: int) -> None:
+        with self._store._edit(self._sid) as record:
+            record[pos - 1] = 0
+
+    def check_winner(self) -> Optional[str]:
+        view, offset = self._cells()
+        for a, b, c in WINNING_LINES:
+            fig = view[offset + a]
+            if fig and fig == view[offset + b] == view[offset + c]:
+                return self._store.figures.values[fig]
+        return None
+
+    def is_full(self) -> bool:
+        view, offset = self._cells()
+        return all(view[offset:offset + CELLS])
+
+    def get_available_moves(self) -> List[int]:
+        view, offset = self._cells()
+        return [pos + 1 for pos in range(CELLS) if view[offset + pos] == 0]
+
+
+class PlayerView(Player):
+    """
+    `Player` API backed by a record of a `SessionStore`.
+    """
+
+    def __init__(self, store: SessionStore, sid: int, index: int) -> None:
+        self._store = store
+        self._sid = sid
+        self._base = PLAYER_BASE[index]
+        self._first_flag = FLAG_P1_FIRST if index == 0 else FLAG_P2_FIRST
+        self._cpu_flag = FLAG_P1_CPU if index == 0 else FLAG_P2_CPU
+
+    def _field(self) -> Tuple[memoryview, int]:
+        view, offset = self._store._record(self._sid)
+        return view, offset + self._base
+
+    def _flag(self, flag: int) -> bool:
+        view, offset = self._store._record(self._sid)
+        return bool(view[offset + FLAGS] & flag)
+
+    def _set_flag(self, flag: int, value: bool) -> None:
+        with self._store._edit(self._sid) as record:
+            if value:
+                record[FLAGS] |= flag
+            else:
+                record[FLAGS] &= ~flag & 0xFF
+
+    @property
+    def name(self) -> str:
+        view, base = self._field()
+        return self._store.names.values[int.from_bytes(view[base + P_NAME:base + P_NAME + NAME_WIDTH], "little")]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        name_id = self._store.names.intern(value)
+        with self._store._edit(self._sid) as record:
+            base = self._base
+            record[base + P_NAME:base + P_NAME + NAME_WIDTH] = name_id.to_bytes(NAME_WIDTH, "little")
+
+    @property
+    def figure(self) -> str:
+        view, base = self._field()
+        return self._store.figures.values[view[base + P_FIGURE]]
+
+    @figure.setter
+    def figure(self, value: str) -> None:
+        with self._store._edit(self._sid) as record:
+            record[self._base + P_FIGURE] = self._store.figures.intern(value)
+
+    @property
+    def goes_first(self) -> bool:
+        return self._flag(self._first_flag)
+
+    @goes_first.setter
+    def goes_first(self, value: bool) -> None:
+        self._set_flag(self._first_flag, value)
+
+    @property
+    def is_cpu(self) -> bool:
+        return self._flag(self._cpu_flag)
+
+    @is_cpu.setter
+    def is_cpu(self, value: bool) -> None:
+        self._set_flag(self._cpu_flag, value)
+
+    @property
+    def turn(self) -> Optional[int]:
+        view, base = self._field()
+        turn = view[base + P_TURN]
+        return None if turn == NO_TURN else turn
+
+    @turn.setter
+    def turn(self, value: Optional[int]) -> None:
+        with self._store._edit(self._sid) as record:
+            record[self._base + P_TURN] = NO_TURN if value is None else value
+
+    @property
+    def moves(self) -> List[int]:
+        """
+        Copy of the moves made so far. Use `make_move`/`reset` to change them.
+        """
+        view, base = self._field()
+        count = view[base + P_COUNT]
+        return list(view[base + P_MOVES:base + P_MOVES + count])
+
+    def reset(self) -> None:
+        with self._store._edit(self._sid) as record:
+            record[self._base + P_TURN] = NO_TURN
+            record[self._base + P_COUNT] = 0
+
+    def make_move(self, choice) -> None:
+        with self._store._edit(self._sid) as record:
+            base = self._base
+            count = record[base + P_COUNT]
+            if count >= MAX_MOVES:
+                raise OverflowError("A player cannot make more than five moves on a 3x3 board.")
+            record[base + P_MOVES + count] = choice
+            record[base + P_COUNT] = count + 1
@@ -0,0 +1,276 @@
+import time
+
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Deque, List, MutableSequence, Optional, Sequence, Tuple
+
+from tic_tac_toe.core.ai.agents import RandomAI
+from tic_tac_toe.core.ai.difficulty import DIFFICULTIES, Difficulty
+from tic_tac_toe.core.ai.registry import close_agent, create_agent
+from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.core.game.player import Player
+
+
+# Stop flags shared with the worker running this search, one per board (see `init_worker`).
+_stop_flags: Optional[MutableSequence[int]] = None
+
+
+class BoardStop:
+    """
+    `threading.Event`-like view of one board's stop flag, for agents searching in a
+    worker process: the flag lives in shared memory, so reading it costs no IPC.
+    """
+
+    def __init__(self, flags: MutableSequence[int], index: int) -> None:
+        self.flags = flags
+        self.index = index
+
+    def is_set(self) -> bool:
+        return bool(self.flags[self.index])
+
+
+def init_worker(stop_flags: MutableSequence[int]) -> None:
+    """
+    Executor initializer: hand every worker the stop flags a `Simul` sets on shutdown.
+    """
+    global _stop_flags
+    _stop_flags = stop_flags
+
+
+def search_move(spec: str, board: Board, figure: str, opponent: str, index: Optional[int] = None) -> int:
+    """
+    Worker entry point: build the agent for `spec` and return its move on `board`.
+    The search is cancelled once board `index`'s stop flag is set.
+    """
+    agent = create_agent(spec)
+    try:
+        if isinstance(agent, RandomAI):
+            return agent.choose_move(board, figure, opponent)
+        stop = BoardStop(_stop_flags, index) if _stop_flags is not None and index is not None else None
+        return agent.choose_move(board, figure, opponent, stop)
+    finally:
+        close_agent(agent)
+
+
+class LatencyStats:
+    """
+    Last, mean and worst value of a latency, in milliseconds.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total += ms
+        self.last = ms
+        self.max = max(self.max, ms)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def format(self) -> str:
+        if not self.count:
+            return "-"
+        return f"{self.last:.0f}ms avg {self.mean:.0f} max {self.max:.0f}"
+
+
+class FrameCounter:
+    """
+    Frames per second over the last `window` seconds.
+    """
+
+    def __init__(self, window: float = 1.0) -> None:
+        self.window = window
+        self.frames: Deque[float] = deque()
+
+    def tick(self, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self.frames.append(now)
+        while self.frames and self.frames[0] < now - self.window:
+            self.frames.popleft()
+
+    @property
+    def fps(self) -> float:
+        return len(self.frames) / self.window
+
+
+class SimulBoard:
+    """
+    One board of a simultaneous exhibition and the CPU playing on it.
+    """
+
+    def __init__(self, difficulty: Difficulty) -> None:
+        self.difficulty = difficulty
+        self.board = Board()
+        self.cpu = Player(
+            name = difficulty.cpu_name,
+            figure = difficulty.cpu_figure,
+            goes_first = False,
+            is_cpu = True
+        )
+        self.pending: Optional[Future] = None
+        self.submitted_at = 0.0
+        self.retries = 0
+        self.latency = LatencyStats()
+        # "win", "draw" or "loss" for the human once the game is over, "error" if the
+        # CPU could not reply (`error` says why).
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+
+    @property
+    def thinking(self) -> bool:
+        return self.pending is not None
+
+    @property
+    def finished(self) -> bool:
+        return self.result is not None
+
+    @property
+    def awaiting_human(self) -> bool:
+        return not self.thinking and not self.finished
+
+
+class Simul:
+    """
+    One human against several CPU opponents, each on its own board.
+
+    The human always moves first. Each CPU reply is searched on `executor` as soon as
+    the human has moved on that board, so several searches run at once; `poll()`
+    applies the replies that are ready without ever waiting for one.
+
+    A search that fails is retried `RETRIES` times; after that (or if the executor is
+    broken) only its board ends, with result "error", and the other games go on.
+
+    With `stop_flags` (one per board, shared with the workers through `init_worker`),
+    `cancel()` also stops the searches that are already running.
+    """
+
+    RETRIES = 1
+
+    def __init__(self, human: Player, levels: Sequence[str], executor: Executor,
+                 stop_flags: Optional[MutableSequence[int]] = None) -> None:
+        self.human = human
+        self.executor = executor
+        self.boards = [SimulBoard(DIFFICULTIES[level]) for level in levels]
+        self.focus = 0
+        self.stop_flags = stop_flags
+
+    @property
+    def focused(self) -> SimulBoard:
+        return self.boards[self.focus]
+
+    @property
+    def finished(self) -> bool:
+        return all(simul_board.finished for simul_board in self.boards)
+
+    def score(self) -> Tuple[int, int, int]:
+        """
+        Human wins, draws and losses so far.
+        """
+        results = [simul_board.result for simul_board in self.boards]
+        return results.count("win"), results.count("draw"), results.count("loss")
+
+    def switch_focus(self, step: int, awaiting_only: bool = False) -> None:
+        """
+        Move the focus `step` boards forward (or back), skipping boards that aren't
+        waiting for the human when `awaiting_only` is set and some board is.
+        """
+        count = len(self.boards)
+        for offset in range(1, count + 1):
+            index = (self.focus + step * offset) % count
+            if not awaiting_only or self.boards[index].awaiting_human:
+                self.focus = index
+                return
+
+    def play(self, index: int, pos: int) -> bool:
+        """
+        Human move on board `index`. Returns False if it isn't the human's turn
+        there or the move is invalid.
+        """
+        simul_board = self.boards[index]
+        if not simul_board.awaiting_human:
+            return False
+        if not simul_board.board.make_move(pos, self.human.figure):
+            return False
+        if not self._settle(simul_board):
+            simul_board.submitted_at = time.perf_counter()
+            self._submit(simul_board)
+        return True
+
+    def poll(self) -> List[int]:
+        """
+        Apply every CPU reply that is ready. Returns the indices of the updated boards.
+        """
+        updated = []
+        for index, simul_board in enumerate(self.boards):
+            future = simul_board.pending
+            if future is None or not future.done():
+                continue
+            simul_board.pending = None
+            try:
+                move = future.result()
+            except Exception as exc:
+                if simul_board.retries < self.RETRIES:
+                    simul_board.retries += 1
+                    self._submit(simul_board)
+                else:
+                    self._fail(simul_board, exc)
+                updated.append(index)
+                continue
+            
+            simul_board.retries = 0
+            simul_board.latency.add((time.perf_counter() - simul_board.submitted_at) * 1000)
+            simul_board.board.make_move(move, simul_board.cpu.figure)
+            self._settle(simul_board)
+            updated.append(index)
+        return updated
+
+    def cancel(self) -> None:
+        """
+        Drop the searches that haven't started yet and stop the running ones.
+        """
+        for index, simul_board in enumerate(self.boards):
+            if simul_board.pending is not None:
+                if self.stop_flags is not None:
+                    self.stop_flags[index] = 1
+                simul_board.pending.cancel()
+                simul_board.pending = None
+
+    def _submit(self, simul_board: SimulBoard) -> None:
+        """
+        Start the CPU search for `simul_board`.
+        """
+        index: Optional[int] = None
+        if self.stop_flags is not None:
+            index = self.boards.index(simul_board)
+            self.stop_flags[index] = 0
+        try:
+            simul_board.pending = self.executor.submit(
+                search_move, simul_board.difficulty.spec, simul_board.board.clone(),
+                simul_board.cpu.figure, self.human.figure, index,
+            )
+        except RuntimeError as exc:
+            # Broken or shut down executor.
+            self._fail(simul_board, exc)
+
+    def _fail(self, simul_board: SimulBoard, exc: BaseException) -> None:
+        simul_board.result = "error"
+        simul_board.error = str(exc) or type(exc).__name__
+
+    def _settle(self, simul_board: SimulBoard) -> bool:
+        """
+        Record the result of `simul_board` if its game is over. Returns True if it is.
+        """
+        winner = simul_board.board.check_winner()
+        if winner == self.human.figure:
+            simul_board.result = "win"
+        elif winner == simul_board.cpu.figure:
+            simul_board.result = "loss"
+        elif simul_board.board.is_full():
+            simul_board.result = "draw"
+        return simul_board.finished
@@ -0,0 +1,341 @@
+import mmap
+import os
+import struct
+import time
+import zlib
+
+from typing import BinaryIO, List, Optional, Tuple
+
+from tic_tac_toe.core.game.session_store import RECORD_SIZE, SLAB_GAMES, SessionStore
+
+# ---------------------------------------------------------------------------
+# Snapshot file (memory-mapped):
+#
+#   header   magic, version, record size, generation, slot count,
+#            string table offset/length, crc32 of everything after the header
+#   records  slot count * RECORD_SIZE bytes, the store slabs verbatim
+#   strings  figures, names and agent specs tables
+#
+# Write-ahead log (append only), starting with its own header:
+#
+#   entry    kind, payload length, crc32(kind + payload), payload
+#
+# RECORD entries carry a full record image, so replaying is idempotent.
+# STRING entries carry strings interned after the snapshot was taken.
+# ---------------------------------------------------------------------------
+
+SNAPSHOT_MAGIC = b"TTTS"
+JOURNAL_MAGIC = b"TTTW"
+VERSION = 2
+
+SNAPSHOT_HEADER = struct.Struct("<4sHHQIIII")
+HEADER_SIZE = 64
+JOURNAL_HEADER = struct.Struct("<4sHHQ")
+ENTRY_HEADER = struct.Struct("<BHI")
+RECORD_ENTRY = struct.Struct(f"<I{RECORD_SIZE}s")
+STRING_ENTRY = struct.Struct("<BI")
+
+ENTRY_RECORD = 1
+ENTRY_STRING = 2
+
+SNAPSHOT_FILE = "sessions.snap"
+JOURNAL_FILE = "sessions.wal"
+
+TABLES = ("figures", "names", "agents")
+
+
+class SnapshotError(Exception):
+    """
+    Raised when a snapshot file is missing, truncated or corrupted.
+    """
+
+
+def _tables(store: SessionStore):
+    return [getattr(store, name) for name in TABLES]
+
+
+def _encode_strings(store: SessionStore) -> bytes:
+    out = bytearray()
+    for table in _tables(store):
+        out += struct.pack("<I", len(table.values))
+        for value in table.values:
+            raw = value.encode("utf-8")
+            out += struct.pack("<H", len(raw)) + raw
+    return bytes(out)
+
+
+def _decode_strings(store: SessionStore, data: memoryview) -> None:
+    pos = 0
+    for table in _tables(store):
+        (count,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        for idx in range(count):
+            (length,) = struct.unpack_from("<H", data, pos)
+            pos += 2
+            value = bytes(data[pos:pos + length]).decode("utf-8")
+            pos += length
+            if table.intern(value) != idx:
+                raise SnapshotError("String table does not match its stored ids.")
+
+
+def write_snapshot(store: SessionStore, path: str, generation: int) -> None:
+    """
+    Write every record of `store` to `path` through a memory map.
+    The file is written next to `path` and renamed over it, so a crash never leaves a
+    half-written snapshot behind.
+    """
+    strings = _encode_strings(store)
+    slots = len(store.slabs) * SLAB_GAMES
+    records_size = slots * RECORD_SIZE
+    total = HEADER_SIZE + records_size + len(strings)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w+b") as f:
+        f.truncate(total)
+        with mmap.mmap(f.fileno(), total) as mm:
+            pos = HEADER_SIZE
+            crc = 0
+            for slab in store.slabs:
+                mm[pos:pos + len(slab)] = slab
+                crc = zlib.crc32(slab, crc)
+                pos += len(slab)
+            mm[pos:pos + len(strings)] = strings
+            crc = zlib.crc32(strings, crc)
+
+            header = SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC, VERSION, RECORD_SIZE, generation,
+                slots, HEADER_SIZE + records_size, len(strings), crc,
+            )
+            mm[:len(header)] = header
+            mm.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def _fsync_directory(directory: str) -> None:
+    """
+    Make a rename in `directory` durable (where directories can be opened).
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_snapshot(path: str) -> Tuple[SessionStore, int]:
+    """
+    Load a snapshot written by `write_snapshot`.
+    Returns the restored store and the snapshot generation.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER_SIZE:
+            raise SnapshotError(f"{path} is too short to be a snapshot.")
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, record_size, generation, slots, strings_at, strings_len, crc = (
+                SNAPSHOT_HEADER.unpack_from(mm, 0)
+            )
+            if magic != SNAPSHOT_MAGIC or version != VERSION or record_size != RECORD_SIZE:
+                raise SnapshotError(f"{path} is not a compatible snapshot.")
+            if strings_at + strings_len > size:
+                raise SnapshotError(f"{path} is truncated.")
+
+            with memoryview(mm) as data:
+                body = data[HEADER_SIZE:strings_at + strings_len]
+                try:
+                    if zlib.crc32(body) != crc:
+                        raise SnapshotError(f"{path} failed its checksum.")
+
+                    store = SessionStore()
+                    for table in _tables(store):
+                        table.values.clear()
+                        table.ids.clear()
+                    _decode_strings(store, data[strings_at:strings_at + strings_len])
+                    store.load_records(data[HEADER_SIZE:HEADER_SIZE + slots * RECORD_SIZE])
+                finally:
+                    body.release()
+
+    return store, generation
+
+
+class Journal:
+    """
+    Append-only write-ahead log of record changes made since the last snapshot.
+    Attach it with `store.journal = journal`.
+    """
+
+    def __init__(self, path: str, generation: int, sync: bool = True) -> None:
+        self.path = path
+        self.generation = generation
+        self.sync = sync
+        self.entries = 0
+        self.file: BinaryIO = open(path, "wb")
+        self.file.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, VERSION, 0, generation))
+        self.file.flush()
+        if sync:
+            os.fsync(self.file.fileno())
+            _fsync_directory(os.path.dirname(os.path.abspath(path)))
+        # Number of strings per table already persisted (by the snapshot or this log).
+        self._logged_strings: List[int] = [0] * len(TABLES)
+
+    def _append(self, kind: int, payload: bytes) -> None:
+        crc = zlib.crc32(payload, zlib.crc32(bytes([kind])))
+        self.file.write(ENTRY_HEADER.pack(kind, len(payload), crc) + payload)
+        self.entries += 1
+
+    def record_changed(self, store: SessionStore, sid: int, record: bytes) -> None:
+        """
+        Log `record`, the new full image of record `sid`, preceded by any strings it may
+        reference that are not in the snapshot or the log yet. The store calls this
+        before applying the change, and with `sync` the entry is on disk by then.
+        """
+        for n, table in enumerate(_tables(store)):
+            while self._logged_strings[n] < len(table.values):
+                idx = self._logged_strings[n]
+                payload = STRING_ENTRY.pack(n, idx) + table.values[idx].encode("utf-8")
+                self._append(ENTRY_STRING, payload)
+                self._logged_strings[n] += 1
+
+        self._append(ENTRY_RECORD, RECORD_ENTRY.pack(sid, record))
+        self.file.flush()
+        if self.sync:
+            os.fsync(self.file.fileno())
+
+    def start_from(self, store: SessionStore) -> None:
+        """
+        Treat every string currently known to `store` as already persisted.
+        """
+        self._logged_strings = [len(table.values) for table in _tables(store)]
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def replay_journal(store: SessionStore, path: str, generation: int) -> int:
+    """
+    Apply the log at `path` to `store` if it belongs to `generation`.
+    Stops at the first torn or corrupted entry. Returns the number of entries applied.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return 0
+
+    if len(data) < JOURNAL_HEADER.size:
+        return 0
+    magic, version, _, log_generation = JOURNAL_HEADER.unpack_from(data, 0)
+    if magic != JOURNAL_MAGIC or version != VERSION or log_generation != generation:
+        # A log from an older generation is already contained in the snapshot.
+        return 0
+
+    tables = _tables(store)
+    applied = 0
+    pos = JOURNAL_HEADER.size
+    while pos + ENTRY_HEADER.size <= len(data):
+        kind, length, crc = ENTRY_HEADER.unpack_from(data, pos)
+        start = pos + ENTRY_HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload, zlib.crc32(bytes([kind]))) != crc:
+            break
+        pos = start + length
+
+        if kind == ENTRY_STRING:
+            table, idx = STRING_ENTRY.unpack_from(payload, 0)
+            value = payload[STRING_ENTRY.size:].decode("utf-8")
+            if tables[table].intern(value) != idx:
+                raise SnapshotError("Journal string ids do not match the snapshot.")
+        elif kind == ENTRY_RECORD:
+            sid, record = RECORD_ENTRY.unpack(payload)
+            store.restore_record(sid, record)
+        applied += 1
+
+    if applied:
+        store.rebuild_free_list()
+    return applied
+
+
+class SnapshotManager:
+    """
+    Keeps a `SessionStore` recoverable: periodic/on-demand snapshots plus a
+    write-ahead log of everything that changed in between.
+
+        manager = SnapshotManager.open("state/")   # restores whatever was there
+        store = manager.store
+        ...
+        manager.maybe_snapshot()                    # call regularly from the main loop
+    """
+
+    def __init__(self, store: SessionStore, directory: str, generation: int = 0,
+                 interval: float = 30.0, sync: bool = True) -> None:
+        self.store = store
+        self.directory = directory
+        self.generation = generation
+        self.interval = interval
+        self.sync = sync
+        self.last_snapshot = time.monotonic()
+        self.journal: Optional[Journal] = None
+
+        os.makedirs(directory, exist_ok=True)
+        # The first snapshot must land before the old log is truncated by the new one.
+        self.snapshot()
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, SNAPSHOT_FILE)
+
+    @property
+    def journal_path(self) -> str:
+        return os.path.join(self.directory, JOURNAL_FILE)
+
+    @classmethod
+    def open(cls, directory: str, interval: float = 30.0, sync: bool = True) -> "SnapshotManager":
+        """
+        Restore the latest snapshot and log from `directory` (or start empty)
+        and return a manager that keeps persisting the store.
+        """
+        snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            store, generation = read_snapshot(snapshot_path)
+            replay_journal(store, os.path.join(directory, JOURNAL_FILE), generation)
+        else:
+            store, generation = SessionStore(), 0
+
+        return cls(store, directory, generation, interval, sync)
+
+    def snapshot(self) -> None:
+        """
+        Write a snapshot now and start a new, empty log.
+        """
+        self.generation += 1
+        write_snapshot(self.store, self.snapshot_path, self.generation)
+        if self.journal is not None:
+            self.journal.close()
+
+        self.journal = Journal(self.journal_path, self.generation, self.sync)
+        self.journal.start_from(self.store)
+        self.store.journal = self.journal
+        self.last_snapshot = time.monotonic()
+
+    def maybe_snapshot(self) -> bool:
+        """
+        Snapshot if `interval` seconds have passed since the last one.
+        """
+        if time.monotonic() - self.last_snapshot < self.interval:
+            return False
+        self.snapshot()
+        return True
+
+    def close(self) -> None:
+        self.store.journal = None
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
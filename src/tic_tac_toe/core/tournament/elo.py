@@ -0,0 +1,128 @@
+import math
+
+from typing import Dict, List, Tuple
+
+# Conversion factor between the logistic scale and Elo points.
+ELO_SCALE = 400 / math.log(10)
+
+
+def elo_from_score(score: float) -> float:
+    """
+    Elo difference implied by an expected score in [0, 1].
+    Scores of exactly 0 or 1 are clamped to keep the result finite.
+    """
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def score_z(scores: List[float]) -> float:
+    """
+    z-statistic of the mean score against the null hypothesis of equal strength (0.5).
+    Returns 0.0 when there are no games, and +/-inf when every game has the same
+    decisive outcome.
+    """
+    n = len(scores)
+    if n == 0:
+        return 0.0
+
+    mean = sum(scores) / n
+    variance = sum((s - mean) ** 2 for s in scores) / n
+    if variance == 0:
+        if mean == 0.5:
+            return 0.0
+        return math.inf if mean > 0.5 else -math.inf
+    return (mean - 0.5) / math.sqrt(variance / n)
+
+
+def sprt_llr(scores: List[float], elo0: float, elo1: float) -> float:
+    """
+    Log-likelihood ratio of "the Elo difference is `elo1`" against "it is `elo0`",
+    using the normal approximation of the mean score (the generalized SPRT of
+    fishtest). Returns +/-inf when every game has the same outcome.
+    """
+    n = len(scores)
+    if n == 0:
+        return 0.0
+
+    s0 = 1 / (1 + 10 ** (-elo0 / 400))
+    s1 = 1 / (1 + 10 ** (-elo1 / 400))
+    mean = sum(scores) / n
+    variance = sum((s - mean) ** 2 for s in scores) / n
+    numerator = n * (s1 - s0) * (2 * mean - s0 - s1)
+    if variance == 0:
+        return math.copysign(math.inf, numerator) if numerator else 0.0
+    return numerator / (2 * variance)
+
+
+def sprt_bounds(alpha: float, beta: float) -> Tuple[float, float]:
+    """
+    Wald's (lower, upper) LLR bounds: accept H0 below the first, H1 above the second.
+    """
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+def compute_ratings(
+    games: Dict[Tuple[str, str], List[float]],
+    prior_draws: float = 2.0,
+    z: float = 1.96,
+    iterations: int = 1000,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Bradley-Terry maximum-likelihood ratings, in the spirit of BayesElo.
+
+    `games` maps (agent_a, agent_b) to the list of scores agent_a obtained against agent_b.
+    Draws count as half a win, and `prior_draws` virtual draws are added to every pairing
+    so that perfect scores still produce finite ratings.
+
+    Returns {agent: (elo, half_width)} where `half_width` is the `z` confidence interval.
+    Ratings are centred so that their mean is 0.
+    """
+    agents: List[str] = sorted({name for pair in games for name in pair})
+    if not agents:
+        return {}
+
+    # Pairwise game counts and win totals (including the prior).
+    counts: Dict[Tuple[str, str], float] = {}
+    wins: Dict[str, float] = {name: 0.0 for name in agents}
+    for (a, b), scores in games.items():
+        if a == b:
+            continue
+        n = len(scores) + prior_draws
+        counts[(a, b)] = counts.get((a, b), 0.0) + n
+        counts[(b, a)] = counts.get((b, a), 0.0) + n
+        wins[a] += sum(scores) + prior_draws / 2
+        wins[b] += len(scores) - sum(scores) + prior_draws / 2
+
+    # Minorization-maximization updates (Hunter, 2004).
+    gamma: Dict[str, float] = {name: 1.0 for name in agents}
+    for _ in range(iterations):
+        updated: Dict[str, float] = {}
+        for i in agents:
+            denom = sum(
+                counts[(i, j)] / (gamma[i] + gamma[j])
+                for j in agents if (i, j) in counts
+            )
+            updated[i] = wins[i] / denom if denom else gamma[i]
+
+        # Normalise by the geometric mean to keep the ratings centred.
+        log_mean = sum(math.log(g) for g in updated.values()) / len(agents)
+        updated = {name: g / math.exp(log_mean) for name, g in updated.items()}
+
+        delta = max(abs(math.log(updated[n]) - math.log(gamma[n])) for n in agents)
+        gamma = updated
+        if delta < 1e-9:
+            break
+
+    ratings: Dict[str, Tuple[float, float]] = {}
+    for i in agents:
+        # Diagonal of the Fisher information on the logistic scale.
+        information = 0.0
+        for j in agents:
+            if (i, j) not in counts:
+                continue
+            p = gamma[i] / (gamma[i] + gamma[j])
+            information += counts[(i, j)] * p * (1 - p)
+        half_width = z * ELO_SCALE / math.sqrt(information) if information else math.inf
+        ratings[i] = (ELO_SCALE * math.log(gamma[i]), half_width)
+
+    return ratings
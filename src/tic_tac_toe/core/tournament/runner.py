@@ -0,0 +1,242 @@
+import random
+
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Tuple
+
+from tic_tac_toe.core.ai.registry import close_agent, create_agent
+from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.core.tournament.elo import compute_ratings, elo_from_score, sprt_bounds, sprt_llr
+
+
+class TournamentFormat(Enum):
+    ROUND_ROBIN = "round-robin"
+    GAUNTLET = "gauntlet"
+
+
+def play_game(first_spec: str, second_spec: str, opening_seed: int, opening_plies: int) -> float:
+    """
+    Play one headless game between two agent specs, each built for this game.
+    The first `opening_plies` moves are random, drawn from `opening_seed`, and the
+    agents' own random choices are seeded from it too, so a game can be replayed.
+    Returns the score of the agent that moved first (1, 0.5 or 0).
+    """
+    agents = tuple(create_agent(spec, hash((opening_seed, side)) & 0xFFFFFFFF)
+                   for side, spec in enumerate((first_spec, second_spec)))
+    try:
+        return _play(agents, opening_seed, opening_plies)
+    finally:
+        for agent in agents:
+            close_agent(agent)
+
+
+def _play(agents: Tuple[Any, Any], opening_seed: int, opening_plies: int) -> float:
+    board = Board()
+    figures = ("X", "O")
+    rng = random.Random(opening_seed)
+
+    ply = 0
+    while True:
+        side = ply % 2
+        figure, opponent = figures[side], figures[1 - side]
+
+        if ply < opening_plies:
+            move = rng.choice(board.get_available_moves())
+        else:
+            move = agents[side].choose_move(board, figure, opponent)
+
+        if not board.make_move(move, figure):
+            # An illegal move forfeits the game.
+            return 0.0 if side == 0 else 1.0
+
+        winner = board.check_winner()
+        if winner == figures[0]:
+            return 1.0
+        if winner == figures[1]:
+            return 0.0
+        if board.is_full():
+            return 0.5
+        ply += 1
+
+
+def _play_task(task: Tuple[str, str, bool, int, int]) -> float:
+    """
+    Worker entry point. Returns the score from the point of view of the pairing's first agent.
+    """
+    spec_a, spec_b, a_first, seed, plies = task
+    if a_first:
+        return play_game(spec_a, spec_b, seed, plies)
+    return 1.0 - play_game(spec_b, spec_a, seed, plies)
+
+
+class Pairing:
+    """
+    Running results of one agent-vs-agent pairing.
+    """
+
+    def __init__(self, agent_a: str, agent_b: str) -> None:
+        self.agent_a = agent_a
+        self.agent_b = agent_b
+        self.scores: List[float] = []  # From agent_a's point of view.
+        self.finished = False
+        # "stronger", "weaker" or "equal" (agent_a against agent_b) once a test decided.
+        self.verdict: Optional[str] = None
+
+    @property
+    def games(self) -> int:
+        return len(self.scores)
+
+    @property
+    def score(self) -> float:
+        return sum(self.scores) / len(self.scores) if self.scores else 0.5
+
+    @property
+    def elo_difference(self) -> float:
+        return elo_from_score(self.score)
+
+    def sprt(self, elo1: float, alpha: float, beta: float) -> Optional[str]:
+        """
+        Two one-sided SPRTs of Elo 0 against +`elo1` and -`elo1`. Returns "stronger"
+        or "weaker" once one of them accepts its alternative, "equal" once both accept
+        Elo 0, and None while the evidence is still in between. Wald's bounds hold
+        however often this is checked, unlike a fixed-z test re-run after every batch.
+        """
+        lower, upper = sprt_bounds(alpha, beta)
+        above = sprt_llr(self.scores, 0.0, elo1)
+        below = sprt_llr(self.scores, 0.0, -elo1)
+        if above >= upper:
+            return "stronger"
+        if below >= upper:
+            return "weaker"
+        if above <= lower and below <= lower:
+            return "equal"
+        return None
+
+
+class Tournament:
+    """
+    Runs round-robin or gauntlet matches between agent specs across a process pool.
+
+    Games are played in colour-swapped pairs that share the same random opening.
+    A pairing stops early once a sequential probability ratio test decides (after at
+    least `min_games`): one agent is `elo1` Elo stronger, or neither is, with error
+    rates `alpha` and `beta`. Otherwise it stops at `max_games`. `z` sets the width of
+    the rating intervals.
+
+    Agent specs are built once here to fail fast on bad settings; games build their
+    own, seeded, instances in the workers.
+    """
+
+    def __init__(
+        self,
+        agents: List[str],
+        fmt: TournamentFormat = TournamentFormat.ROUND_ROBIN,
+        max_games: int = 200,
+        min_games: int = 20,
+        batch: int = 10,
+        opening_plies: int = 2,
+        seed: int = 0,
+        workers: Optional[int] = None,
+        z: float = 1.96,
+        elo1: float = 50.0,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+    ) -> None:
+        if len(agents) < 2:
+            raise ValueError("A tournament needs at least two agents.")
+        if len(set(agents)) != len(agents):
+            raise ValueError("Agent specs must be unique.")
+        for spec in agents:
+            # Fail fast on typos and bad settings, not inside a pool worker mid-run.
+            close_agent(create_agent(spec))
+
+        self.agents = agents
+        self.format = fmt
+        self.max_games = max_games
+        self.min_games = min_games
+        self.batch = max(1, batch)
+        self.opening_plies = opening_plies
+        self.seed = seed
+        self.workers = workers
+        self.z = z
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+
+        self.pairings: List[Pairing] = [Pairing(a, b) for a, b in self._build_pairs()]
+
+    def _build_pairs(self) -> List[Tuple[str, str]]:
+        if self.format == TournamentFormat.GAUNTLET:
+            return [(self.agents[0], other) for other in self.agents[1:]]
+        return list(combinations(self.agents, 2))
+
+    def _schedule_round(self) -> List[Tuple[Pairing, Tuple[str, str, bool, int, int]]]:
+        """
+        Build the next batch of games for every unfinished pairing.
+        """
+        tasks = []
+        for index, pairing in enumerate(self.pairings):
+            if pairing.finished:
+                continue
+            remaining = self.max_games - pairing.games
+            for game in range(pairing.games, pairing.games + min(self.batch * 2, remaining)):
+                # Both games of a colour-swapped pair share the same opening seed.
+                opening_seed = hash((self.seed, index, game // 2)) & 0xFFFFFFFF
+                a_first = game % 2 == 0
+                task = (pairing.agent_a, pairing.agent_b, a_first, opening_seed, self.opening_plies)
+                tasks.append((pairing, task))
+        return tasks
+
+    def _update_status(self, pairing: Pairing) -> None:
+        if pairing.games >= self.min_games:
+            pairing.verdict = pairing.sprt(self.elo1, self.alpha, self.beta)
+        if pairing.verdict is not None or pairing.games >= self.max_games:
+            pairing.finished = True
+
+    def run(self) -> Dict[str, Tuple[float, float]]:
+        """
+        Play until every pairing is finished and return {agent: (elo, half_width)}.
+        """
+        executor = ProcessPoolExecutor(self.workers) if self.workers != 1 else None
+        try:
+            while not all(p.finished for p in self.pairings):
+                scheduled = self._schedule_round()
+                tasks = [task for _, task in scheduled]
+                if executor is not None:
+                    results = list(executor.map(_play_task, tasks, chunksize=4))
+                else:
+                    results = [_play_task(task) for task in tasks]
+
+                for (pairing, _), score in zip(scheduled, results):
+                    pairing.scores.append(score)
+                for pairing in self.pairings:
+                    self._update_status(pairing)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return self.ratings()
+
+    def ratings(self) -> Dict[str, Tuple[float, float]]:
+        games = {(p.agent_a, p.agent_b): p.scores for p in self.pairings}
+        return compute_ratings(games, z=self.z)
+
+    def report(self) -> str:
+        """
+        Human readable summary of ratings and pairings.
+        """
+        ratings = self.ratings()
+        lines = [f"{'#':>2}  {'Agent':<30} {'Elo':>7} {'+/-':>7}"]
+        ranked = sorted(ratings.items(), key=lambda item: item[1][0], reverse=True)
+        for rank, (name, (elo, half_width)) in enumerate(ranked, start=1):
+            lines.append(f"{rank:>2}  {name:<30} {elo:>7.1f} {half_width:>7.1f}")
+
+        lines.append("")
+        for p in self.pairings:
+            verdict = f", {p.verdict}" if p.verdict else ", undecided"
+            lines.append(
+                f"{p.agent_a} vs {p.agent_b}: {p.games} games, "
+                f"score {p.score:.1%}, Elo diff {p.elo_difference:+.1f}{verdict}"
+            )
+        return "\n".join(lines)
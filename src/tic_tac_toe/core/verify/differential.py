@@ -0,0 +1,244 @@
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tic_tac_toe.core.ai.agents import BudgetedAI, TicTacToeAI
+from tic_tac_toe.core.ai.analysis import PositionAnalyzer
+from tic_tac_toe.core.ai.positions import FIGURES, MoveSequence, enumerate_positions, replay, sample_positions
+from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.core.game.player import Player
+from tic_tac_toe.core.game import session_store
+from tic_tac_toe.core.game.session_store import SessionStore
+
+# Board size and win length.
+Variant = Tuple[int, int]
+
+# Variants checked by default: 3x3 exhaustively, the larger ones by sampling.
+VARIANTS: Tuple[Variant, ...] = ((3, 3), (4, 3), (5, 4))
+
+
+# -----------------
+# Engines under test
+# -----------------
+
+def _session_store_board(size: int, win_length: int) -> Optional[Board]:
+    if (size, win_length) != (session_store.SIZE, session_store.SIZE):
+        return None
+    store = SessionStore()
+    return store.board(store.create(Player("X", "X"), Player("O", "O", goes_first=False)))
+
+
+# Board engines: factory for an empty board implementing the `Board` API, or None
+# when the engine does not support that variant.
+BOARD_ENGINES: Dict[str, Callable[[int, int], Optional[Board]]] = {
+    "session-store": _session_store_board,
+}
+
+
+def _analyzer_move(board: Board, figure: str, opponent: str) -> int:
+    scores = PositionAnalyzer().evaluate_moves(board, figure)
+    return max(scores, key=scores.get)
+
+
+# Search engines: (board, figure, opponent) -> chosen move.
+SEARCH_ENGINES: Dict[str, Callable[[Board, str, str], int]] = {
+    "budgeted": lambda board, figure, opponent: BudgetedAI().choose_move(board, figure, opponent),
+    "analyzer": _analyzer_move,
+}
+
+
+# -----------------
+# Checks
+# -----------------
+
+def reference_values(board: Board, figure: str, opponent: str) -> Dict[int, float]:
+    """
+    TicTacToeAI's minimax value of every available move for `figure`.
+    """
+    ai = TicTacToeAI()
+    values: Dict[int, float] = {}
+    for move in board.get_available_moves():
+        board.make_move(move, figure)
+        values[move] = ai._minimax(board, False, figure, opponent)
+        board.current_state = ai._undo_move(board, move)
+    return values
+
+
+def check_position(variant: Variant, moves: MoveSequence, search_limit: int,
+                   timings: Optional[Dict[str, float]] = None) -> List[str]:
+    """
+    Compare every engine against the reference in one position.
+    Returns a description of each mismatch. Best-move values are only checked when at
+    most `search_limit` cells are empty (the reference search is exhaustive).
+    """
+    timings = timings if timings is not None else {}
+    mismatches: List[str] = []
+
+    def timed(name: str, fn):
+        start = time.perf_counter()
+        result = fn()
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+        return result
+
+    def board_facts(board: Board):
+        return board.get_available_moves(), board.check_winner(), board.is_full()
+
+    reference = replay(moves, Board(*variant))
+    expected = timed("board:reference", lambda: board_facts(reference))
+    for name, factory in BOARD_ENGINES.items():
+        engine_board = factory(*variant)
+        if engine_board is None:
+            continue
+        replay(moves, engine_board)
+        actual = timed(f"board:{name}", lambda: board_facts(engine_board))
+        for label, exp, act in zip(("legal moves", "winner", "is_full"), expected, actual):
+            if exp != act:
+                mismatches.append(f"{name}: {label} {act!r} != reference {exp!r}")
+
+    legal, winner, full = expected
+    if winner is not None or full or len(legal) > search_limit:
+        return mismatches
+
+    figure, opponent = FIGURES[len(moves) % 2], FIGURES[1 - len(moves) % 2]
+    values = timed("search:reference", lambda: reference_values(reference.clone(), figure, opponent))
+    best = max(values.values())
+    for name, choose in SEARCH_ENGINES.items():
+        move = timed(f"search:{name}", lambda: choose(reference.clone(), figure, opponent))
+        if move not in values:
+            mismatches.append(f"{name}: illegal best move {move}")
+        elif values[move] != best:
+            mismatches.append(f"{name}: best move {move} has value {values[move]}, reference best is {best}")
+    return mismatches
+
+
+def shrink(variant: Variant, moves: MoveSequence, search_limit: int, min_plies: int = 0) -> MoveSequence:
+    """
+    Shortest prefix of `moves` (at least `min_plies` long) that still shows a mismatch.
+    """
+    for length in range(min(min_plies, len(moves)), len(moves) + 1):
+        if check_position(variant, moves[:length], search_limit):
+            return moves[:length]
+    return moves
+
+
+# A failing position: its variant and move sequence.
+Failure = Tuple[Variant, MoveSequence]
+
+# variant, positions, search limit, min plies, whether failures must be shrunk
+Task = Tuple[Variant, List[MoveSequence], int, int, bool]
+
+
+def _check_chunk(task: Task) -> Tuple[List[Tuple[Failure, List[str]]], Dict[str, float]]:
+    variant, chunk, search_limit, min_plies, shrink_failures = task
+    timings: Dict[str, float] = {}
+    failures = []
+    for moves in chunk:
+        problems = check_position(variant, moves, search_limit, timings)
+        if problems:
+            failures.append(((variant, moves), problems))
+            if shrink_failures:
+                shrunk = shrink(variant, moves, search_limit, min_plies)
+                if shrunk != moves:
+                    failures.append(((variant, shrunk), check_position(variant, shrunk, search_limit)))
+    return failures, timings
+
+
+class EquivalenceReport:
+    """
+    Outcome of a differential run: positions checked, mismatches with their minimal
+    move sequence, and the time each engine took next to the reference.
+
+    A failing position whose own prefix already fails is not a separate mismatch: it is
+    listed in `extensions` under the shortest failing prefix.
+    """
+
+    def __init__(self) -> None:
+        self.positions = 0
+        self.failures: Dict[Failure, List[str]] = {}
+        self.extensions: Dict[Failure, List[MoveSequence]] = {}
+        self.timings: Dict[str, float] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    def speedups(self) -> Dict[str, float]:
+        """
+        Reference time / engine time for every engine (higher is faster).
+        """
+        speedups: Dict[str, float] = {}
+        for key, seconds in self.timings.items():
+            kind, name = key.split(":")
+            reference = self.timings.get(f"{kind}:reference")
+            if name != "reference" and reference and seconds:
+                speedups[key] = reference / seconds
+        return speedups
+
+    def format(self) -> str:
+        lines = [f"Checked {self.positions} positions: {len(self.failures)} mismatching"]
+        for failure, problems in sorted(self.failures.items(), key=lambda item: (item[0][0], len(item[0][1]), item[0][1])):
+            (size, win_length), moves = failure
+            lines.append(f"  {size}x{size} k={win_length} moves {' '.join(map(str, moves)) or '(empty board)'}:")
+            lines.extend(f"    {problem}" for problem in problems)
+            extensions = self.extensions.get(failure)
+            if extensions:
+                lines.append(f"    (and {len(extensions)} longer failing sequences through this position)")
+        for key, speedup in sorted(self.speedups().items()):
+            lines.append(f"  {key:<24} {speedup:8.2f}x vs reference")
+        return "\n".join(lines)
+
+
+def run_equivalence(samples: int = 1_000_000, search_limit: int = 9, min_plies: int = 0,
+                    workers: Optional[int] = None, seed: int = 0, chunk_size: int = 64,
+                    variants: Tuple[Variant, ...] = VARIANTS) -> EquivalenceReport:
+    """
+    Check every optimized engine against the reference `Board`/`TicTacToeAI` on each
+    (size, win length) in `variants`. 3x3 positions are enumerated exhaustively; larger
+    boards are sampled (`samples` positions each). Positions with fewer than `min_plies`
+    moves are skipped.
+
+    Mismatches are reported by their shortest failing move sequence: enumerated positions
+    already come with minimal sequences, sampled ones are shrunk to their shortest
+    failing prefix.
+    """
+    report = EquivalenceReport()
+    tasks = []
+    for variant in variants:
+        exhaustive = variant[0] == 3
+        if exhaustive:
+            positions = enumerate_positions(*variant)
+        else:
+            positions = sample_positions(variant[0], samples, seed, variant[1])
+        positions = [moves for moves in positions if len(moves) >= min_plies]
+        report.positions += len(positions)
+        tasks.extend(
+            (variant, positions[start:start + chunk_size], search_limit, min_plies, not exhaustive)
+            for start in range(0, len(positions), chunk_size)
+        )
+
+    if workers == 1:
+        results = map(_check_chunk, tasks)
+        _collect(report, results)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            _collect(report, executor.map(_check_chunk, tasks))
+
+    # Group failures under their shortest failing prefix.
+    failing = set(report.failures)
+    for variant, moves in failing:
+        prefix = next(((variant, moves[:n]) for n in range(len(moves)) if (variant, moves[:n]) in failing), None)
+        if prefix is not None:
+            del report.failures[(variant, moves)]
+            report.extensions.setdefault(prefix, []).append(moves)
+    for extensions in report.extensions.values():
+        extensions.sort(key=lambda moves: (len(moves), moves))
+    return report
+
+
+def _collect(report: EquivalenceReport, results) -> None:
+    for failures, timings in results:
+        for failure, problems in failures:
+            report.failures.setdefault(failure, problems)
+        for key, seconds in timings.items():
+            report.timings[key] = report.timings.get(key, 0.0) + seconds
@@ -44,6 +44,9 @@ class Menu:
         curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_CYAN)  # Highlight
         curses.init_pair(2, curses.COLOR_YELLOW, curses.COLOR_BLACK)  # Title
         curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)  # Message
+        curses.init_pair(4, curses.COLOR_BLACK, curses.COLOR_GREEN)  # Hint: winning move
+        curses.init_pair(5, curses.COLOR_BLACK, curses.COLOR_YELLOW)  # Hint: drawing move
+        curses.init_pair(6, curses.COLOR_WHITE, curses.COLOR_RED)  # Hint: losing move
     
     def draw_art(self, stdscr: curses.window, ART: str):
         """
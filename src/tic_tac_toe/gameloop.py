@@ -1,17 +1,30 @@
 import curses
+import multiprocessing
+import os
 import time
+import threading
 import curses.panel as panel
 
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from enum import Enum, auto
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 
-from tic_tac_toe.core.ai.agents import RandomAI, TicTacToeAI
+from tic_tac_toe.core.ai.agents import BudgetExhausted, BudgetedAI, RandomAI, SearchCancelled, TicTacToeAI
+from tic_tac_toe.core.ai.analysis import PositionAnalyzer
+from tic_tac_toe.core.ai.puzzles import PuzzleError, PuzzleSet
+from tic_tac_toe.core.ai.difficulty import DIFFICULTIES
+from tic_tac_toe.core.ai.registry import create_agent
 from tic_tac_toe.core.visuals.menu import Menu, MenuOptions
 from tic_tac_toe.core.game.player import Player
 from tic_tac_toe.core.game.board import Board
+from tic_tac_toe.core.game.broadcast import Channel
+from tic_tac_toe.core.game.puzzle import PuzzleRun
+from tic_tac_toe.core.game.simul import FrameCounter, Simul, init_worker
+from tic_tac_toe.core.game.snapshot import SnapshotError, SnapshotManager
 from tic_tac_toe.core.visuals.art import GAME_OVER, YOU_WIN, DRAW
 
 from tic_tac_toe.utils.keymap import Keymap
+from tic_tac_toe.utils.tracing import traced, wrap_window
         
 class GameState(Enum):
     IN_MENU = auto()
@@ -21,17 +34,64 @@ class GameState(Enum):
 class GameMode(Enum):
     PVP = auto()
     CPU_EASY = auto()
+    CPU_MEDIUM = auto()
+    CPU_TRICKY = auto()
     CPU_HARD = auto()
+    SIMUL = auto()
+    PUZZLES = auto()
         
 class GameLoop:
     """
     Main game controller that manages the menu, game state and transtitions.
     """
     
-    MODE_OPTIONS = ["Player vs Player", "Player vs CPU (Easy)", "Player vs CPU (Hard)"]
+    MODES = [GameMode.PVP, GameMode.CPU_EASY, GameMode.CPU_MEDIUM, GameMode.CPU_TRICKY, GameMode.CPU_HARD,
+             GameMode.SIMUL, GameMode.PUZZLES]
+    MODE_OPTIONS = [
+        "Player vs Player",
+        "Player vs CPU (Easy)",
+        "Player vs CPU (Medium)",
+        "Player vs CPU (Tricky)",
+        "Player vs CPU (Hard)",
+        "Simultaneous exhibition (all CPUs at once)",
+        "Puzzles (win in N moves)",
+    ]
+    # CPU modes -> key in DIFFICULTIES
+    MODE_DIFFICULTY = {
+        GameMode.CPU_EASY: "easy",
+        GameMode.CPU_MEDIUM: "medium",
+        GameMode.CPU_TRICKY: "tricky",
+        GameMode.CPU_HARD: "hard",
+    }
     
-    def __init__(self) -> None:
+    # In-game input is polled with this timeout so the screen stays responsive
+    # (spinner, resize, q/r) while the CPU is thinking.
+    INPUT_TIMEOUT_MS = 100
+    SPINNER = "|/-\\"
+    
+    # Simultaneous exhibition: one board per level, redrawn every frame.
+    SIMUL_LEVELS = ("easy", "medium", "tricky", "hard")
+    FRAME_MS = 33
+    PANEL_WIDTH = 26
+    PANEL_HEIGHT = 10
+    
+    # Moves the hint heatmap may score per position: a cold 3x3 solve takes ~13,000,
+    # larger boards give up within a fraction of a second.
+    HINT_NODES = 20_000
+    
+    # Puzzle file read by the puzzle mode (see `ttt puzzles`).
+    PUZZLE_PATH = "puzzles.bin"
+    
+    # Unfinished games are kept here (snapshot + write-ahead log) and resumed on restart.
+    STATE_DIR = os.path.join(os.path.expanduser("~"), ".tic_tac_toe")
+    
+    def __init__(self, puzzle_path: Optional[str] = None, state_dir: Optional[str] = None,
+                 channel: Optional[Channel] = None) -> None:
         self.menu = Menu()
+        self.puzzle_path = puzzle_path or self.PUZZLE_PATH
+        self.state_dir = state_dir or self.STATE_DIR
+        self.sessions: Optional[SnapshotManager] = None
+        self.sid: Optional[int] = None
         self.board = Board()
         self.current_game_state: Optional[GameState] = None
         self.keymap = Keymap()
@@ -45,6 +105,23 @@ class GameLoop:
         
         self.player_2: Optional[Player] = None
         self.ai_agent = None
+        
+        # Spectators of the game being played, if any: every move is published here.
+        self.channel = channel
+        
+        # CPU searches run here so the curses loop never blocks on them.
+        self.search_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cpu-search")
+        self.search_stop: Optional[threading.Event] = None
+        
+        # Hint heatmap, toggled in-game. The analyzer keeps its table between moves and
+        # runs on the search worker; the last position asked for and its pending or
+        # finished analysis are kept, so redraws don't search again.
+        self.show_hints = False
+        self.analyzer = PositionAnalyzer(max_nodes=self.HINT_NODES)
+        self._hint_key: Optional[Tuple[Tuple[str, ...], str]] = None
+        self._hint_future: Optional[Future] = None
+        # Shown under the board while hints are on but the heatmap isn't there.
+        self.hint_status: Optional[str] = None
 
     # -----------------
     # run / main
@@ -54,10 +131,16 @@ class GameLoop:
         """
         Start the main gameloop.
         """
-        curses.wrapper(self.main)
+        self.open_sessions()
+        try:
+            curses.wrapper(self.main)
+        finally:
+            self.close_sessions()
         
+    @traced
     def main(self, stdscr: curses.window) -> None:
         """Handle menu navigation and transitions"""
+        stdscr = wrap_window(stdscr)
         while True:
             try:
                 self._prep_screen(stdscr)
@@ -89,6 +172,7 @@ class GameLoop:
     # Mode selection
     # -----------------
     
+    @traced
     def select_mode(self, stdscr: curses.window) -> Optional[GameMode]:
         """
         Small in-loop menu to choose game mode.
@@ -119,80 +203,73 @@ class GameLoop:
                 self.current_game_state = GameState.IN_MENU
                 break
             elif self.keymap.is_confirm(key):
-                if index == 0:
-                    return GameMode.PVP
-                elif index == 1:
-                    return GameMode.CPU_EASY
-                else:
-                    return GameMode.CPU_HARD
+                return self.MODES[index]
         
+    @traced
     def run_game(self, stdscr: curses.window, mode: GameMode) -> None:
         """Run the actual Tic-Tac-Toe game"""
+        stdscr = wrap_window(stdscr)
         
         try:
-            self.board.reset()
             self._prep_screen(stdscr)
+            stdscr.timeout(self.INPUT_TIMEOUT_MS)
+            
+            if mode == GameMode.SIMUL:
+                self.run_simul(stdscr)
+                return
+            if mode == GameMode.PUZZLES:
+                self.run_puzzles(stdscr)
+                return
             
             # Set-up opponents
             
             if mode == GameMode.PVP:
-                self.player_2 = Player(
+                player_2 = Player(
                     name = "Player 2",
                     figure = "O",
                     goes_first = False,
                     is_cpu = False
                 )
+                spec = None
             else:
-                cpu_name = "Randy" if mode == GameMode.CPU_EASY else "TicTaco"
-                self.player_2 = Player(
-                    name = cpu_name,
-                    figure = "🦦" if cpu_name == "Randy" else "🌮",
+                difficulty = DIFFICULTIES[self.MODE_DIFFICULTY[mode]]
+                player_2 = Player(
+                    name = difficulty.cpu_name,
+                    figure = difficulty.cpu_figure,
                     goes_first = False,
                     is_cpu = True
                 )
-                self.ai_agent = RandomAI() if mode == GameMode.CPU_EASY else TicTacToeAI()
+                spec = difficulty.spec
+                self.ai_agent = create_agent(spec)
                 
-            current = self.player_1
-            opponent = self.player_2
+            players, turn = self._start_game(spec, player_2)
+            first, self.player_2 = players
+            current, opponent = players[turn], players[1 - turn]
             
             while self.current_game_state == GameState.IN_GAME:
-                stdscr.clear()
-                self.board.draw(stdscr)
-                stdscr.addstr(10, 2, f"Turn: {current.name} ({current.figure})")
-                stdscr.addstr(12, 2, "Choose a position [1-9]: (q to quit, r to return to menu)")
-                stdscr.refresh()
+                self._draw_turn(stdscr, current)
                 
                 if current.is_cpu:
-                    move = self._cpu_move(current, opponent)
+                    move = self._wait_for_cpu_move(stdscr, current, opponent)
                 else:
-                    move = 0
-                    while move == 0:
-                        self.board.draw(stdscr)
-                        stdscr.refresh()
-                        
-                        key = stdscr.getch()
-                        move = self._read_move_from_keyboard(key)
-                        if move == -1:
-                            self.show_game_over(stdscr, "You quit the game.")
-                            self.exit_game(stdscr)
-                            break
-                        if move == -2:
-                            self.current_game_state = GameState.IN_MENU
-                            break
-                        
-                        if move == 0:
-                            move = self._handle_cursor_input(key)
+                    move = self._wait_for_human_move(stdscr, current)
+                    
+                if move == -1:
+                    self.show_game_over(stdscr, "You quit the game.")
+                    self.exit_game(stdscr)
+                    break
+                if move == -2:
+                    self.current_game_state = GameState.IN_MENU
+                    break
                 
-                if not self.board.make_move(move, current.figure):
+                if not self._play_move(move, current, players.index(opponent)):
                     stdscr.addstr(14, 2, "Invalid move! Press any key to continue...")
                     stdscr.refresh()
-                    stdscr.getch()
+                    self._wait_for_key(stdscr)
                     continue
                 
-                current.make_move(move)
-                
                 winner = self.board.check_winner()
-                if winner == self.player_1.figure:
+                if winner == first.figure:
                     self.end_game(stdscr, YOU_WIN)
                     break
                 elif winner == self.player_2.figure:
@@ -205,15 +282,452 @@ class GameLoop:
 
                 # Switch player
                 current, opponent = opponent, current
+                if self.sessions is not None:
+                    self.sessions.maybe_snapshot()
         finally:
+            self._cancel_cpu_search()
             self.current_game_state = GameState.IN_MENU
+            stdscr.timeout(-1)
             stdscr.clear()
             curses.flushinp()
 
+    @traced
+    def run_simul(self, stdscr: curses.window) -> None:
+        """
+        Play every CPU level at once, one board each. CPU searches run in worker
+        processes and land on their board as soon as they are done.
+        """
+        workers = min(len(self.SIMUL_LEVELS), os.cpu_count() or 1)
+        # One stop flag per board in shared memory, so leaving stops running searches
+        # the way `search_stop` does for a single game.
+        stop_flags = multiprocessing.RawArray("b", len(self.SIMUL_LEVELS))
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(stop_flags,))
+        simul = Simul(self.player_1, self.SIMUL_LEVELS, executor, stop_flags)
+        frames = FrameCounter()
+        stdscr.timeout(self.FRAME_MS)
+        
+        try:
+            while not simul.finished:
+                simul.poll()
+                self._draw_simul(stdscr, simul, frames)
+                frames.tick()
+                
+                key = stdscr.getch()
+                if key == -1 or key == curses.KEY_RESIZE:
+                    continue
+                if self.keymap.is_next_board(key):
+                    simul.switch_focus(1)
+                    continue
+                if self.keymap.is_prev_board(key):
+                    simul.switch_focus(-1)
+                    continue
+                
+                move = self._read_move_from_keyboard(key)
+                if move == -1:
+                    self.show_game_over(stdscr, "You quit the game.")
+                    self.exit_game(stdscr)
+                    return
+                if move == -2:
+                    self.current_game_state = GameState.IN_MENU
+                    return
+                if move == 0:
+                    move = self._handle_cursor_input(key, simul.focused.board)
+                if move and simul.play(simul.focus, move):
+                    # Walk on to the next board waiting for a move, like a simul master.
+                    simul.switch_focus(1, awaiting_only=True)
+            
+            self._draw_simul(stdscr, simul, frames)
+            wins, draws, losses = simul.score()
+            message = f"Exhibition over: {wins} won, {draws} drawn, {losses} lost"
+            failed = sum(simul_board.result == "error" for simul_board in simul.boards)
+            if failed:
+                message += f", {failed} abandoned (CPU failed)"
+            self.current_game_state = GameState.GAME_OVER
+            self.show_game_over(stdscr, message + ".")
+        finally:
+            simul.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    @traced
+    def run_puzzles(self, stdscr: curses.window) -> None:
+        """
+        Solve mined puzzles one after another. Each puzzle is read from the file when
+        it comes up, and the defence is searched on the worker thread.
+        """
+        try:
+            puzzles = PuzzleSet(self.puzzle_path)
+        except (OSError, PuzzleError) as e:
+            self.show_game_over(stdscr, f"No puzzles to play: {e}\nMine some with `ttt puzzles {self.puzzle_path}`.")
+            return
+        
+        with puzzles:
+            if not len(puzzles):
+                self.show_game_over(stdscr, f"{self.puzzle_path} holds no puzzles.")
+                return
+            run = PuzzleRun(puzzles, self.player_1)
+            
+            while self.current_game_state == GameState.IN_GAME:
+                self._draw_puzzle(stdscr, run)
+                
+                key = stdscr.getch()
+                if key == -1 or key == curses.KEY_RESIZE:
+                    continue
+                if self.keymap.is_next_board(key):
+                    run.step(1)
+                    continue
+                if self.keymap.is_prev_board(key):
+                    run.step(-1)
+                    continue
+                
+                move = self._read_move_from_keyboard(key)
+                if move == -1:
+                    self.show_game_over(stdscr, "You quit the game.")
+                    self.exit_game(stdscr)
+                    return
+                if move == -2:
+                    self.current_game_state = GameState.IN_MENU
+                    return
+                if run.finished:
+                    # Any other key moves on after a solve, or retries after a miss.
+                    if run.result == "solved":
+                        run.step(1)
+                    else:
+                        run.retry()
+                    continue
+                if move == 0:
+                    move = self._handle_cursor_input(key, run.board)
+                if not move or not run.play(move) or run.finished:
+                    continue
+                
+                reply = self._wait_for_defence(stdscr, run)
+                if reply == -1:
+                    self.show_game_over(stdscr, "You quit the game.")
+                    self.exit_game(stdscr)
+                    return
+                if reply == -2:
+                    self.current_game_state = GameState.IN_MENU
+                    return
+                run.reply(reply)
+    
+    # -----------------
+    # Saved games
+    # -----------------
+    
+    def open_sessions(self) -> None:
+        """
+        Restore the saved games from the state directory. Games are played without
+        persistence if it can't be used.
+        """
+        try:
+            self.sessions = SnapshotManager.open(self.state_dir)
+        except (OSError, SnapshotError):
+            self.sessions = None
+    
+    def close_sessions(self) -> None:
+        if self.sessions is not None:
+            self.sessions.snapshot()
+            self.sessions.close()
+            self.sessions = None
+    
+    def _start_game(self, spec: Optional[str], player_2: Player) -> Tuple[Tuple[Player, Player], int]:
+        """
+        Resume the saved game of this mode (same CPU spec, or none for PvP) or start a
+        new one. Returns both players and the index of the one to move.
+        
+        With a state directory the game lives in the session store: every change is
+        logged before it is applied, so a restart picks up where the game stopped.
+        """
+        player_1 = Player(
+            name = self.player_1.name,
+            figure = self.player_1.figure,
+            goes_first = True,
+            is_cpu = False
+        )
+        if self.sessions is None:
+            self.sid = None
+            self.board = Board()
+            players, turn = (player_1, player_2), 0
+        else:
+            store = self.sessions.store
+            self.sid = next((sid for sid in store.sids() if store.agent(sid) == spec), None)
+            if self.sid is None:
+                self.sid = store.create(player_1, player_2)
+                store.set_agent(self.sid, spec)
+            self.board = store.board(self.sid)
+            players, turn = store.players(self.sid), store.current_player(self.sid)
+        
+        if self.channel is not None:
+            self.channel.reset(self.board, (players[0].figure, players[1].figure))
+            self.channel.flush()
+        return players, turn
+    
+    def _play_move(self, move: int, current: Player, next_index: int) -> bool:
+        """
+        Put `current`'s move on the board and hand the turn to player `next_index`.
+        Returns False if the move is invalid. In the session store this is a single
+        change, so a crash keeps either all of the move or none of it.
+        Spectators on `channel` see the move once it is on the board.
+        """
+        if self.sid is None:
+            if not self.board.make_move(move, current.figure):
+                return False
+            current.make_move(move)
+        else:
+            store = self.sessions.store
+            with store.batch(self.sid):
+                if not self.board.make_move(move, current.figure):
+                    return False
+                current.make_move(move)
+                store.set_current_player(self.sid, next_index)
+        
+        if self.channel is not None:
+            # The curses loop has no event loop to flush on, so fan out right away.
+            self.channel.publish_move(move, current.figure)
+            self.channel.flush()
+        return True
+    
+    def _finish_game(self) -> None:
+        """
+        Drop a finished game from the store, keeping its final position on screen.
+        """
+        if self.sid is not None:
+            self.board = self.board.clone()
+            self.sessions.store.release(self.sid)
+            self.sid = None
+    
     # -----------------
     # Helpers
     # -----------------
     
+    def _draw_puzzle(self, stdscr: curses.window, run: PuzzleRun) -> None:
+        """
+        Redraw the puzzle screen: the position, the goal and how the attempt is going.
+        """
+        stdscr.erase()
+        h, w = stdscr.getmaxyx()
+        puzzle = run.puzzle
+        stdscr.addstr(1, 2, f"Puzzle {run.index + 1}/{len(run.puzzles)}: {run.human.figure} to play "
+                            f"and win in {puzzle.moves}   (solved {run.solved})", curses.A_BOLD)
+        run.board.draw(stdscr, 3, 2, cursor=not run.finished)
+        
+        y = 3 + 2 * run.board.size
+        if run.result == "solved":
+            stdscr.addstr(y, 2, "Solved! Press any key for the next puzzle.", curses.color_pair(4) | curses.A_BOLD)
+        elif run.result == "missed":
+            stdscr.addstr(y, 2, f"The win got away. The key move was {puzzle.solution}; press any key to retry.",
+                          curses.color_pair(6) | curses.A_BOLD)
+        else:
+            stdscr.addstr(y, 2, f"Moves left: {run.moves_left}")
+        stdscr.addstr(h - 1, 2, "Tab/[ ] next/previous puzzle, 1-9 or arrows+Enter to move, q quit, r menu"[:max(0, w - 3)])
+        stdscr.refresh()
+    
+    def _wait_for_defence(self, stdscr: curses.window, run: PuzzleRun) -> Optional[int]:
+        """
+        Search the defence's reply on the worker thread while keeping the UI alive.
+        Returns the reply (None if the forced win got away), or -1/-2 if the player
+        quit or went back meanwhile.
+        """
+        self.search_stop = threading.Event()
+        future: Future = self.search_pool.submit(run.defend, self.search_stop)
+        
+        frame = 0
+        while not future.done():
+            stdscr.addstr(4 + 2 * run.board.size, 2, f"Defending... {self.SPINNER[frame % len(self.SPINNER)]}")
+            stdscr.refresh()
+            frame += 1
+            
+            key = stdscr.getch()
+            if key == curses.KEY_RESIZE:
+                self._draw_puzzle(stdscr, run)
+            elif self.keymap.is_quit(key):
+                self._cancel_cpu_search()
+                return -1
+            elif self.keymap.is_back(key):
+                self._cancel_cpu_search()
+                return -2
+        
+        self.search_stop = None
+        try:
+            return future.result()
+        except SearchCancelled:
+            return -2
+    
+    def _draw_simul(self, stdscr: curses.window, simul: Simul, frames: FrameCounter) -> None:
+        """
+        Tile one panel per board, with its status and CPU latency, plus the frame rate.
+        """
+        stdscr.erase()
+        h, w = stdscr.getmaxyx()
+        wins, draws, losses = simul.score()
+        stdscr.addstr(1, 2, f"Simultaneous exhibition   +{wins} ={draws} -{losses}   {frames.fps:.0f} fps",
+                      curses.A_BOLD)
+        
+        columns = max(1, (w - 2) // self.PANEL_WIDTH)
+        for index, simul_board in enumerate(simul.boards):
+            top = 3 + (index // columns) * self.PANEL_HEIGHT
+            left = 2 + (index % columns) * self.PANEL_WIDTH
+            if top + self.PANEL_HEIGHT > h - 1:
+                break  # Terminal too small for the remaining panels.
+            
+            focused = index == simul.focus
+            title = f"{index + 1}. {simul_board.cpu.name} {simul_board.cpu.figure} ({simul_board.difficulty.label})"
+            stdscr.addstr(top, left, title, curses.A_BOLD | (curses.A_REVERSE if focused else 0))
+            simul_board.board.draw(stdscr, top + 2, left, cursor=focused)
+            
+            if simul_board.finished:
+                status = {"win": "You won", "draw": "Draw", "loss": "You lost", "error": "CPU failed"}[simul_board.result]
+            elif simul_board.thinking:
+                status = f"Thinking... {self.SPINNER[int(time.monotonic() * 10) % len(self.SPINNER)]}"
+            else:
+                status = "Your move"
+            stdscr.addstr(top + 7, left, status)
+            if simul_board.error is not None:
+                stdscr.addstr(top + 8, left, simul_board.error[:self.PANEL_WIDTH - 2])
+            else:
+                stdscr.addstr(top + 8, left, f"AI {simul_board.latency.format()}")
+        
+        stdscr.addstr(h - 1, 2, "Tab/[ ] switch board, 1-9 or arrows+Enter to move, q quit, r menu"[:max(0, w - 3)])
+        stdscr.refresh()
+    
+    def _draw_turn(self, stdscr: curses.window, current: Player) -> None:
+        """
+        Redraw the whole game screen for `current`'s turn.
+        """
+        stdscr.clear()
+        self.board.draw(stdscr, hints=self._hints(current))
+        self._draw_hint_status(stdscr)
+        stdscr.addstr(10, 2, f"Turn: {current.name} ({current.figure})")
+        stdscr.addstr(12, 2, "Choose a position [1-9]: (q to quit, r to return to menu, h for hints)")
+        stdscr.refresh()
+        
+    def _hints(self, current: Player) -> Optional[Dict[int, Tuple[str, int]]]:
+        """
+        Heatmap labels for the empty cells when hints are on: the number of plies
+        to the win (green) or loss (red), or "=" for a draw (yellow).
+        
+        The position is analysed on the search worker. Until that is done, or when the
+        position is too big to solve within the analyzer's budget, there is no heatmap
+        and `hint_status` says why.
+        """
+        self.hint_status = None
+        if not self.show_hints or current.is_cpu:
+            return None
+        
+        key = (tuple(cell for row in self.board.current_state for cell in row), current.figure)
+        if key != self._hint_key:
+            self._hint_key = key
+            self._hint_future = self.search_pool.submit(
+                self.analyzer.evaluate_moves, self.board.clone(), current.figure
+            )
+        if not self._hint_future.done():
+            self.hint_status = "Hints: analysing..."
+            return None
+        try:
+            scores = self._hint_future.result()
+        except BudgetExhausted:
+            self.hint_status = "Hints unavailable: too many moves left to solve"
+            return None
+        
+        hints: Dict[int, Tuple[str, int]] = {}
+        for pos, score in scores.items():
+            outcome, plies = PositionAnalyzer.describe(score)
+            if outcome == "win":
+                hints[pos] = (str(plies), curses.color_pair(4) | curses.A_BOLD)
+            elif outcome == "loss":
+                hints[pos] = (str(plies), curses.color_pair(6) | curses.A_BOLD)
+            else:
+                hints[pos] = ("=", curses.color_pair(5))
+        return hints
+        
+    def _draw_hint_status(self, stdscr: curses.window) -> None:
+        stdscr.move(13, 2)
+        stdscr.clrtoeol()
+        if self.hint_status is not None:
+            stdscr.addstr(13, 2, self.hint_status, curses.color_pair(5))
+    
+    def _wait_for_human_move(self, stdscr: curses.window, current: Player) -> int:
+        """
+        Poll the keyboard until the player confirms a move.
+        Returns 1-9, or -1/-2 for quit/back (see `_read_move_from_keyboard`).
+        """
+        move = 0
+        while move == 0:
+            self.board.draw(stdscr, hints=self._hints(current))
+            self._draw_hint_status(stdscr)
+            stdscr.refresh()
+            
+            key = stdscr.getch()
+            if key == -1:
+                continue
+            if key == curses.KEY_RESIZE:
+                self._draw_turn(stdscr, current)
+                continue
+            if self.keymap.is_hint(key):
+                self.show_hints = not self.show_hints
+                self._draw_turn(stdscr, current)
+                continue
+            
+            move = self._read_move_from_keyboard(key)
+            if move in (-1, -2):
+                return move
+            if move == 0:
+                move = self._handle_cursor_input(key)
+        return move
+        
+    def _wait_for_cpu_move(self, stdscr: curses.window, current: Player, opponent: Player) -> int:
+        """
+        Run the CPU search on the worker thread while keeping the UI alive.
+        Returns the CPU move, or -1/-2 if the player quit or went back meanwhile
+        (the search is cancelled in that case).
+        """
+        self.search_stop = threading.Event()
+        future: Future = self.search_pool.submit(
+            self._cpu_move, current, opponent, self.board.clone(), self.search_stop
+        )
+        
+        frame = 0
+        while not future.done():
+            spinner = self.SPINNER[frame % len(self.SPINNER)]
+            stdscr.addstr(14, 2, f"{current.name} is thinking... {spinner}")
+            stdscr.refresh()
+            frame += 1
+            
+            key = stdscr.getch()
+            if key == curses.KEY_RESIZE:
+                self._draw_turn(stdscr, current)
+            elif self.keymap.is_quit(key):
+                self._cancel_cpu_search()
+                return -1
+            elif self.keymap.is_back(key):
+                self._cancel_cpu_search()
+                return -2
+            
+        self.search_stop = None
+        try:
+            return future.result()
+        except SearchCancelled:
+            return -2
+        
+    def _cancel_cpu_search(self) -> None:
+        if self.search_stop is not None:
+            self.search_stop.set()
+            self.search_stop = None
+            
+    def _wait_for_key(self, stdscr: curses.window, redraw: Optional[Callable[[], None]] = None,
+                      ignore_for: float = 0.0) -> int:
+        """
+        Poll until a key is pressed and return it.
+        Keys pressed during the first `ignore_for` seconds are discarded, and `redraw`
+        is called when the terminal is resized.
+        """
+        ready_at = time.monotonic() + ignore_for
+        while True:
+            key = stdscr.getch()
+            if key == curses.KEY_RESIZE and redraw is not None:
+                redraw()
+            elif key != -1 and key != curses.KEY_RESIZE and time.monotonic() >= ready_at:
+                return key
+    
     def _read_move_from_keyboard(self, key: int) -> int:
         """
         Returns:
@@ -235,36 +749,42 @@ class GameLoop:
         except Exception:
             return 0 # Ignore other inputs.
         
-    def _handle_cursor_input(self, key: int) -> int:
+    def _handle_cursor_input(self, key: int, board: Optional[Board] = None) -> int:
         """
         Allows navigation navigation of the board with the arrow keys/WASD.
         Returns the board position (1-9) or 0 if no move was confirmed.
+        Moves the cursor of `board` (the live board by default).
         """        
+        board = board if board is not None else self.board
         if self.keymap.is_move_up(key):
-            self.board.move_cursor("up")
+            board.move_cursor("up")
         elif self.keymap.is_move_down(key):
-            self.board.move_cursor("down")
+            board.move_cursor("down")
         elif self.keymap.is_move_left(key):
-            self.board.move_cursor("left")
+            board.move_cursor("left")
         elif self.keymap.is_move_right(key):
-            self.board.move_cursor("right")
+            board.move_cursor("right")
         elif self.keymap.is_confirm(key):
-            row, col = self.board.get_cursor_position()
-            pos = 1 + row * self.board.size + col
-            if self.board.is_valid_move(pos):
+            row, col = board.get_cursor_position()
+            pos = 1 + row * board.size + col
+            if board.is_valid_move(pos):
                 return pos
 
         return 0
         
-    def _cpu_move(self, current: Player, opponent: Player) -> int:
+    @traced
+    def _cpu_move(self, current: Player, opponent: Player, board: Optional[Board] = None,
+                  stop: Optional[threading.Event] = None) -> int:
         """
         Decides which move the CPU Player makes.
-        Returns the 1-9 valid move made by either "Randy" or "TicTaco" :)
+        Returns the 1-9 valid move made by the CPU persona (Randy, TicTaco...) :)
+        Searches `board` (the live board by default); `stop` cancels the search.
         """
+        board = board if board is not None else self.board
         if isinstance(self.ai_agent, RandomAI):
-            return self.ai_agent.choose_move(self.board, current.figure)
-        elif isinstance(self.ai_agent, TicTacToeAI):
-            return self.ai_agent.choose_move(self.board, current.figure, opponent.figure)
+            return self.ai_agent.choose_move(board, current.figure)
+        elif isinstance(self.ai_agent, (TicTacToeAI, BudgetedAI)):
+            return self.ai_agent.choose_move(board, current.figure, opponent.figure, stop)
         raise RuntimeError("AI agent not initialized.")
     
     @staticmethod
@@ -332,6 +852,7 @@ class GameLoop:
         Does all steps required to end the game properly.
         """
         self.current_game_state = GameState.GAME_OVER
+        self._finish_game()
         self.board.draw(stdscr)
         self.show_game_over(stdscr, message)
     
@@ -341,16 +862,20 @@ class GameLoop:
         """
         self.menu.close(stdscr)
     
+    @traced
     def show_game_over(self, stdscr: curses.window, message: str) -> None:
         """
         Show the game over screen.
         """
-        stdscr.clear()
-        stdscr.addstr(message, curses.color_pair(2))
-        stdscr.addstr("\nPress any key to return to the menu...", curses.color_pair(3))
-        stdscr.refresh()
+        def draw() -> None:
+            stdscr.clear()
+            stdscr.addstr(message, curses.color_pair(2))
+            stdscr.addstr("\nPress any key to return to the menu...", curses.color_pair(3))
+            stdscr.refresh()
+            
+        draw()
         curses.flushinp()
-        stdscr.getch()
-        time.sleep(0.25)
+        # Ignore keys for a moment so a key held from the last move doesn't skip the screen.
+        self._wait_for_key(stdscr, redraw=draw, ignore_for=0.25)
         self.current_game_state = GameState.IN_MENU
         
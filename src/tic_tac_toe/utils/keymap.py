@@ -28,6 +28,13 @@ class Keymap:
         # Keys to quit (Q/q)
         self.quit = {ord("q"), ord("Q")}
 
+        # Keys to toggle the hint heatmap (H/h)
+        self.hint = {ord("h"), ord("H")}
+
+        # Keys to switch boards in a simultaneous exhibition (Tab, Shift+Tab, ], [)
+        self.next_board = {9, ord("]")}  # 9=Tab
+        self.prev_board = {curses.KEY_BTAB, ord("[")}
+
     def is_confirm(self, key: int) -> bool:
         return key in self.confirm
 
@@ -48,3 +55,12 @@ class Keymap:
 
     def is_quit(self, key: int) -> bool:
         return key in self.quit
+
+    def is_hint(self, key: int) -> bool:
+        return key in self.hint
+
+    def is_next_board(self, key: int) -> bool:
+        return key in self.next_board
+
+    def is_prev_board(self, key: int) -> bool:
+        return key in self.prev_board
@@ -0,0 +1,160 @@
+"""
+Opt-in timing traces in Chrome trace format (chrome://tracing, ui.perfetto.dev).
+
+Enable with `ttt --trace trace.json` or the TTT_TRACE=trace.json environment variable.
+Spans are kept in a ring buffer and written when the game exits (or on `flush()`).
+When tracing is off, a traced function costs one extra call and a global check.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# (name, start us, duration us, thread id)
+Span = Tuple[str, int, int, int]
+
+
+class Tracer:
+    """
+    Records complete spans into a bounded ring buffer: the oldest spans are
+    overwritten once `capacity` is reached.
+    """
+
+    def __init__(self, path: str, capacity: int = 100_000) -> None:
+        self.path = path
+        self.spans: Deque[Span] = deque(maxlen=capacity)
+        self.origin = time.perf_counter_ns()
+
+    def now(self) -> int:
+        return (time.perf_counter_ns() - self.origin) // 1000
+
+    def record(self, name: str, start: int, end: int) -> None:
+        self.spans.append((name, start, end - start, threading.get_ident()))
+
+    def to_json(self) -> dict:
+        pid = os.getpid()
+        events = [
+            {"name": name, "ph": "X", "ts": start, "dur": duration, "pid": pid, "tid": tid}
+            for name, start, duration, tid in list(self.spans)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def flush(self) -> None:
+        with open(self.path, "w") as f:
+            json.dump(self.to_json(), f)
+
+
+_tracer: Optional[Tracer] = None
+_flush_registered = False
+
+
+def enable(path: str, capacity: int = 100_000) -> Tracer:
+    """
+    Start recording spans; they are written to `path` at exit.
+    """
+    global _tracer, _flush_registered
+    _tracer = Tracer(path, capacity)
+    if not _flush_registered:
+        atexit.register(flush)
+        _flush_registered = True
+    return _tracer
+
+
+def disable() -> None:
+    global _tracer
+    _tracer = None
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def flush() -> None:
+    """
+    Write the recorded spans to the trace file, if tracing is on.
+    """
+    if _tracer is not None:
+        _tracer.flush()
+
+
+class span:
+    """
+    Context manager recording one span, e.g. `with span("stdscr.getch"): ...`
+    """
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0
+
+    def __enter__(self) -> "span":
+        if _tracer is not None:
+            self.start = _tracer.now()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        tracer = _tracer
+        if tracer is not None:
+            tracer.record(self.name, self.start, tracer.now())
+
+
+def traced(fn: F) -> F:
+    """
+    Decorator recording a span named after the function for every call.
+    """
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        tracer = _tracer
+        if tracer is None:
+            return fn(*args, **kwargs)
+        start = tracer.now()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            tracer.record(name, start, tracer.now())
+
+    return wrapper
+
+
+class TracedWindow:
+    """
+    Proxy around a curses window that records spans for input waits and refreshes.
+    """
+
+    def __init__(self, window) -> None:
+        self._window = window
+
+    def __getattr__(self, name: str):
+        return getattr(self._window, name)
+
+    def getch(self, *args) -> int:
+        with span("stdscr.getch"):
+            return self._window.getch(*args)
+
+    def refresh(self, *args) -> None:
+        with span("stdscr.refresh"):
+            self._window.refresh(*args)
+
+
+def wrap_window(window):
+    """
+    Return `window` wrapped in a TracedWindow when tracing is on, unchanged otherwise.
+    """
+    if _tracer is None or isinstance(window, TracedWindow):
+        return window
+    return TracedWindow(window)
+
+
+if os.environ.get("TTT_TRACE"):
+    enable(os.environ["TTT_TRACE"])